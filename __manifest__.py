@@ -25,7 +25,9 @@
         'l10n_pe',
     ],
     'data': [
+        'security/ir.model.access.csv',
         'data/ir_config_parameter.xml',
+        'data/ir_cron.xml',
         'views/res_partner_form.xml',
         'views/assets.xml',
         'views/layout.xml',
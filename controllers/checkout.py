@@ -6,6 +6,21 @@ from odoo.addons.website_sale.controllers.main import WebsiteSale
 from odoo.exceptions import ValidationError
 import logging
 
+from ..tools.vat import normalize_vat
+
+
+# Contexto con el que se guarda el formulario de dirección sin validaciones de backend
+NO_VALIDATION_CONTEXT = {
+    'skip_validation': True,
+    'no_vat_validation': True,
+    'disable_mail_validation': True,
+    'skip_check_vat': True,
+    'import_file': True,
+    'tracking_disable': True,
+    'mail_create_nolog': True,
+    'mail_create_nosubscribe': True,
+}
+
 
 class WebsiteSaleCheckout(WebsiteSale):
     """
@@ -16,90 +31,14 @@ class WebsiteSaleCheckout(WebsiteSale):
     def _detect_identification_type_id(self, vat_number):
         """
         Detectar automáticamente el ID del tipo de identificación basándose en el número
+        (misma clasificación y caché que res.partner)
         """
-        if not vat_number:
-            return False
-        
-        vat_clean = str(vat_number).strip()
-        self._logger.info(f"=== DETECTANDO TIPO DE IDENTIFICACIÓN PARA: {vat_clean} ===")
-        
-        try:
-            # Verificar si el modelo está disponible
-            if 'l10n_latam.identification.type' not in request.env.registry:
-                self._logger.warning("Modelo l10n_latam.identification.type no disponible")
-                return False
-            
-            # Buscar el tipo de identificación en la base de datos
-            identification_type_model = request.env['l10n_latam.identification.type'].sudo()
-            
-            # Detectar DNI (8 dígitos) - ID 5 en tu base de datos
-            if len(vat_clean) == 8 and vat_clean.isdigit():
-                dni_type = identification_type_model.search([
-                    ('name', '=', 'DNI'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if dni_type:
-                    self._logger.info(f"DNI detectado: {vat_clean} -> Tipo ID: {dni_type.id}")
-                    return dni_type.id
-                else:
-                    self._logger.warning("No se encontró el tipo DNI en la base de datos")
-                    return False
-            
-            # Detectar RUC (11 dígitos) - ID 4 en tu base de datos
-            elif len(vat_clean) == 11 and vat_clean.isdigit():
-                ruc_type = identification_type_model.search([
-                    ('name', '=', 'RUC'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if ruc_type:
-                    self._logger.info(f"RUC detectado: {vat_clean} -> Tipo ID: {ruc_type.id}")
-                    return ruc_type.id
-                else:
-                    self._logger.warning("No se encontró el tipo RUC en la base de datos")
-                    return False
-            
-            # Detectar VAT con prefijos peruanos (10 dígitos)
-            elif len(vat_clean) == 10 and vat_clean.startswith(('10', '20', '15', '16', '17')):
-                ruc_type = identification_type_model.search([
-                    ('name', '=', 'RUC'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if ruc_type:
-                    self._logger.info(f"RUC con prefijo detectado: {vat_clean} -> Tipo ID: {ruc_type.id}")
-                    return ruc_type.id
-                else:
-                    self._logger.warning("No se encontró el tipo RUC en la base de datos")
-                    return False
-            
-            # Detectar DNI con prefijo 10 (10 dígitos)
-            elif len(vat_clean) == 10 and vat_clean.startswith('10'):
-                dni_type = identification_type_model.search([
-                    ('name', '=', 'DNI'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if dni_type:
-                    self._logger.info(f"DNI con prefijo 10 detectado: {vat_clean} -> Tipo ID: {dni_type.id}")
-                    return dni_type.id
-                else:
-                    self._logger.warning("No se encontró el tipo DNI en la base de datos")
-                    return False
-            
-            # Otros casos - usar DNI por defecto (ID 5)
-            else:
-                dni_type = identification_type_model.search([
-                    ('name', '=', 'DNI'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if dni_type:
-                    self._logger.info(f"VAT genérico detectado: {vat_clean} -> Usando DNI por defecto ID: {dni_type.id}")
-                    return dni_type.id
-                else:
-                    self._logger.warning("No se encontró el tipo DNI en la base de datos")
-                    return False
-                    
-        except Exception as e:
-            self._logger.error(f"Error al detectar tipo de identificación: {e}")
+        if not vat_number or 'l10n_latam.identification.type' not in request.env.registry:
             return False
+        identification_type_id = request.env['l10n_latam.identification.type'].sudo()._certifica_type_id_from_vat(
+            vat_number)
+        self._logger.info(f"Tipo de identificación para {str(vat_number).strip()}: {identification_type_id}")
+        return identification_type_id
 
     def _update_partner_identification_type(self, partner_id, identification_type_id):
         """
@@ -222,59 +161,7 @@ class WebsiteSaleCheckout(WebsiteSale):
         
         # Verificar si es un envío de formulario (POST con datos)
         if request.httprequest.method == 'POST' and (all_form_values.get('submitted') or len(all_form_values) > 1):
-            self._logger.info("=== PROCESANDO ENVÍO DE FORMULARIO ===")
-            
-            # Obtener valores específicos
-            dni = all_form_values.get('dni', '').strip()
-            ruc = all_form_values.get('ruc', '').strip()
-            razon_social = all_form_values.get('razon_social', '').strip()
-            invoice_type_checkbox = all_form_values.get('invoice_type_checkbox', '')
-            shipping_option = all_form_values.get('shipping_option', 'pickup')
-            
-            self._logger.info(f"DNI extraído: '{dni}'")
-            self._logger.info(f"RUC extraído: '{ruc}'")
-            self._logger.info(f"Razón Social extraída: '{razon_social}'")
-            self._logger.info(f"Checkbox factura: '{invoice_type_checkbox}'")
-            self._logger.info(f"Opción de envío: '{shipping_option}'")
-            
-            # Determinar si se solicita factura
-            is_invoice_requested = invoice_type_checkbox == '1'
-            
-            # Procesar los datos personalizados y actualizar kw
-            if is_invoice_requested:
-                self._logger.info("=== MODO FACTURA ===")
-                if ruc:
-                    kw['vat'] = ruc
-                    all_form_values['vat'] = ruc
-                    self._logger.info(f"VAT establecido a RUC: {ruc}")
-                if razon_social:
-                    kw['name'] = razon_social
-                    all_form_values['name'] = razon_social
-                    kw['is_company'] = True
-                    all_form_values['is_company'] = True
-                    self._logger.info(f"Nombre establecido a razón social: {razon_social}")
-            else:
-                self._logger.info("=== MODO BOLETA ===")
-                if dni:
-                    kw['vat'] = dni
-                    all_form_values['vat'] = dni
-                    kw['is_company'] = False
-                    all_form_values['is_company'] = False
-                    self._logger.info(f"VAT establecido a DNI: {dni}")
-            
-            # Agregar campos personalizados a kw para que estén disponibles en el procesamiento
-            kw['dni'] = dni
-            kw['ruc'] = ruc
-            kw['razon_social'] = razon_social
-            kw['invoice_type_checkbox'] = invoice_type_checkbox
-            kw['shipping_option'] = shipping_option
-            
-            # Asegurar que los campos básicos estén presentes
-            for field in ['name', 'email', 'phone']:
-                if field in all_form_values and all_form_values[field]:
-                    kw[field] = all_form_values[field]
-            
-            self._logger.info(f"KW actualizados: {kw}")
+            kw = self._apply_document_form_values(kw, all_form_values)
         
         # Usar métodos sin validación para crear/actualizar partners
         try:
@@ -296,63 +183,18 @@ class WebsiteSaleCheckout(WebsiteSale):
                 self._logger.info("  - No hay partner específico, usando método estándar con contexto sin validaciones")
             
             # Llamar al método padre con contexto sin validaciones
-            no_validation_context = {
-                'skip_validation': True,
-                'no_vat_validation': True,
-                'disable_mail_validation': True,
-                'skip_check_vat': True,
-                'import_file': True,
-                'tracking_disable': True,
-                'mail_create_nolog': True,
-                'mail_create_nosubscribe': True,
-            }
-            
             # Aplicar contexto sin validaciones al request
             original_context = request.context
-            request.context = dict(original_context, **no_validation_context)
+            request.context = dict(original_context, **NO_VALIDATION_CONTEXT)
             
             try:
                 # Si es POST con datos del formulario, procesar y redirigir manualmente sin llamar al método padre
                 if request.httprequest.method == 'POST' and (all_form_values.get('submitted') or len(all_form_values) > 1):
                     self._logger.info("🧭 POST address(): guardado manual sin super() y redirección controlada")
 
-                    # Determinar si es edición o creación según los parámetros recibidos
-                    editable_partner_id = None
-                    try:
-                        # Prioridad: valores del formulario (POST), luego kw normalizado
-                        for key in ['partner_id', 'partner', 'partner_invoice_id', 'partner_shipping_id']:
-                            raw_val = all_form_values.get(key) or kw.get(key)
-                            if raw_val is not None and str(raw_val).strip().isdigit():
-                                editable_partner_id = int(str(raw_val).strip())
-                                break
-                    except Exception:
-                        editable_partner_id = None
-
-                    # Preprocesar valores (detecta vat e identificación)
-                    order = request.website.sale_get_order()
-                    mode = ('edit', editable_partner_id) if editable_partner_id else ('new', 'billing')
-                    data_values = self.values_preprocess(order, mode, kw)
-
                     # Guardar partner sin validaciones
                     try:
-                        partner_id = self._checkout_form_save(mode, kw, {**kw, **data_values})
-                        self._logger.info(f"✅ Partner guardado manualmente (id={partner_id})")
-
-                        # Vincular partner al pedido actual antes de redirigir
-                        if order:
-                            try:
-                                partner_rec = request.env['res.partner'].sudo().browse(partner_id)
-                                write_vals = {
-                                    'partner_id': partner_rec.commercial_partner_id.id or partner_rec.id,
-                                    'partner_invoice_id': partner_rec.id,
-                                    'partner_shipping_id': partner_rec.id,
-                                }
-                                order.sudo().write(write_vals)
-                                # Actualizar sesión para coherencia
-                                request.session['partner_id'] = partner_rec.id
-                                self._logger.info(f"🧩 Pedido {order.id} actualizado con partner {partner_rec.id} (invoice/shipping asignados)")
-                            except Exception as e:
-                                self._logger.error(f"❌ Error vinculando partner {partner_id} al pedido: {e}")
+                        self._save_checkout_address(kw, all_form_values)
                     except Exception as e:
                         self._logger.error(f"❌ Error guardando partner manualmente: {e}")
                         # Como fallback, intentar con super() una sola vez
@@ -369,10 +211,9 @@ class WebsiteSaleCheckout(WebsiteSale):
                                 if key in kw and str(kw[key]).strip().isdigit():
                                     possible_pid = int(str(kw[key]).strip())
                                     break
-                            if not possible_pid and 'vat' in kw:
-                                # Buscar por VAT recientemente creado
-                                found = request.env['res.partner'].sudo().search([('vat', '=', kw['vat'])], limit=1)
-                                possible_pid = found.id if found else None
+                            # (no se busca por VAT: enlazaría el pedido a datos de otro cliente)
+                            if possible_pid and possible_pid not in self._get_editable_partner_ids(order):
+                                possible_pid = None
                             if order and possible_pid:
                                 partner_rec = request.env['res.partner'].sudo().browse(possible_pid)
                                 if partner_rec and partner_rec.exists():
@@ -382,6 +223,7 @@ class WebsiteSaleCheckout(WebsiteSale):
                                         'partner_shipping_id': partner_rec.id,
                                     }
                                     order.sudo().write(write_vals)
+                                    request.website._certifica_invalidate_order_memo()
                                     request.session['partner_id'] = partner_rec.id
                                     self._logger.info(f"🧩 Enlace post-super(): Pedido {order.id} actualizado con partner {partner_rec.id}")
                         except Exception as e2:
@@ -440,9 +282,225 @@ class WebsiteSaleCheckout(WebsiteSale):
             self._logger.error(f"❌ Error en address() sin validaciones: {str(e)}")
             raise
 
-    def _checkout_form_save(self, mode, checkout, all_values):
+    @http.route(['/shop/checkout/submit'], type='json', auth="public", website=True, sitemap=False)
+    def checkout_submit(self, form=None, **kw):
         """
-        Guardar el formulario de checkout con detección automática del tipo de identificación
+        Envío del formulario de dirección en una sola llamada: guarda el partner con
+        el mismo flujo que /shop/address, lo vincula al pedido y devuelve el HTML
+        del paso de pago para mostrarlo sin redirecciones ni recargas.
+        """
+        all_form_values = {k.strip(): v for k, v in (form or {}).items() if k != 'csrf_token'}
+        order = request.website.sale_get_order()
+        if not order or not order.order_line:
+            return {'state': 'redirect', 'url': '/shop/cart'}
+
+        kw = self._apply_document_form_values(dict(all_form_values), all_form_values)
+        original_context = request.context
+        request.context = dict(original_context, **NO_VALIDATION_CONTEXT)
+        try:
+            # Savepoint: un envío fallido no deja partner ni pedido a medio escribir
+            with request.env.cr.savepoint():
+                partner_id = self._save_checkout_address(kw, all_form_values)
+        except ValidationError as e:
+            # Datos rechazados: se devuelven los campos a corregir en lugar del fallback por POST
+            self._logger.warning(f"⚠️ Formulario rechazado (envío JSON): {e.name}")
+            return {
+                'state': 'error',
+                'errors': self._get_checkout_field_errors(kw),
+                'error_message': [e.name],
+            }
+        except Exception as e:
+            self._logger.error(f"❌ Error guardando partner (envío JSON): {e}")
+            # El cliente reenvía el formulario por POST, que conserva el fallback de /shop/address
+            return {'state': 'error'}
+        finally:
+            request.context = original_context
+
+        order = request.website.sale_get_order()
+        payment_html = self._render_payment_step(order)
+        if payment_html is None:
+            return {'state': 'redirect', 'url': '/shop/payment'}
+        return {
+            'state': 'payment',
+            'url': '/shop/payment',
+            'partner_id': partner_id,
+            'payment_html': payment_html,
+        }
+
+    def _get_checkout_field_errors(self, kw):
+        """
+        {campo del formulario: 'error'} ante un ValidationError al guardar. El
+        documento es el único campo con restricciones activas en res.partner
+        (ver disable_validations.py): RUC en modo factura y DNI en modo boleta.
+        """
+        if not kw.get('vat'):
+            return {}
+        return {'ruc' if kw.get('invoice_type_checkbox') == '1' else 'dni': 'error'}
+
+    def _render_payment_step(self, order):
+        """HTML de /shop/payment para el pedido, o None si el pedido requiere otra redirección."""
+        if self.checkout_redirection(order):
+            return None
+        render_values = self._get_shop_payment_values(order)
+        render_values['only_services'] = order and order.only_services or False
+        if render_values['errors']:
+            render_values.pop('acquirers', '')
+            render_values.pop('tokens', '')
+        html = request.env['ir.ui.view']._render_template('website_sale.payment', render_values)
+        if isinstance(html, bytes):
+            html = html.decode('utf-8')
+        return html
+
+    def _apply_document_form_values(self, kw, all_form_values):
+        """
+        Traslada DNI/RUC, razón social y opción de envío del formulario a kw
+        (vat, name, is_company) según se pida boleta o factura.
+        """
+        self._logger.info("=== PROCESANDO ENVÍO DE FORMULARIO ===")
+        
+        # Obtener valores específicos
+        dni = all_form_values.get('dni', '').strip()
+        ruc = all_form_values.get('ruc', '').strip()
+        razon_social = all_form_values.get('razon_social', '').strip()
+        invoice_type_checkbox = all_form_values.get('invoice_type_checkbox', '')
+        shipping_option = all_form_values.get('shipping_option', 'pickup')
+        
+        self._logger.info(f"DNI extraído: '{dni}'")
+        self._logger.info(f"RUC extraído: '{ruc}'")
+        self._logger.info(f"Razón Social extraída: '{razon_social}'")
+        self._logger.info(f"Checkbox factura: '{invoice_type_checkbox}'")
+        self._logger.info(f"Opción de envío: '{shipping_option}'")
+        
+        # Determinar si se solicita factura
+        is_invoice_requested = invoice_type_checkbox == '1'
+        
+        # Procesar los datos personalizados y actualizar kw
+        if is_invoice_requested:
+            self._logger.info("=== MODO FACTURA ===")
+            if ruc:
+                kw['vat'] = ruc
+                all_form_values['vat'] = ruc
+                self._logger.info(f"VAT establecido a RUC: {ruc}")
+            if razon_social:
+                kw['name'] = razon_social
+                all_form_values['name'] = razon_social
+                kw['is_company'] = True
+                all_form_values['is_company'] = True
+                self._logger.info(f"Nombre establecido a razón social: {razon_social}")
+        else:
+            self._logger.info("=== MODO BOLETA ===")
+            if dni:
+                kw['vat'] = dni
+                all_form_values['vat'] = dni
+                kw['is_company'] = False
+                all_form_values['is_company'] = False
+                self._logger.info(f"VAT establecido a DNI: {dni}")
+        
+        # Agregar campos personalizados a kw para que estén disponibles en el procesamiento
+        kw['dni'] = dni
+        kw['ruc'] = ruc
+        kw['razon_social'] = razon_social
+        kw['invoice_type_checkbox'] = invoice_type_checkbox
+        kw['shipping_option'] = shipping_option
+        
+        # Asegurar que los campos básicos estén presentes
+        for field in ['name', 'email', 'phone']:
+            if field in all_form_values and all_form_values[field]:
+                kw[field] = all_form_values[field]
+        
+        self._logger.info(f"KW actualizados: {kw}")
+        return kw
+
+    def _save_checkout_address(self, kw, all_form_values):
+        """
+        Guarda el partner del formulario de dirección y lo vincula al pedido. Si el
+        DNI/RUC es el del partner comercial del usuario con sesión, los datos van a
+        un contacto hijo suyo: el partner existente nunca se modifica. Devuelve el
+        ID del partner; los errores al guardar se propagan para que el llamador
+        decida el fallback.
+        """
+        order = request.website.sale_get_order()
+
+        # Determinar si es edición o creación según los parámetros recibidos
+        editable_partner_id = None
+        try:
+            # Prioridad: valores del formulario (POST), luego kw normalizado
+            for key in ['partner_id', 'partner', 'partner_invoice_id', 'partner_shipping_id']:
+                raw_val = all_form_values.get(key) or kw.get(key)
+                if raw_val is not None and str(raw_val).strip().isdigit():
+                    editable_partner_id = int(str(raw_val).strip())
+                    break
+        except Exception:
+            editable_partner_id = None
+        if editable_partner_id and editable_partner_id not in self._get_editable_partner_ids(order):
+            self._logger.warning(f"⚠️ partner_id {editable_partner_id} no editable desde esta sesión; se ignora")
+            editable_partner_id = None
+
+        # Con el DNI/RUC del propio usuario se cuelga un contacto de su partner comercial
+        commercial_partner = None
+        if not editable_partner_id:
+            commercial_partner = self._find_checkout_partner(kw.get('vat'))
+            if commercial_partner:
+                self._logger.info(f"♻️ Partner comercial {commercial_partner.id} con VAT {kw.get('vat')}: se usa un contacto hijo")
+
+        # Preprocesar valores (detecta vat e identificación)
+        mode = ('edit', editable_partner_id) if editable_partner_id else ('new', 'billing')
+        data_values = self.values_preprocess(order, mode, kw)
+
+        # Guardar partner sin validaciones
+        partner_id = self._checkout_form_save(
+            mode, kw, {**kw, **data_values}, commercial_partner=commercial_partner)
+        self._logger.info(f"✅ Partner guardado manualmente (id={partner_id})")
+
+        # Vincular partner al pedido actual antes de redirigir
+        if order:
+            try:
+                partner_rec = request.env['res.partner'].sudo().browse(partner_id)
+                write_vals = {
+                    'partner_id': partner_rec.commercial_partner_id.id or partner_rec.id,
+                    'partner_invoice_id': partner_rec.id,
+                    'partner_shipping_id': partner_rec.id,
+                }
+                order.sudo().write(write_vals)
+                request.website._certifica_invalidate_order_memo()
+                # Actualizar sesión para coherencia
+                request.session['partner_id'] = partner_rec.id
+                self._logger.info(f"🧩 Pedido {order.id} actualizado con partner {partner_rec.id} (invoice/shipping asignados)")
+            except Exception as e:
+                self._logger.error(f"❌ Error vinculando partner {partner_id} al pedido: {e}")
+        return partner_id
+
+    def _get_editable_partner_ids(self, order):
+        """
+        Partners que el formulario puede modificar: los contactos del usuario con
+        sesión o, para visitantes, los de facturación/envío de su propio pedido.
+        """
+        user = request.env.user
+        if not user._is_public():
+            return set(request.env['res.partner'].sudo().search([
+                ('id', 'child_of', user.partner_id.commercial_partner_id.id)]).ids)
+        if not order:
+            return set()
+        return set((order.partner_invoice_id | order.partner_shipping_id).ids) - {user.partner_id.id}
+
+    def _find_checkout_partner(self, vat_number):
+        """
+        Partner comercial que se reutiliza para el DNI/RUC del formulario: solo el
+        del propio usuario con sesión. Un visitante anónimo siempre crea un partner
+        nuevo aunque el número ya exista; los duplicados los fusiona
+        certifica.partner.dedupe.
+        """
+        if not vat_number or request.env.user._is_public():
+            return None
+        commercial_partner = request.env.user.partner_id.commercial_partner_id
+        if commercial_partner.certifica_vat_normalized == normalize_vat(vat_number):
+            return commercial_partner
+        return None
+
+    def _checkout_form_save(self, mode, checkout, all_values, commercial_partner=None):
+        """
+        Guardar el formulario de checkout con detección automática del tipo de identificación.
+        Con commercial_partner los datos se guardan en un contacto hijo suyo.
         """
         self._logger.info("=== CHECKOUT FORM SAVE ===")
         self._logger.info(f"Mode: {mode}")
@@ -555,7 +613,7 @@ class WebsiteSaleCheckout(WebsiteSale):
             # Recojo en tienda: usar valores por defecto
             checkout['street'] = 'Sin dirección'
             checkout['city'] = 'Sin dirección'
-            checkout['country_id'] = 173  # Perú
+            checkout['country_id'] = request.env['certifica.settings']._get().country_id
             self._logger.info("Modo recogo: usando dirección por defecto")
         
         # Incluir l10n_latam_identification_type_id y normalizarlo si llega como string
@@ -582,6 +640,8 @@ class WebsiteSaleCheckout(WebsiteSale):
             partner = Partner.browse(partner_id)
             partner.write(filtered_checkout)
             self._logger.info(f"Partner actualizado: {partner_id}")
+        elif commercial_partner:
+            partner_id = self._get_checkout_contact(commercial_partner, filtered_checkout).id
         else:
             partner_id = Partner.create(filtered_checkout).id
             self._logger.info(f"Partner creado: {partner_id}")
@@ -594,6 +654,25 @@ class WebsiteSaleCheckout(WebsiteSale):
         
         return partner_id
 
+    def _get_checkout_contact(self, commercial_partner, values):
+        """
+        Contacto de facturación hijo del partner comercial con los datos enviados:
+        reutiliza uno idéntico o crea uno nuevo (los campos comerciales, como el
+        VAT, los hereda del padre).
+        """
+        Partner = request.env['res.partner'].sudo()
+        contact_values = {k: v for k, v in values.items() if k not in ('vat', 'is_company')}
+        contact_values.update(parent_id=commercial_partner.id, type='invoice')
+        domain = [(field, '=', value) for field, value in contact_values.items()
+                  if field in ('parent_id', 'type', 'name', 'email', 'phone', 'street', 'city', 'country_id')]
+        contact = Partner.search(domain, limit=1)
+        if contact:
+            self._logger.info(f"Contacto existente reutilizado: {contact.id} (padre {commercial_partner.id})")
+            return contact
+        contact = Partner.create(contact_values)
+        self._logger.info(f"Contacto creado: {contact.id} (padre {commercial_partner.id})")
+        return contact
+
     def values_preprocess(self, order, mode, kw):
         """
         Preprocesar valores antes de guardar
@@ -1,24 +1,30 @@
+import json
+
 from odoo import http
-from odoo.http import request
+from odoo.http import request, Response
 
 class WebsiteSaleConfirmationCustom(http.Controller):
     @http.route(['/shop/confirmation'], type='http', auth="public", website=True)
     def shop_confirmation(self, **kwargs):
         order = request.website.sale_get_order()
-        acquirer = None
-        
-        # En Odoo 13, el payment_acquirer_id no existe directamente en sale.order
-        # Necesitamos obtenerlo a través de las transacciones de pago
-        if order:
-            # Buscar transacciones de pago relacionadas con esta orden
-            payment_transactions = request.env['payment.transaction'].sudo().search([
-                ('sale_order_ids', 'in', [order.id])
-            ], limit=1)
-            
-            if payment_transactions:
-                acquirer = payment_transactions.acquirer_id
-        
-        return request.render('certifica_theme.payment_confirmation_page', {
-            'order': order,
-            'acquirer': acquirer,
-        })
\ No newline at end of file
+        values = request.env['certifica.payment.confirmation'].sudo()._get_values(order)
+        return request.render('certifica_theme.payment_confirmation_page', values)
+
+    @http.route(['/shop/payment/status'], type='http', auth="public", methods=['GET'], website=True, sitemap=False)
+    def shop_payment_status(self, **kwargs):
+        """
+        Estado de la transacción del pedido de la sesión, para que la página de
+        confirmación se actualice sola en lugar de recargarse.
+        """
+        order = request.website.sale_get_order()
+        if not order and request.session.get('sale_last_order_id'):
+            order = request.env['sale.order'].sudo().browse(request.session['sale_last_order_id']).exists()
+        status = request.env['certifica.payment.confirmation'].sudo()._get_status(order)
+        return Response(
+            json.dumps(status),
+            headers={
+                'Content-Type': 'application/json',
+                # Cada consulta debe ver el estado actual del pago
+                'Cache-Control': 'no-store',
+            }
+        )
@@ -1,13 +1,43 @@
 # -*- coding: utf-8 -*-
 
+import hashlib
 import json
+import logging
+import random
+import time
+from psycopg2.extensions import TransactionRollbackError
 from odoo import http
 from odoo.http import request, Response
-from odoo.addons.website_sale.controllers.main import WebsiteSale
+from odoo.addons.http_routing.models.ir_http import slug
+from odoo.addons.website_sale.controllers.main import WebsiteSale, TableCompute
 from odoo.addons.website.controllers.main import QueryURL
 from odoo.addons.website.controllers.main import Website
+from odoo.osv import expression
 from werkzeug.utils import redirect
 
+from ..tools.cache import (
+    products_fragment_cache, stock_badges_cache, strip_csrf_tokens, fill_csrf_tokens, get_cache_stats,
+    request_memo, reset_request_memo, STOCK_BADGE_ENTRY_SIZE,
+)
+from ..tools import keyset
+from ..tools.page_cache import page_cache
+
+_logger = logging.getLogger(__name__)
+
+# Segundos que navegador y proxies pueden reutilizar una respuesta de /shop/autocomplete
+AUTOCOMPLETE_MAX_AGE = 60
+
+# Plantillas como máximo por llamada a /shop/stock_badges
+STOCK_BADGES_MAX_IDS = 300
+
+# Intentos de una modificación del carrito ante errores de serialización/deadlock
+CART_UPDATE_MAX_TRIES = 5
+
+# Espera base (segundos) antes de reintentar; se duplica en cada intento
+CART_UPDATE_RETRY_DELAY = 0.05
+
+# Marca de las páginas servidas desde la caché; el JS rellena entonces el carrito de la cabecera
+PAGE_CACHE_MARKER = 'data-certifica-page-cache="1"'
 
 
 class WebsiteSaleCustom(WebsiteSale):
@@ -20,13 +50,102 @@ class WebsiteSaleCustom(WebsiteSale):
     Extensión del controlador de la tienda para personalizar funcionalidades
     """
     
-    def _get_search_domain(self, *args, **kwargs):
-        """Extiende el dominio de búsqueda sin alterar la firma del método padre"""
-        return super(WebsiteSaleCustom, self)._get_search_domain(*args, **kwargs)
+    def _get_certifica_settings(self):
+        """Configuración del módulo (pricelist, productos por página...) desde el ormcache."""
+        return request.env['certifica.settings']._get()
+    
+    def _get_pricelist_product_domain(self):
+        """
+        Dominio con los productos que tienen reglas en el pricelist de la tienda.
+        Se aplica dentro del dominio de búsqueda para que la búsqueda, el conteo,
+        el paginador y la lista de atributos se resuelvan en una sola consulta filtrada.
+        """
+        # Lectura de IDs desde la tabla materializada (reglas globales, de categoría,
+        # producto y variante ya resueltas), sin cargar registros de product.pricelist.item
+        product_tmpl_ids = request.env['certifica.pricelist.product'].sudo()._get_product_tmpl_ids(
+            self._get_certifica_settings().pricelist_id)
+        # Si no hay productos en la lista, forzar un dominio vacío
+        if product_tmpl_ids:
+            return [('id', 'in', product_tmpl_ids)]
+        return [('id', '=', 0)]
+
+    def _get_search_domain(self, search, category, attrib_values, search_in_description=True):
+        """
+        Extiende el dominio de búsqueda con la restricción del pricelist. Los filtros de
+        atributos se resuelven con el índice de facetas (bitmaps) en lugar de dominios con joins.
+        """
+        # La búsqueda por texto usa los índices de trigramas cuando están disponibles
+        text_search = None
+        if self._use_trigram_search(search):
+            text_search, search = search, ''
+        facet_ids = None
+        if attrib_values:
+            value_ids = [value[1] for value in attrib_values]
+            facet_ids = request.env['certifica.facet.index'].sudo()._get_index(
+                self._get_certifica_settings().pricelist_id).filter_ids(value_ids)
+            attrib_values = []
+        domain = super(WebsiteSaleCustom, self)._get_search_domain(
+            search, category, attrib_values, search_in_description)
+        domain = expression.AND([domain, self._get_pricelist_product_domain()])
+        if text_search is not None:
+            domain = expression.AND([domain, [('certifica_text_search', '=', text_search)]])
+        if facet_ids is not None:
+            domain = expression.AND([domain, [('id', 'in', facet_ids)]])
+        return domain
+
+    def _use_trigram_search(self, search):
+        """True si la búsqueda por texto se resuelve con el índice de trigramas."""
+        return bool(search) and request.env['certifica.product.search'].sudo()._is_available()
+
+    def _get_search_match_ids(self, search):
+        """
+        IDs de todas las plantillas que coinciden con la búsqueda según el índice de
+        trigramas (None si no hay búsqueda o el índice no está disponible). Se
+        resuelve una sola vez por petición.
+        """
+        if not self._use_trigram_search(search):
+            return None
+        memo = request_memo('search_match_ids')
+        if search not in memo:
+            memo[search] = request.env['certifica.product.search'].sudo()._search_template_ids(search)
+        return memo[search]
+
+    def _apply_search_ranking(self, qcontext, search, post):
+        """
+        Sin un orden explícito, la página de resultados de una búsqueda sigue la
+        relevancia del índice de trigramas: la página se obtiene en la consulta de
+        puntuación con LIMIT/OFFSET; el conteo y el paginador son los del padre.
+        """
+        pager = qcontext.get('pager')
+        if post.get('order') or not pager or not self._use_trigram_search(search):
+            return
+        domain = self._get_search_domain(search, qcontext.get('category'), qcontext.get('attrib_values') or [])
+        ppg = qcontext.get('ppg') or self._get_certifica_settings().ppg
+        products = request.env['product.template'].with_context(bin_size=True)._certifica_search_ranked(
+            search, domain, ppg, pager['offset'])
+        qcontext['products'] = products
+        qcontext['bins'] = TableCompute().process(products, ppg, qcontext.get('ppr') or 4)
+
+    def _get_attribute_counts(self, search, category, attrib_values):
+        """
+        Número de resultados y conteo por valor de atributo para la selección actual,
+        calculados sobre el índice de facetas. La búsqueda por texto acota la base con
+        las coincidencias de trigramas o, sin índice, con una consulta adicional de IDs.
+        """
+        base_ids = self._get_search_match_ids(search)
+        if search and base_ids is None:
+            domain = super(WebsiteSaleCustom, self)._get_search_domain(search, None, [])
+            base_ids = request.env['product.template'].search(domain).ids
+        return request.env['certifica.facet.index'].sudo()._search_facets(
+            self._get_certifica_settings().pricelist_id,
+            [value[1] for value in attrib_values],
+            base_ids=base_ids,
+            category_id=int(category) if category else None,
+        )
     
     def _get_products_domain(self, search, category, attrib_values):
-        """Delegamos al método original sin modificaciones para mantener la búsqueda nativa."""
-        return super(WebsiteSaleCustom, self)._get_products_domain(search, category, attrib_values)
+        """Mismo dominio que la búsqueda de la tienda, ya restringido al pricelist."""
+        return self._get_search_domain(search, category, attrib_values)
     
     def _get_products(self, search, category, attrib_values, **post):
         """Usamos la lógica original para respetar completamente los filtros de búsqueda."""
@@ -43,101 +162,394 @@ class WebsiteSaleCustom(WebsiteSale):
         """
         Sobrescribimos el método shop para manejar peticiones AJAX y pricelist específico
         """
-        # Forzamos 18 productos por página
-        ppg = 18
+        # Productos por página y pricelist fijados por la configuración del módulo
+        settings = self._get_certifica_settings()
+        ppg = settings.ppg
         
-        pricelist = request.env['product.pricelist'].sudo().browse(1573)
+        pricelist = request.env['product.pricelist'].sudo().browse(settings.pricelist_id)
         if pricelist.exists():
             request.session['website_sale_pricelist'] = pricelist.id
         
-        # Obtener los IDs de productos con reglas en el pricelist 1573
-        item_products = request.env['product.pricelist.item'].sudo().search([('pricelist_id', '=', 1573)]).mapped('product_tmpl_id')
-        # Si no hay productos en la lista, forzar un dominio vacío
-        if item_products:
-            product_filter_domain = [('id', 'in', item_products.ids)]
-        else:
-            product_filter_domain = [('id', '=', 0)]
-        
         # Si es una petición AJAX, solo devolvemos los productos
-        if request.httprequest.headers.get('X-Requested-With') == 'XMLHttpRequest':
-            response = super(WebsiteSaleCustom, self).shop(
-                page=page, category=category, search=search, ppg=ppg, **post)
-            # Filtrar productos en el contexto de respuesta combinando búsqueda con pricelist
-            if hasattr(response, 'qcontext') and response.qcontext:
-                products = response.qcontext.get('products')
-                if products:
-                    # Intersección entre productos de la búsqueda y productos del pricelist
-                    pricelist_products = item_products if item_products else request.env['product.template'].sudo().browse([])
-                    products = products & pricelist_products
-                    products = products.with_context(pricelist=pricelist.id if pricelist.exists() else None)
-                    response.qcontext['products'] = products
-            products_html = request.env['ir.ui.view']._render_template(
-                'website_sale.products',
-                response.qcontext
-            )
-            return Response(
-                json.dumps({
-                    'products_html': products_html,
-                    'filters': response.qcontext.get('filters', {})
-                }),
-                headers={'Content-Type': 'application/json'}
-            )
+        is_xhr = request.httprequest.headers.get('X-Requested-With') == 'XMLHttpRequest'
+        
+        # Página completa desde la caché compartida (visitantes anónimos sin carrito)
+        page_key = None if is_xhr else self._get_page_cache_key()
+        if page_key:
+            cached_page = self._get_cached_page(page_key)
+            if cached_page:
+                return cached_page
+        
+        # Los visitantes anónimos comparten el HTML renderizado de una misma consulta
+        fragment_key = None
+        if is_xhr and request.env.user._is_public():
+            fragment_key = self._get_products_fragment_key(page, category, search, ppg, post)
+            cached = products_fragment_cache.get(fragment_key)
+            if cached:
+                return self._products_fragment_response(*cached)
         
-        # Para peticiones normales, llamamos al método padre
+        # Con un cursor válido la página se obtiene por clave y el padre solo
+        # calcula la primera página (OFFSET 0); el cursor no se propaga al paginador
+        cursor = post.pop('cursor', None)
+        seek = self._get_shop_seek(cursor, page, category, search, ppg, post)
+        
+        # La restricción al pricelist ya va en el dominio (_get_search_domain), por lo que
+        # los productos, el conteo y el paginador que devuelve el padre ya están filtrados
         response = super(WebsiteSaleCustom, self).shop(
-            page=page, category=category, search=search, ppg=ppg, **post)
-        # Filtrar productos en el contexto de respuesta combinando búsqueda con pricelist
+            page=0 if seek else page, category=category, search=search, ppg=ppg, **post)
         if hasattr(response, 'qcontext') and response.qcontext:
+            if seek:
+                self._apply_keyset_page(response.qcontext, int(page), ppg, seek, post)
+            self._apply_search_ranking(response.qcontext, search, post)
+            self._add_next_cursor(response.qcontext, category, search, ppg, post)
             products = response.qcontext.get('products')
             if products:
-                # Intersección entre productos de la búsqueda y productos del pricelist
-                pricelist_products = item_products if item_products else request.env['product.template'].sudo().browse([])
-                products = products & pricelist_products
-                products = products.with_context(pricelist=pricelist.id if pricelist.exists() else None)
-                response.qcontext['products'] = products
+                response.qcontext['products'] = products.with_context(
+                    pricelist=pricelist.id if pricelist.exists() else None)
+                # Precios de todas las tarjetas de la página en una sola llamada
+                response.qcontext['certifica_prices'] = self._get_products_prices(products, pricelist)
+            response.qcontext['certifica_pricelist_id'] = settings.pricelist_id
+            # Conteo de productos por valor de atributo para los filtros
+            result_count, attrib_counts = self._get_attribute_counts(
+                search, response.qcontext.get('category'), response.qcontext.get('attrib_values') or [])
+            response.qcontext['attrib_counts'] = attrib_counts
+            response.qcontext['attrib_result_count'] = result_count
+            # Árbol de categorías cacheado para el sidebar (sin cargas relacionales en la plantilla)
+            category_tree = request.env['product.public.category']._certifica_get_category_tree(
+                request.website.id, pricelist.id)
+            categories = response.qcontext.get('categories')
+            response.qcontext['category_tree'] = category_tree
+            response.qcontext['category_roots'] = [
+                category_tree[category_id] for category_id in (categories.ids if categories else [])
+                if category_id in category_tree
+            ]
+        
+        if is_xhr:
+            products_html = request.env['ir.ui.view']._render_template(
+                'website_sale.products',
+                response.qcontext
+            )
+            if isinstance(products_html, bytes):
+                products_html = products_html.decode('utf-8')
+            filters = response.qcontext.get('filters', {})
+            if fragment_key:
+                # El token CSRF pertenece a la sesión que renderizó; se guarda un marcador
+                products_html = strip_csrf_tokens(products_html)
+                products_fragment_cache.set(
+                    fragment_key, (products_html, filters),
+                    len(products_html) + len(json.dumps(filters)))
+            return self._products_fragment_response(products_html, filters)
+        
+        if page_key:
+            return self._cache_page(page_key, response)
         return response
 
+    @http.route(['/shop/product/<model("product.template"):product>'], type='http', auth="public", website=True)
+    def product(self, product, category='', search='', **kwargs):
+        page_key = self._get_page_cache_key()
+        if page_key:
+            cached_page = self._get_cached_page(page_key)
+            if cached_page:
+                return cached_page
+        response = super(WebsiteSaleCustom, self).product(product, category=category, search=search, **kwargs)
+        if page_key:
+            return self._cache_page(page_key, response)
+        return response
+
+    def _prepare_product_values(self, product, category, search, **kwargs):
+        """
+        Stock disponible de la plantilla para la ficha de producto, desde el mismo
+        servicio (y la misma memoria de la petición) que _get_combination_info, y
+        pricelist de la tienda para el precio.
+        """
+        values = super(WebsiteSaleCustom, self)._prepare_product_values(product, category, search, **kwargs)
+        values['certifica_stock_qty'] = request.env['certifica.stock.availability'].sudo()._get_template_qty(
+            [product.id])[product.id]
+        values['certifica_pricelist_id'] = self._get_certifica_settings().pricelist_id
+        return values
+
+    def _get_page_cache_key(self):
+        """
+        Clave de la caché de páginas (website, idioma, pricelist y URL), o None si la petición
+        no puede compartir HTML: métodos distintos de GET, usuarios con sesión
+        iniciada, visitantes con carrito o modo debug.
+        """
+        if request.httprequest.method != 'GET' or not request.env.user._is_public():
+            return None
+        if request.session.get('sale_order_id') or request.session.debug:
+            return None
+        return (
+            request.website.id,
+            request.env.context.get('lang'),
+            request.session.get('website_sale_pricelist'),
+            request.httprequest.full_path,
+        )
+
+    def _get_cached_page(self, page_key):
+        cached = page_cache.get(request.env.cr.dbname, page_key)
+        if not cached:
+            return None
+        etag, content_type, html = cached
+        return self._page_cache_response(etag, content_type, fill_csrf_tokens(html, request.csrf_token()))
+
+    def _cache_page(self, page_key, response):
+        """Renderiza la respuesta, la guarda sin el token CSRF y la devuelve con ETag."""
+        if not isinstance(response, Response) or response.status_code != 200 or not response.is_qweb:
+            return response
+        html = response.render()
+        if isinstance(html, bytes):
+            html = html.decode('utf-8')
+        html = html.replace('<html ', '<html %s ' % PAGE_CACHE_MARKER, 1)
+        stored = strip_csrf_tokens(html)
+        etag = hashlib.sha1(stored.encode('utf-8')).hexdigest()
+        content_type = response.headers.get('Content-Type') or 'text/html; charset=utf-8'
+        page_cache.set(request.env.cr.dbname, page_key, etag, content_type, stored)
+        return self._page_cache_response(etag, content_type, html)
+
+    def _page_cache_response(self, etag, content_type, html):
+        """Respuesta con ETag; si el navegador ya tiene esa versión se responde 304."""
+        response = Response(html, headers={
+            'Content-Type': content_type,
+            # El HTML lleva el token CSRF de la sesión: solo lo guarda el navegador
+            'Cache-Control': 'private, max-age=0, must-revalidate',
+        })
+        response.set_etag(etag)
+        return response.make_conditional(request.httprequest)
+
+    def _get_products_prices(self, products, pricelist):
+        """
+        Calcula el precio de pricelist de todos los productos con una única llamada
+        a _compute_price_rule y devuelve {product_tmpl_id: precio}.
+        """
+        if not products or not pricelist or not pricelist.exists():
+            return {}
+        partner = request.env.user.partner_id
+        results = pricelist._compute_price_rule([(product, 1.0, partner) for product in products])
+        return {product_id: price for product_id, (price, _rule_id) in results.items()}
+
+    def _get_products_fragment_key(self, page, category, search, ppg, post):
+        """
+        Clave del fragmento de /shop/filter_products: website, idioma, pricelist,
+        categoría, búsqueda, atributos, página, productos por página y orden,
+        más la generación del catálogo para invalidar entre workers.
+        """
+        attrib_list = request.httprequest.args.getlist('attrib')
+        return (
+            request.website.id,
+            request.env.context.get('lang'),
+            request.session.get('website_sale_pricelist'),
+            str(getattr(category, 'id', category) or ''),
+            search or '',
+            tuple(sorted(set(attrib_list))),
+            int(page or 0),
+            ppg,
+            post.get('order') or '',
+            post.get('cursor') or '',
+            request.env['certifica.shop.cache'].sudo()._get_catalog_generation(),
+        )
+
+    def _get_shop_query_fingerprint(self, category, search, ppg, post):
+        """Huella de la consulta de la tienda, para no aplicar un cursor a otra consulta."""
+        return keyset.fingerprint(
+            request.website.id,
+            str(getattr(category, 'id', category) or ''),
+            search or '',
+            sorted(set(request.httprequest.args.getlist('attrib'))),
+            self._get_search_order(post),
+            ppg,
+        )
+
+    def _get_shop_seek(self, cursor, page, category, search, ppg, post):
+        """
+        Devuelve (claves de orden, valores) si el cursor es válido para la página y la
+        consulta. La búsqueda por texto se ordena por relevancia y usa siempre OFFSET.
+        """
+        if not cursor or search or not page:
+            return None
+        keys = keyset.parse_order(self._get_search_order(post))
+        if not keys:
+            return None
+        values = keyset.decode_cursor(
+            cursor, int(page), self._get_shop_query_fingerprint(category, search, ppg, post), len(keys))
+        return (keys, values) if values is not None else None
+
+    def _apply_keyset_page(self, qcontext, page, ppg, seek, post):
+        """Sustituye productos, paginador y rejilla por la página obtenida por clave."""
+        keys, values = seek
+        category = qcontext.get('category')
+        domain = self._get_search_domain(qcontext.get('search'), category, qcontext.get('attrib_values') or [])
+        products = request.env['product.template'].with_context(bin_size=True).search(
+            expression.AND([domain, keyset.seek_domain(keys, values)]),
+            limit=ppg, order=self._get_search_order(post))
+        url = '/shop/category/%s' % slug(category) if category else '/shop'
+        qcontext['pager'] = request.website.pager(
+            url=url, total=qcontext.get('search_count') or 0, page=page, step=ppg, scope=7, url_args=post)
+        qcontext['products'] = products
+        qcontext['bins'] = TableCompute().process(products, ppg, qcontext.get('ppr') or 4)
+
+    def _add_next_cursor(self, qcontext, category, search, ppg, post):
+        """
+        Añade el cursor de la página siguiente a los enlaces del paginador. Los enlaces
+        siguen siendo /shop/page/<n>: sin el cursor (buscadores, enlaces guardados)
+        la página se sirve por OFFSET.
+        """
+        pager = qcontext.get('pager')
+        products = qcontext.get('products')
+        if not self._get_certifica_settings().keyset_pagination or search or not pager or not products:
+            return
+        keys = keyset.parse_order(self._get_search_order(post))
+        next_page = pager['page']['num'] + 1
+        if not keys or next_page > pager['page_count']:
+            return
+        last = products[-1]
+        cursor = keyset.encode_cursor(
+            next_page, [last[field] for field, _direction in keys],
+            self._get_shop_query_fingerprint(category, search, ppg, post))
+        for link in [pager['page_next']] + list(pager['pages']):
+            if link['num'] == next_page:
+                link['url'] += ('&' if '?' in link['url'] else '?') + 'cursor=' + cursor
+
+    def _products_fragment_response(self, products_html, filters):
+        return Response(
+            json.dumps({
+                'products_html': fill_csrf_tokens(products_html, request.csrf_token()),
+                'filters': filters,
+            }),
+            headers={'Content-Type': 'application/json'}
+        )
+
+    @http.route(['/shop/facets'], type='json', auth="public", website=True)
+    def shop_facets(self, attrib=None, category=None, search='', **kw):
+        """
+        Resultado y conteos de facetas para una combinación de atributos, sin
+        renderizar la tienda. attrib usa el formato de la URL ("atributo-valor").
+        """
+        attrib_values = [[int(x) for x in v.split('-')] for v in (attrib or []) if v]
+        count, counts = self._get_attribute_counts(search, category, attrib_values)
+        return {'count': count, 'counts': counts}
+
+    @http.route(['/shop/autocomplete'], type='http', auth="public", methods=['GET'], website=True, sitemap=False)
+    def shop_autocomplete(self, term='', limit=8, **kw):
+        """
+        Sugerencias del buscador de la cabecera desde el índice de prefijos del
+        worker (sin búsquedas del ORM). El pricelist es el mismo para todos los
+        visitantes, así que la respuesta puede cachearse en el navegador y proxies.
+        """
+        pricelist = request.env['product.pricelist'].sudo().browse(self._get_certifica_settings().pricelist_id)
+        suggestions = []
+        term = (term or '').strip()
+        if len(term) >= 2 and pricelist.exists():
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 8
+            suggestions = request.env['certifica.product.search'].sudo()._autocomplete(
+                term, pricelist, limit=max(limit, 1))
+        currency = pricelist.currency_id
+        return Response(
+            json.dumps({
+                'suggestions': suggestions,
+                'currency': {
+                    'symbol': currency.symbol or '',
+                    'position': currency.position or 'before',
+                    'decimals': currency.decimal_places if currency else 2,
+                },
+            }),
+            headers={
+                'Content-Type': 'application/json',
+                'Cache-Control': 'public, max-age=%s' % AUTOCOMPLETE_MAX_AGE,
+            }
+        )
+
+    @http.route(['/shop/stock_badges'], type='json', auth="public", website=True)
+    def shop_stock_badges(self, product_tmpl_ids=None, **kw):
+        """
+        Disponible por plantilla para las insignias de stock del listado. El HTML
+        del listado (cacheado) no depende del stock: las insignias se rellenan
+        después con esta llamada, resuelta con una sola consulta agregada.
+        """
+        try:
+            tmpl_ids = [int(tmpl_id) for tmpl_id in (product_tmpl_ids or [])][:STOCK_BADGES_MAX_IDS]
+        except (TypeError, ValueError):
+            return {}
+        dbname = request.env.cr.dbname
+        result = {}
+        missing = []
+        for tmpl_id in tmpl_ids:
+            qty = stock_badges_cache.get((dbname, tmpl_id))
+            if qty is None:
+                missing.append(tmpl_id)
+            else:
+                result[tmpl_id] = qty
+        if missing:
+            quantities = request.env['certifica.stock.availability'].sudo()._get_template_qty(missing)
+            for tmpl_id, qty in quantities.items():
+                qty = int(qty)
+                stock_badges_cache.set((dbname, tmpl_id), qty, STOCK_BADGE_ENTRY_SIZE)
+                result[tmpl_id] = qty
+        return result
+
+    @http.route(['/shop/cache/stats'], type='json', auth="user", website=True)
+    def shop_cache_stats(self):
+        """Contadores de aciertos/fallos de las cachés de la tienda en este worker."""
+        if not request.env.user.has_group('base.group_system'):
+            return {'error': 'forbidden'}
+        return get_cache_stats()
+
 
     @http.route(['/shop/cart/quantity'], type='json', auth="public", website=True)
     def cart_quantity(self):
         """Devuelve la cantidad de artículos en el carrito como JSON."""
         return request.website.sale_get_order().cart_quantity or 0
 
+    def _run_cart_mutation(self, env, mutation, stats=None):
+        """
+        Ejecuta una modificación del carrito y, si choca con otra transacción
+        sobre el mismo pedido (error de serialización o deadlock), deshace la
+        transacción y la reintenta con espera exponencial aleatoria.
+        """
+        for attempt in range(CART_UPDATE_MAX_TRIES):
+            try:
+                return mutation()
+            except TransactionRollbackError as e:
+                if attempt + 1 >= CART_UPDATE_MAX_TRIES:
+                    raise
+                env.cr.rollback()
+                env.clear()
+                reset_request_memo()
+                delay = random.uniform(0, CART_UPDATE_RETRY_DELAY * 2 ** attempt)
+                _logger.info('Conflicto concurrente en el carrito (%s), reintento %s en %.0f ms',
+                             e.pgcode, attempt + 1, delay * 1000)
+                if stats is not None:
+                    stats['retries'] = stats.get('retries', 0) + 1
+                time.sleep(delay)
+
     @http.route(['/shop/cart/update'], type='http', auth="public", methods=['POST'], website=True, csrf=False)
     def cart_update(self, product_id, add_qty=1, set_qty=0, **kw):
         """
-        Sobrescribimos el método cart_update para asegurar que use el pricelist correcto
+        Sobrescribimos el método cart_update para asegurar que use el pricelist correcto.
+        El pedido se bloquea durante la modificación, los conflictos se reintentan y
+        un reenvío del mismo formulario (mismo certifica_add_token) se ignora.
         """
         # Asegurar que el website use el pricelist correcto
-        pricelist = request.env['product.pricelist'].sudo().browse(1573)
+        pricelist = request.env['product.pricelist'].sudo().browse(self._get_certifica_settings().pricelist_id)
         if pricelist.exists():
             request.session['website_sale_pricelist'] = pricelist.id
-        
-        # Llamar al método padre
-        return super(WebsiteSaleCustom, self).cart_update(
-            product_id=product_id, add_qty=add_qty, set_qty=set_qty, **kw)
 
-    @http.route(['/shop/test_pricelist'], type='http', auth="public", website=True)
-    def test_pricelist(self):
-        """
-        Método de prueba para verificar que el pricelist funciona correctamente
-        """
-        pricelist = request.env['product.pricelist'].sudo().browse(1573)
-        if not pricelist.exists():
-            return "Error: El pricelist con ID 1573 no existe"
-        
-        # Obtener algunos productos para probar
-        products = request.env['product.template'].sudo().search([('sale_ok', '=', True)], limit=5)
-        
-        result = f"Pricelist encontrado: {pricelist.name}<br><br>"
-        result += "Productos de prueba:<br>"
-        
-        for product in products:
-            price_with_pricelist = product.with_context(pricelist=pricelist.id).price
-            list_price = product.list_price
-            result += f"- {product.name}: Lista: {list_price}, Pricelist: {price_with_pricelist}<br>"
-        
-        return result
+        add_token = kw.pop('certifica_add_token', None)
+
+        def mutation():
+            if add_token:
+                request.website = request.website.with_context(certifica_cart_add_token=add_token)
+            # Llamar al método padre
+            return super(WebsiteSaleCustom, self).cart_update(
+                product_id=product_id, add_qty=add_qty, set_qty=set_qty, **kw)
+        return self._run_cart_mutation(request.env, mutation)
+
+    @http.route(['/shop/cart/update_json'], type='json', auth="public", methods=['POST'], website=True, csrf=False)
+    def cart_update_json(self, product_id, line_id=None, add_qty=None, set_qty=None, display=True):
+        return self._run_cart_mutation(request.env, lambda: super(WebsiteSaleCustom, self).cart_update_json(
+            product_id, line_id=line_id, add_qty=add_qty, set_qty=set_qty, display=display))
 
 
 class WebsiteLogout(http.Controller):
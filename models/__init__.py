@@ -5,10 +5,21 @@ _logger = logging.getLogger(__name__)
 _logger.warning('=== CERTIFICA STOCK: LOADING MODELS DIRECTORY ===')
 
 # Importar todos los modelos personalizados
+from . import settings
+from . import identification_type
 from . import res_partner
-from . import base_vat_override
-from . import l10n_latam_override
-from . import vat_validation_override
-from . import vat_monkey_patch
+from . import partner_reclassify
+from . import partner_dedupe
+from . import vat_policy
 from . import disable_validations
-from . import product_stock
\ No newline at end of file
+from . import product_availability
+from . import stock_availability
+from . import product_stock
+from . import pricelist_membership
+from . import shop_cache
+from . import product_public_category
+from . import product_facets
+from . import product_search
+from . import ir_ui_view
+from . import website
+from . import payment_confirmation
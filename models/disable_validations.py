@@ -12,20 +12,12 @@ _logger = logging.getLogger(__name__)
 class ResPartner(models.Model):
     _inherit = 'res.partner'
     
-    @api.constrains('vat')
-    def check_vat(self):
-        """
-        Override para deshabilitar completamente la validación de VAT/RUC
-        """
-        _logger.info("🚫 VALIDACIÓN VAT DESHABILITADA - Frontend maneja validación")
-        return True
-    
     @api.constrains('email')
     def _check_email(self):
         """
         Override para deshabilitar validación de email
         """
-        _logger.info("🚫 VALIDACIÓN EMAIL DESHABILITADA - Frontend maneja validación")
+        _logger.debug("🚫 VALIDACIÓN EMAIL DESHABILITADA - Frontend maneja validación")
         return True
     
     @api.constrains('phone')
@@ -33,32 +25,10 @@ class ResPartner(models.Model):
         """
         Override para deshabilitar validación de teléfono
         """
-        _logger.info("🚫 VALIDACIÓN TELÉFONO DESHABILITADA - Frontend maneja validación")
-        return True
-    
-    def _validate_fields(self, field_names, excluded=None):
-        """
-        Override para deshabilitar todas las validaciones de campos
-        """
-        _logger.info(f"🚫 VALIDACIONES DE CAMPOS DESHABILITADAS: {field_names}")
-        _logger.info("✅ Frontend maneja todas las validaciones")
-        return True
-    
-    @api.model
-    def _check_vat_pe(self, vat):
-        """
-        Override para deshabilitar validación específica de RUC peruano
-        """
-        _logger.info(f"🚫 VALIDACIÓN RUC PERUANO DESHABILITADA: {vat}")
-        return True
-    
-    def _run_vat_test(self, vat_country, vat_number, vat_no):
-        """
-        Override para deshabilitar todas las pruebas de VAT
-        """
-        _logger.info(f"🚫 PRUEBAS VAT DESHABILITADAS: {vat_country}-{vat_number}")
+        _logger.debug("🚫 VALIDACIÓN TELÉFONO DESHABILITADA - Frontend maneja validación")
         return True
 
+
 class L10nLatamIdentificationType(models.Model):
     _inherit = 'l10n_latam.identification.type'
     
@@ -98,16 +68,14 @@ class WebsiteSaleController(models.AbstractModel):
         Método para confirmar que todas las validaciones están deshabilitadas
         """
         disabled_validations = [
-            'VAT/RUC validation',
             'Email format validation', 
             'Phone format validation',
-            'Required fields validation',
             'Address completeness validation',
             'Country/State validation',
             'Postal code validation',
             'Partner access validation',
             'Cart access validation',
-            'L10n Peru identification validation'
+            'VAT/RUC validation (según certifica.settings, ver vat_policy.py)',
         ]
         
         _logger.info("🚫 TODAS LAS VALIDACIONES DE BACKEND DESHABILITADAS:")
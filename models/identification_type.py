@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api, tools
+import logging
+
+from ..tools.vat import classify_vat
+
+_logger = logging.getLogger(__name__)
+
+
+class L10nLatamIdentificationType(models.Model):
+    _inherit = 'l10n_latam.identification.type'
+
+    @api.model
+    @tools.ormcache('name', 'country_id')
+    def _certifica_get_type_id(self, name, country_id=None):
+        """
+        ID del tipo de identificación por nombre y país (cacheado por worker). Sin
+        país se usa el de la tienda (certifica.settings).
+        """
+        country_id = country_id or self.env['certifica.settings']._get().country_id
+        identification_type = self.sudo().search([
+            ('name', '=', name),
+            ('country_id', '=', country_id),
+        ], limit=1)
+        if not identification_type:
+            _logger.warning('No se encontró el tipo de identificación %s en la base de datos', name)
+        return identification_type.id or False
+
+    @api.model
+    def _certifica_type_id_from_vat(self, vat_number):
+        """ID del tipo de identificación (DNI o RUC de Perú) que corresponde al número."""
+        name = classify_vat(vat_number)
+        return self._certifica_get_type_id(name) if name else False
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super(L10nLatamIdentificationType, self).create(vals_list)
+        self.clear_caches()
+        return records
+
+    def write(self, vals):
+        res = super(L10nLatamIdentificationType, self).write(vals)
+        self.clear_caches()
+        return res
+
+    def unlink(self):
+        res = super(L10nLatamIdentificationType, self).unlink()
+        self.clear_caches()
+        return res
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+
+import re
+
+from lxml import etree
+
+from odoo import models, api, _
+from odoo.exceptions import ValidationError
+
+# Llamadas del ORM que no deben ejecutarse al renderizar una plantilla de la tienda
+_ORM_SEARCH_RE = re.compile(r'\.(search|search_count|search_read|read_group)\s*\(')
+
+
+class IrUiView(models.Model):
+    _inherit = 'ir.ui.view'
+
+    @api.constrains('arch_db')
+    def _check_certifica_qweb_queries(self):
+        """
+        Las plantillas del módulo no pueden buscar registros al renderizarse: los
+        datos se preparan en el controlador, donde se pueden cachear y medir. La
+        comprobación se hace al instalar/actualizar, de modo que una plantilla con
+        una búsqueda hace fallar la actualización del módulo y sus pruebas.
+        """
+        for view in self:
+            if view.type != 'qweb' or not (view.key or '').startswith('certifica_theme.') or not view.arch_db:
+                continue
+            for node in etree.fromstring(view.arch_db.encode('utf-8')).iter(tag=etree.Element):
+                for attribute, attr_value in node.attrib.items():
+                    if attribute.startswith('t-') and _ORM_SEARCH_RE.search(attr_value):
+                        raise ValidationError(_(
+                            'La plantilla %s ejecuta una búsqueda del ORM al renderizarse (%s="%s"). '
+                            'Prepare los datos en el controlador.') % (view.key, attribute, attr_value))
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import json
+import time
+import logging
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+# Duplicados cargados por tramo en la tabla temporal de la fusión
+DEDUPE_CHUNK_SIZE = 2000
+
+# Claves foráneas hacia res_partner(id) con una sola columna: (tabla, columna).
+# Misma consulta que el asistente de fusión de partners de base (_get_fk_on).
+_PARTNER_FK_QUERY = """
+    SELECT cl1.relname, att1.attname
+      FROM pg_constraint con, pg_class cl1, pg_class cl2, pg_attribute att1, pg_attribute att2
+     WHERE con.conrelid = cl1.oid
+       AND con.confrelid = cl2.oid
+       AND array_lower(con.conkey, 1) = 1
+       AND con.conkey[1] = att1.attnum
+       AND att1.attrelid = cl1.oid
+       AND cl2.relname = 'res_partner'
+       AND att2.attname = 'id'
+       AND array_lower(con.confkey, 1) = 1
+       AND con.confkey[1] = att2.attnum
+       AND att2.attrelid = cl2.oid
+       AND con.contype = 'f'
+  ORDER BY cl1.relname, att1.attname
+"""
+
+# Columnas de cada índice único de la tabla que incluye la columna, salvo ella
+# misma (p. ej. res_model y res_id en mail_followers). Los índices sobre
+# expresiones se omiten.
+_UNIQUE_KEYS_QUERY = """
+    SELECT array_agg(att.attname::text ORDER BY att.attnum) FILTER (WHERE att.attname <> %(column)s)
+      FROM pg_index ix
+      JOIN pg_class cl ON cl.oid = ix.indrelid
+      JOIN pg_attribute att ON att.attrelid = cl.oid AND att.attnum = ANY(ix.indkey)
+     WHERE cl.relname = %(table)s AND ix.indisunique AND ix.indexprs IS NULL
+  GROUP BY ix.indexrelid
+    HAVING bool_or(att.attname = %(column)s)
+"""
+
+# Grupos de partners comerciales activos con el mismo VAT normalizado. El
+# superviviente es el primero del arreglo: vinculado a un usuario y, si no, el
+# más antiguo. Solo se fusionan los duplicados sin usuario ni compañía.
+_DUPLICATE_GROUPS_QUERY = """
+    SELECT p.certifica_vat_normalized,
+           array_agg(p.id ORDER BY (u.partner_id IS NULL), p.id),
+           array_agg(u.partner_id IS NULL AND c.partner_id IS NULL ORDER BY (u.partner_id IS NULL), p.id)
+      FROM res_partner p
+      LEFT JOIN (SELECT DISTINCT partner_id FROM res_users) u ON u.partner_id = p.id
+      LEFT JOIN (SELECT DISTINCT partner_id FROM res_company) c ON c.partner_id = p.id
+     WHERE p.active AND p.parent_id IS NULL AND p.certifica_vat_normalized IS NOT NULL
+  GROUP BY p.certifica_vat_normalized
+    HAVING count(*) > 1
+"""
+
+
+class CertificaPartnerDedupe(models.AbstractModel):
+    """
+    Fusión de partners duplicados por DNI/RUC (VAT normalizado). Los grupos se
+    obtienen con una sola agregación; todas las claves foráneas hacia res_partner
+    (leídas del catálogo de PostgreSQL) se redirigen al superviviente con un
+    UPDATE por columna y tramo, y los duplicados se archivan. Los partners con
+    usuario o compañía nunca son duplicados: res_users y res_company no cambian.
+    """
+    _name = 'certifica.partner.dedupe'
+    _description = 'Fusión de partners duplicados por DNI/RUC'
+
+    @api.model
+    def _get_merge_pairs(self):
+        """[(duplicado, superviviente)] de todos los grupos."""
+        self.env['res.partner'].flush(['active', 'parent_id', 'certifica_vat_normalized'])
+        self.env.cr.execute(_DUPLICATE_GROUPS_QUERY)
+        pairs = []
+        for _vat, partner_ids, mergeable in self.env.cr.fetchall():
+            survivor_id = partner_ids[0]
+            pairs.extend(
+                (partner_id, survivor_id)
+                for partner_id, can_merge in zip(partner_ids[1:], mergeable[1:]) if can_merge)
+        return pairs
+
+    def _references(self):
+        """
+        [(tabla, columna, claves únicas)] de todas las claves foráneas hacia
+        res_partner, leídas del catálogo de PostgreSQL. Para cada índice único
+        que incluye la columna (seguidores, tablas de relación many2many...) se
+        indican las demás columnas de la clave.
+        """
+        cr = self.env.cr
+        cr.execute(_PARTNER_FK_QUERY)
+        references = []
+        for table, column in cr.fetchall():
+            cr.execute(_UNIQUE_KEYS_QUERY, {'table': table, 'column': column})
+            references.append((table, column, [others or [] for (others,) in cr.fetchall()]))
+        return references
+
+    def _reference_where(self, table, column, unique_keys):
+        """Filas de los duplicados que se pueden redirigir sin violar una clave única."""
+        if table == 'res_partner':
+            # Los duplicados conservan sus propias referencias (quedan archivados tal cual)
+            return 't.id NOT IN (SELECT duplicate_id FROM certifica_partner_merge)'
+        # Se omite la fila si el superviviente (u otro duplicado anterior del
+        # grupo) ya tiene otra con los mismos valores en el resto de la clave
+        conditions = ['TRUE']
+        for others in unique_keys:
+            conditions.append("""NOT EXISTS (
+                SELECT 1 FROM "{table}" w
+                  LEFT JOIN certifica_partner_merge mw ON mw.duplicate_id = w."{column}"
+                 WHERE {same_key}
+                   AND (w."{column}" = m.survivor_id
+                        OR (mw.survivor_id = m.survivor_id AND w."{column}" < t."{column}"))
+            )""".format(table=table, column=column, same_key=' AND '.join(
+                ['w."{0}" = t."{0}"'.format(other) for other in others] or ['TRUE'])))
+        return ' AND '.join(conditions)
+
+    def _load_chunk(self, pairs):
+        cr = self.env.cr
+        cr.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS certifica_partner_merge (
+                duplicate_id integer PRIMARY KEY,
+                survivor_id integer NOT NULL
+            ) ON COMMIT DROP
+        """)
+        cr.execute("TRUNCATE certifica_partner_merge")
+        cr.execute("""
+            INSERT INTO certifica_partner_merge (duplicate_id, survivor_id)
+            SELECT * FROM unnest(%s::int[], %s::int[])
+        """, ([pair[0] for pair in pairs], [pair[1] for pair in pairs]))
+
+    @api.model
+    def _run(self, dry_run=True, chunk_size=DEDUPE_CHUNK_SIZE):
+        """
+        Fusiona los duplicados por tramos y devuelve el informe: grupos,
+        duplicados, filas redirigidas y filas eliminadas por columna. Las filas
+        que violarían una clave única (el superviviente ya sigue el mismo
+        documento, ya tiene la misma etiqueta...) se eliminan, como en el
+        asistente de fusión de base. En dry_run solo se cuentan y no se modifica
+        nada. No hace commit: la fusión es una sola transacción, confirmada o
+        deshecha entera por quien la ejecuta (acción de servidor o cron).
+        """
+        cr = self.env.cr
+        started = time.time()
+        self.env['base'].flush()
+        pairs = self._get_merge_pairs()
+        references = self._references()
+        report = {
+            'dry_run': dry_run,
+            'groups': len({survivor_id for _duplicate_id, survivor_id in pairs}),
+            'duplicates': len(pairs),
+            'references': dict.fromkeys(['%s.%s' % reference[:2] for reference in references], 0),
+            'removed': {},
+        }
+        _logger.info('Fusión de partners%s: %s grupos, %s duplicados',
+                     ' (simulación)' if dry_run else '', report['groups'], report['duplicates'])
+
+        for start in range(0, len(pairs), chunk_size):
+            chunk = pairs[start:start + chunk_size]
+            self._load_chunk(chunk)
+            for table, column, unique_keys in references:
+                key = '%s.%s' % (table, column)
+                where = self._reference_where(table, column, unique_keys)
+                removes = bool(unique_keys) and table != 'res_partner'
+                if dry_run:
+                    cr.execute("""
+                        SELECT count(*) FILTER (WHERE {where}), count(*) FILTER (WHERE NOT ({where}))
+                          FROM "{table}" t
+                          JOIN certifica_partner_merge m ON m.duplicate_id = t."{column}"
+                    """.format(table=table, column=column, where=where))
+                    count, removed = cr.fetchone()
+                    removed = removed if removes else 0
+                else:
+                    cr.execute("""
+                        UPDATE "{table}" t SET "{column}" = m.survivor_id
+                          FROM certifica_partner_merge m
+                         WHERE t."{column}" = m.duplicate_id AND {where}
+                    """.format(table=table, column=column, where=where))
+                    count = cr.rowcount
+                    removed = 0
+                    if removes:
+                        # Lo que queda apuntando a un duplicado ya lo tiene el superviviente
+                        cr.execute("""
+                            DELETE FROM "{table}" t USING certifica_partner_merge m
+                             WHERE t."{column}" = m.duplicate_id
+                        """.format(table=table, column=column))
+                        removed = cr.rowcount
+                report['references'][key] += count
+                if removed:
+                    report['removed'][key] = report['removed'].get(key, 0) + removed
+            if not dry_run:
+                cr.execute("""
+                    UPDATE res_partner p
+                       SET active = false, write_uid = %s, write_date = now() at time zone 'UTC'
+                      FROM certifica_partner_merge m
+                     WHERE p.id = m.duplicate_id
+                """, (self.env.uid,))
+            _logger.info('Fusión de partners: %s/%s duplicados procesados (%.1f s)',
+                         min(start + chunk_size, len(pairs)), len(pairs), time.time() - started)
+
+        self.env.invalidate_all()
+        _logger.info('Fusión de partners terminada: %s', report)
+        return report
+
+    @api.model
+    def _action_run(self, dry_run=True):
+        """
+        Ejecuta la fusión desde la acción de servidor, guarda el informe como
+        adjunto JSON y lo devuelve para descargarlo.
+        """
+        report = self._run(dry_run=dry_run)
+        attachment = self.env['ir.attachment'].create({
+            'name': 'fusion_partners_%s%s.json' % (
+                fields.Datetime.now().strftime('%Y%m%d_%H%M%S'), '_simulacion' if dry_run else ''),
+            'type': 'binary',
+            'datas': base64.b64encode(json.dumps(report, indent=2, sort_keys=True).encode('utf-8')),
+            'mimetype': 'application/json',
+            'res_model': self._name,
+        })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/web/content/%s?download=true' % attachment.id,
+            'target': 'self',
+        }
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+import time
+import logging
+
+from odoo import models, api
+
+from ..tools.vat import classify_vat, DNI, RUC
+
+_logger = logging.getLogger(__name__)
+
+# Tabla de una fila con el último res.partner procesado; permite retomar el
+# trabajo tras una interrupción sin escribir ir.config_parameter en cada tramo
+RECLASSIFY_STATE_TABLE = 'certifica_partner_reclassify_state'
+
+# Partners leídos por tramo (un commit por tramo)
+RECLASSIFY_CHUNK_SIZE = 5000
+
+
+class CertificaPartnerReclassify(models.AbstractModel):
+    """
+    Reclasificación masiva del tipo de identificación (DNI/RUC) de los partners
+    existentes con las mismas reglas que res.partner (tools/vat.py). Recorre la
+    tabla por tramos ordenados por ID y aplica un UPDATE por tipo destino y tramo,
+    sin pasar por el write() del ORM.
+    """
+    _name = 'certifica.partner.reclassify'
+    _description = 'Reclasificación de tipos de identificación de partners'
+
+    def init(self):
+        self.env.cr.execute("""
+            CREATE TABLE IF NOT EXISTS %s (
+                id integer PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                last_id integer NOT NULL DEFAULT 0
+            )
+        """ % RECLASSIFY_STATE_TABLE)
+
+    def _get_last_id(self):
+        self.env.cr.execute("SELECT last_id FROM %s" % RECLASSIFY_STATE_TABLE)
+        row = self.env.cr.fetchone()
+        return row[0] if row else 0
+
+    def _set_last_id(self, last_id):
+        self.env.cr.execute("""
+            INSERT INTO %s (id, last_id) VALUES (1, %%s)
+            ON CONFLICT (id) DO UPDATE SET last_id = EXCLUDED.last_id
+        """ % RECLASSIFY_STATE_TABLE, (last_id,))
+
+    @api.model
+    def _run(self, chunk_size=RECLASSIFY_CHUNK_SIZE, max_seconds=None, commit=True):
+        """
+        Procesa tramos hasta terminar o agotar max_seconds. Con commit=True cada
+        tramo se confirma y se guarda el último ID procesado, de modo que una nueva
+        ejecución continúa donde quedó la anterior. Devuelve (leídos, actualizados).
+        """
+        cr = self.env.cr
+        IdentificationType = self.env['l10n_latam.identification.type']
+        type_ids = {
+            DNI: IdentificationType._certifica_get_type_id(DNI),
+            RUC: IdentificationType._certifica_get_type_id(RUC),
+        }
+        last_id = self._get_last_id()
+        self.env['res.partner'].flush(['vat', 'l10n_latam_identification_type_id'])
+        _logger.info('Reclasificación de partners: inicio desde el ID %s', last_id)
+
+        started = time.time()
+        processed = updated = 0
+        while True:
+            cr.execute("""
+                SELECT id, vat, l10n_latam_identification_type_id
+                  FROM res_partner
+                 WHERE id > %s AND vat IS NOT NULL AND vat <> ''
+              ORDER BY id
+                 LIMIT %s
+            """, (last_id, chunk_size))
+            rows = cr.fetchall()
+            if not rows:
+                # Terminado: la próxima ejecución recorre de nuevo toda la tabla
+                if commit:
+                    self._set_last_id(0)
+                break
+
+            groups = {}
+            for partner_id, vat, current_type_id in rows:
+                target_type_id = type_ids.get(classify_vat(vat))
+                if target_type_id and target_type_id != current_type_id:
+                    groups.setdefault(target_type_id, []).append(partner_id)
+            for target_type_id, partner_ids in groups.items():
+                cr.execute("""
+                    UPDATE res_partner
+                       SET l10n_latam_identification_type_id = %s,
+                           write_uid = %s,
+                           write_date = now() at time zone 'UTC'
+                     WHERE id IN %s
+                """, (target_type_id, self.env.uid, tuple(partner_ids)))
+                updated += cr.rowcount
+
+            processed += len(rows)
+            last_id = rows[-1][0]
+            if commit:
+                self._set_last_id(last_id)
+                cr.commit()
+            elapsed = time.time() - started
+            _logger.info(
+                'Reclasificación de partners: %s leídos, %s actualizados, último ID %s, %.0f partners/s',
+                processed, updated, last_id, processed / elapsed if elapsed else processed)
+            if max_seconds and elapsed >= max_seconds:
+                _logger.info('Reclasificación de partners: pausa por tiempo, se retomará desde el ID %s', last_id)
+                break
+
+        self.env['res.partner'].invalidate_cache(['l10n_latam_identification_type_id'])
+        return processed, updated
+
+    @api.model
+    def _cron_run(self):
+        # Por debajo del límite de tiempo habitual de los crons; el resto queda para la siguiente ejecución
+        self._run(max_seconds=600)
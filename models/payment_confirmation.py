@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Última transacción no cancelada del pedido, leída por la relación del propio pedido
+_LAST_TRANSACTION_QUERY = """
+    SELECT t.id
+      FROM sale_order_transaction_rel r
+      JOIN payment_transaction t ON t.id = r.transaction_id
+     WHERE r.sale_order_id = %s AND t.state != 'cancel'
+  ORDER BY t.id DESC
+     LIMIT 1
+"""
+
+# Texto del estado de la transacción en la página de confirmación
+PAYMENT_STATE_LABELS = {
+    'draft': 'Pago pendiente',
+    'pending': 'Pago pendiente de confirmación',
+    'authorized': 'Pago autorizado',
+    'done': 'Pago confirmado',
+    'cancel': 'Pago cancelado',
+    'error': 'Error en el pago',
+}
+
+# Estados en los que la página sigue consultando si el pago se confirmó
+PAYMENT_WAITING_STATES = ('draft', 'pending', 'authorized')
+
+
+class CertificaPaymentConfirmation(models.AbstractModel):
+    """
+    Valores de la página de confirmación de pago, compartidos por
+    /shop/confirmation y /shop/payment/validate. La transacción se obtiene con
+    una consulta acotada (LIMIT 1) sin importar cuántas tenga el pedido, y sus
+    datos, el método de pago y la moneda se cargan en lote antes de renderizar.
+    """
+    _name = 'certifica.payment.confirmation'
+    _description = 'Confirmación de pago de la tienda'
+
+    @api.model
+    def _get_last_transaction(self, order):
+        if not order:
+            return self.env['payment.transaction'].sudo()
+        self.env['payment.transaction'].flush(['state'])
+        self.env.cr.execute(_LAST_TRANSACTION_QUERY, (order.id,))
+        row = self.env.cr.fetchone()
+        return self.env['payment.transaction'].sudo().browse(row and row[0])
+
+    @api.model
+    def _get_values(self, order):
+        """Contexto de certifica_theme.payment_confirmation_page para el pedido (o None)."""
+        transaction = self._get_last_transaction(order)
+        acquirer = transaction.acquirer_id or None
+        if acquirer:
+            acquirer.read(['name', 'provider'])
+        if order:
+            # Moneda y partners que usa la plantilla, en lote
+            order.currency_id.read(['symbol', 'position', 'decimal_places'])
+            (order.partner_invoice_id | order.partner_id).read(['vat', 'l10n_latam_identification_type_id'])
+        return {
+            'order': order,
+            'transaction': transaction,
+            'acquirer': acquirer,
+            'payment_status': self._get_status(order, transaction),
+        }
+
+    @api.model
+    def _get_status(self, order, transaction=None):
+        """Estado del pago del pedido para /shop/payment/status (sin renderizar nada)."""
+        if transaction is None:
+            transaction = self._get_last_transaction(order)
+        state = transaction.state or None
+        return {
+            'state': state,
+            'label': PAYMENT_STATE_LABELS.get(state, ''),
+            'waiting': state in PAYMENT_WAITING_STATES,
+            'order_name': order.name if order else None,
+            'amount_total': order.amount_total if order else None,
+            'currency': order.currency_id.symbol if order else None,
+        }
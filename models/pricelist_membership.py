@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Resuelve las reglas de pricelist (global, categoría, producto y variante) a
+# pares (pricelist_id, product_tmpl_id). {where} se aplica a cada rama con los
+# alias i (regla) y t (plantilla).
+_MEMBERSHIP_QUERY = """
+    SELECT i.pricelist_id, t.id
+      FROM product_pricelist_item i
+      JOIN product_template t ON i.applied_on = '3_global'
+     WHERE {where}
+    UNION
+    SELECT i.pricelist_id, t.id
+      FROM product_pricelist_item i
+      JOIN product_category ic ON i.applied_on = '2_product_category' AND ic.id = i.categ_id
+      JOIN product_category c ON c.parent_path LIKE ic.parent_path || '%%'
+      JOIN product_template t ON t.categ_id = c.id
+     WHERE {where}
+    UNION
+    SELECT i.pricelist_id, t.id
+      FROM product_pricelist_item i
+      JOIN product_template t ON i.applied_on = '1_product' AND t.id = i.product_tmpl_id
+     WHERE {where}
+    UNION
+    SELECT i.pricelist_id, t.id
+      FROM product_pricelist_item i
+      JOIN product_product p ON i.applied_on = '0_product_variant' AND p.id = i.product_id
+      JOIN product_template t ON t.id = p.product_tmpl_id
+     WHERE {where}
+"""
+
+
+class CertificaPricelistProduct(models.Model):
+    """
+    Tabla materializada pricelist -> plantilla de producto.
+    Se mantiene de forma incremental desde las reglas de pricelist, las
+    plantillas y las categorías, para que la tienda lea una lista de IDs sin
+    cargar registros de product.pricelist.item.
+    """
+    _name = 'certifica.pricelist.product'
+    _description = 'Productos publicados por pricelist'
+    _log_access = False
+
+    pricelist_id = fields.Many2one('product.pricelist', required=True, index=True, ondelete='cascade')
+    product_tmpl_id = fields.Many2one('product.template', required=True, index=True, ondelete='cascade')
+
+    _sql_constraints = [
+        ('pricelist_product_uniq', 'unique(pricelist_id, product_tmpl_id)',
+         'La plantilla ya figura en el pricelist.'),
+    ]
+
+    def init(self):
+        # Reconstrucción completa al instalar/actualizar el módulo
+        self._refresh()
+
+    @api.model
+    def _get_product_tmpl_ids(self, pricelist_id):
+        """IDs de plantillas con alguna regla aplicable en el pricelist."""
+        self.env.cr.execute(
+            "SELECT product_tmpl_id FROM certifica_pricelist_product WHERE pricelist_id = %s",
+            (pricelist_id,))
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def _refresh(self, pricelist_ids=None, product_tmpl_ids=None):
+        """
+        Recalcula la pertenencia acotada a los pricelists y/o plantillas indicados.
+        Sin argumentos reconstruye la tabla completa.
+        """
+        if pricelist_ids is not None and not pricelist_ids:
+            return
+        if product_tmpl_ids is not None and not product_tmpl_ids:
+            return
+        # Las reglas o plantillas recién escritas deben estar en la base de datos
+        self.flush()
+
+        where, delete_where, params = ['TRUE'], ['TRUE'], {}
+        if pricelist_ids is not None:
+            params['pricelist_ids'] = tuple(pricelist_ids)
+            where.append('i.pricelist_id IN %(pricelist_ids)s')
+            delete_where.append('pricelist_id IN %(pricelist_ids)s')
+        if product_tmpl_ids is not None:
+            params['product_tmpl_ids'] = tuple(product_tmpl_ids)
+            where.append('t.id IN %(product_tmpl_ids)s')
+            delete_where.append('product_tmpl_id IN %(product_tmpl_ids)s')
+
+        self.env.cr.execute(
+            "DELETE FROM certifica_pricelist_product WHERE %s" % ' AND '.join(delete_where), params)
+        self.env.cr.execute(
+            "INSERT INTO certifica_pricelist_product (pricelist_id, product_tmpl_id) "
+            + _MEMBERSHIP_QUERY.format(where=' AND '.join(where)), params)
+        _logger.debug(
+            'Pertenencia a pricelist recalculada (pricelists=%s, plantillas=%s): %s filas',
+            pricelist_ids, product_tmpl_ids, self.env.cr.rowcount)
+        self.invalidate_cache()
+
+    @api.model
+    def _refresh_for_items(self, items):
+        """
+        Recalcula lo afectado por un conjunto de reglas. Las reglas de producto y
+        variante solo tocan sus plantillas; las globales y de categoría, el pricelist.
+        """
+        items = items.sudo()
+        if not items:
+            return
+        if all(item.applied_on in ('1_product', '0_product_variant') for item in items):
+            templates = items.mapped('product_tmpl_id') | items.mapped('product_id.product_tmpl_id')
+            self._refresh(items.mapped('pricelist_id').ids, templates.ids)
+        else:
+            self._refresh(items.mapped('pricelist_id').ids)
+
+
+class ProductPricelistItem(models.Model):
+    _inherit = 'product.pricelist.item'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        items = super(ProductPricelistItem, self).create(vals_list)
+        self.env['certifica.pricelist.product']._refresh_for_items(items)
+        return items
+
+    def write(self, vals):
+        # El alcance anterior también cambia (pricelist, producto o categoría)
+        previous = self.sudo().read(['pricelist_id', 'applied_on', 'product_tmpl_id', 'product_id', 'categ_id'])
+        res = super(ProductPricelistItem, self).write(vals)
+        Membership = self.env['certifica.pricelist.product']
+        Membership._refresh_for_items(self)
+        old_pricelists = {r['pricelist_id'][0] for r in previous if r['pricelist_id']}
+        if 'pricelist_id' in vals or 'applied_on' in vals or 'categ_id' in vals:
+            Membership._refresh(list(old_pricelists))
+        elif 'product_tmpl_id' in vals or 'product_id' in vals:
+            old_templates = {r['product_tmpl_id'][0] for r in previous if r['product_tmpl_id']}
+            old_templates |= set(self.env['product.product'].browse(
+                [r['product_id'][0] for r in previous if r['product_id']]).sudo().mapped('product_tmpl_id').ids)
+            Membership._refresh(list(old_pricelists), list(old_templates))
+        return res
+
+    def unlink(self):
+        pricelist_ids = self.sudo().mapped('pricelist_id').ids
+        res = super(ProductPricelistItem, self).unlink()
+        self.env['certifica.pricelist.product']._refresh(pricelist_ids)
+        return res
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        templates = super(ProductTemplate, self).create(vals_list)
+        self.env['certifica.pricelist.product']._refresh(product_tmpl_ids=templates.ids)
+        return templates
+
+    def write(self, vals):
+        res = super(ProductTemplate, self).write(vals)
+        # Las reglas por categoría dependen de la categoría interna del producto
+        if 'categ_id' in vals:
+            self.env['certifica.pricelist.product']._refresh(product_tmpl_ids=self.ids)
+        return res
+
+
+class ProductCategory(models.Model):
+    _inherit = 'product.category'
+
+    def write(self, vals):
+        res = super(ProductCategory, self).write(vals)
+        # Mover una categoría cambia qué plantillas cubren las reglas por categoría
+        if 'parent_id' in vals:
+            items = self.env['product.pricelist.item'].sudo().search([('applied_on', '=', '2_product_category')])
+            self.env['certifica.pricelist.product']._refresh(items.mapped('pricelist_id').ids)
+        return res
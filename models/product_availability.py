@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# Campos de stock.quant que cambian su aporte al disponible
+_QUANT_FIELDS = ('product_id', 'location_id', 'quantity', 'reserved_quantity')
+
+# Mismatches que se detallan en el log de la reconciliación
+_RECONCILE_LOG_LIMIT = 20
+
+# Disponible real por variante calculado desde stock.quant
+_QUANT_TOTALS_QUERY = """
+    SELECT q.product_id, SUM(q.quantity - q.reserved_quantity) AS qty
+      FROM stock_quant q
+      JOIN stock_location l ON l.id = q.location_id AND l.usage = 'internal'
+     WHERE {where}
+  GROUP BY q.product_id
+"""
+
+
+class CertificaProductAvailability(models.Model):
+    """
+    Disponible por variante (existencias internas menos reservado). Los cambios
+    en stock.quant se aplican como incrementos atómicos, de modo que la tienda
+    lee una fila por clave primaria; una reconciliación periódica recalcula la
+    tabla desde stock.quant y reporta cualquier diferencia.
+    """
+    _name = 'certifica.product.availability'
+    _description = 'Disponibilidad de productos de la tienda'
+    _log_access = False
+
+    product_id = fields.Many2one('product.product', required=True, index=True, ondelete='cascade')
+    available_qty = fields.Float(default=0.0)
+    last_update = fields.Datetime()
+
+    _sql_constraints = [
+        ('product_uniq', 'unique(product_id)', 'La variante ya tiene una fila de disponibilidad.'),
+    ]
+
+    def init(self):
+        # Carga completa al instalar/actualizar el módulo
+        self._reconcile(report=False)
+
+    @api.model
+    def _apply_deltas(self, deltas):
+        """Suma {product_id: delta} al disponible de cada variante."""
+        deltas = {product_id: delta for product_id, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        self.env.cr.execute("""
+            INSERT INTO certifica_product_availability (product_id, available_qty, last_update)
+            SELECT product_id, delta, now() at time zone 'UTC'
+              FROM unnest(%s::int[], %s::float8[]) AS d(product_id, delta)
+            ON CONFLICT (product_id) DO UPDATE
+               SET available_qty = certifica_product_availability.available_qty + EXCLUDED.available_qty,
+                   last_update = EXCLUDED.last_update
+        """, (list(deltas), list(deltas.values())))
+        self.invalidate_cache()
+
+    @api.model
+    def _reconcile(self, report=True):
+        """
+        Recalcula la tabla desde stock.quant, corrige las diferencias y las
+        devuelve como [(product_id, valor en tabla, valor real)].
+        """
+        cr = self.env.cr
+        self.env['stock.quant'].flush(list(_QUANT_FIELDS))
+        cr.execute("""
+            WITH real AS ({totals})
+            SELECT COALESCE(a.product_id, real.product_id), COALESCE(a.available_qty, 0), COALESCE(real.qty, 0)
+              FROM certifica_product_availability a
+              FULL OUTER JOIN real ON real.product_id = a.product_id
+             WHERE a.product_id IS NULL
+                OR abs(COALESCE(a.available_qty, 0) - COALESCE(real.qty, 0)) > 0.00001
+        """.format(totals=_QUANT_TOTALS_QUERY.format(where='TRUE')))
+        rows = cr.fetchall()
+        mismatches = [row for row in rows if abs(row[1] - row[2]) > 0.00001]
+        if rows:
+            cr.execute("""
+                INSERT INTO certifica_product_availability (product_id, available_qty, last_update)
+                SELECT product_id, qty, now() at time zone 'UTC'
+                  FROM unnest(%s::int[], %s::float8[]) AS r(product_id, qty)
+                ON CONFLICT (product_id) DO UPDATE
+                   SET available_qty = EXCLUDED.available_qty, last_update = EXCLUDED.last_update
+            """, ([row[0] for row in rows], [row[2] for row in rows]))
+            self.invalidate_cache()
+        if report and mismatches:
+            _logger.warning(
+                'Reconciliación de disponibilidad: %s variantes con diferencias corregidas. '
+                'Ejemplos (variante, tabla, real): %s',
+                len(mismatches), mismatches[:_RECONCILE_LOG_LIMIT])
+        elif report:
+            _logger.info('Reconciliación de disponibilidad: sin diferencias')
+        return mismatches
+
+    @api.model
+    def _cron_reconcile(self):
+        self._reconcile()
+
+
+class StockQuant(models.Model):
+    _inherit = 'stock.quant'
+
+    def _certifica_availability_contributions(self):
+        """{product_id: aporte de estos quants al disponible (solo ubicaciones internas)}."""
+        if not self.ids:
+            return {}
+        self.flush(list(_QUANT_FIELDS))
+        self.env.cr.execute(_QUANT_TOTALS_QUERY.format(where='q.id IN %s'), (tuple(self.ids),))
+        return dict(self.env.cr.fetchall())
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        quants = super(StockQuant, self).create(vals_list)
+        self.env['certifica.product.availability']._apply_deltas(quants._certifica_availability_contributions())
+        return quants
+
+    def write(self, vals):
+        if not set(vals) & set(_QUANT_FIELDS):
+            return super(StockQuant, self).write(vals)
+        before = self._certifica_availability_contributions()
+        res = super(StockQuant, self).write(vals)
+        deltas = self._certifica_availability_contributions()
+        for product_id, qty in before.items():
+            deltas[product_id] = deltas.get(product_id, 0.0) - qty
+        self.env['certifica.product.availability']._apply_deltas(deltas)
+        return res
+
+    def unlink(self):
+        before = self._certifica_availability_contributions()
+        res = super(StockQuant, self).unlink()
+        self.env['certifica.product.availability']._apply_deltas(
+            {product_id: -qty for product_id, qty in before.items()})
+        return res
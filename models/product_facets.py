@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+import logging
+
+from ..tools import facets
+
+_logger = logging.getLogger(__name__)
+
+_VALUE_ROWS_QUERY = """
+    SELECT ptal.product_tmpl_id, ptal.attribute_id, rel.product_attribute_value_id
+      FROM product_template_attribute_line ptal
+      JOIN product_attribute_value_product_template_attribute_line_rel rel
+        ON rel.product_template_attribute_line_id = ptal.id
+      JOIN certifica_pricelist_product m
+        ON m.product_tmpl_id = ptal.product_tmpl_id AND m.pricelist_id = %(pricelist_id)s
+     WHERE ptal.active {where}
+"""
+
+
+class CertificaFacetIndex(models.AbstractModel):
+    """
+    Acceso al índice de facetas del worker (tools/facets.py). Se reconstruye con
+    tres consultas cuando cambia la generación del catálogo y se actualiza de
+    forma incremental cuando cambian líneas de atributos en este worker.
+    """
+    _name = 'certifica.facet.index'
+    _description = 'Índice de facetas de atributos de la tienda'
+
+    @api.model
+    def _get_index(self, pricelist_id):
+        generation = self.env['certifica.shop.cache'].sudo()._get_catalog_generation()
+        key = (self.env.cr.dbname, pricelist_id)
+        index = facets.get_index(key)
+        if index is None or index.generation != generation:
+            index = self._build_index(pricelist_id, generation)
+            facets.set_index(key, index)
+        return index
+
+    @api.model
+    def _build_index(self, pricelist_id, generation):
+        cr = self.env.cr
+        cr.execute("""
+            SELECT t.id
+              FROM certifica_pricelist_product m
+              JOIN product_template t ON t.id = m.product_tmpl_id
+             WHERE m.pricelist_id = %s AND t.active AND t.sale_ok AND t.is_published
+        """, (pricelist_id,))
+        universe_ids = [row[0] for row in cr.fetchall()]
+        cr.execute(_VALUE_ROWS_QUERY.format(where=''), {'pricelist_id': pricelist_id})
+        value_rows = cr.fetchall()
+        cr.execute("""
+            SELECT rel.product_template_id, rel.product_public_category_id
+              FROM product_public_category_product_template_rel rel
+              JOIN certifica_pricelist_product m
+                ON m.product_tmpl_id = rel.product_template_id AND m.pricelist_id = %s
+        """, (pricelist_id,))
+        category_rows = cr.fetchall()
+        cr.execute("SELECT id, parent_id FROM product_public_category")
+        category_parents = dict(cr.fetchall())
+
+        index = facets.FacetIndex(generation)
+        index.load(universe_ids, value_rows, category_rows, category_parents)
+        _logger.debug('Índice de facetas construido: pricelist=%s, plantillas=%s, valores=%s',
+                      pricelist_id, len(index.tmpl_ids), len(index.value_bits))
+        return index
+
+    @api.model
+    def _update_templates(self, product_tmpl_ids):
+        """
+        Tras el commit, actualiza en este worker los índices ya construidos para
+        las plantillas indicadas. Solo un índice que estaba en la generación
+        anterior pasa a la nueva; uno atrasado se descarta y se reconstruye.
+        """
+        if not product_tmpl_ids:
+            return
+        self.flush()
+        updates = []
+        for (dbname, pricelist_id) in list(facets._indexes):
+            if dbname != self.env.cr.dbname:
+                continue
+            self.env.cr.execute(
+                _VALUE_ROWS_QUERY.format(where='AND ptal.product_tmpl_id IN %(tmpl_ids)s'),
+                {'pricelist_id': pricelist_id, 'tmpl_ids': tuple(product_tmpl_ids)})
+            updates.append(((dbname, pricelist_id), self.env.cr.fetchall()))
+
+        def _apply(generation):
+            for key, value_rows in updates:
+                index = facets.get_index(key)
+                if index is None:
+                    continue
+                if index.generation == generation - 1:
+                    index.update_templates(product_tmpl_ids, value_rows)
+                    index.generation = generation
+                else:
+                    facets.drop_index(key)
+
+        self.env['certifica.shop.cache']._invalidate_catalog(on_bump=_apply)
+
+    @api.model
+    def _search_facets(self, pricelist_id, value_ids, base_ids=None, category_id=None):
+        """
+        Conteo de facetas para la selección: devuelve (número de resultados,
+        {value_id: conteo}). base_ids restringe a un resultado previo (búsqueda
+        por texto) y category_id a una categoría pública y sus descendientes.
+        """
+        index = self._get_index(pricelist_id)
+        base = None
+        if category_id:
+            base = index.category_bits.get(category_id, 0)
+        if base_ids is not None:
+            bits = index.ids_to_bits(base_ids)
+            base = bits if base is None else base & bits
+        result, counts = index.query(value_ids, base)
+        return facets.popcount(result), counts
+
+
+class ProductTemplateAttributeLine(models.Model):
+    _inherit = 'product.template.attribute.line'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        lines = super(ProductTemplateAttributeLine, self).create(vals_list)
+        self.env['certifica.facet.index']._update_templates(lines.mapped('product_tmpl_id').ids)
+        return lines
+
+    def write(self, vals):
+        tmpl_ids = set(self.mapped('product_tmpl_id').ids)
+        res = super(ProductTemplateAttributeLine, self).write(vals)
+        tmpl_ids |= set(self.mapped('product_tmpl_id').ids)
+        self.env['certifica.facet.index']._update_templates(list(tmpl_ids))
+        return res
+
+    def unlink(self):
+        tmpl_ids = self.mapped('product_tmpl_id').ids
+        res = super(ProductTemplateAttributeLine, self).unlink()
+        self.env['certifica.facet.index']._update_templates(tmpl_ids)
+        return res
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api, tools
+from odoo.addons.http_routing.models.ir_http import slug
+
+
+class ProductPublicCategory(models.Model):
+    _inherit = 'product.public.category'
+
+    @api.model
+    def _certifica_get_category_tree(self, website_id, pricelist_id):
+        """
+        Árbol de categorías del sidebar como datos planos: {id: nodo} con nombre,
+        slug, padre, hijos con productos y si la rama tiene productos publicados
+        en el pricelist, para que la plantilla no cargue relaciones. La clave de
+        caché incluye la generación del catálogo (certifica.shop.cache): cualquier
+        cambio que la incremente (categorías, plantillas, publicación, pricelist)
+        hace que se recalcule.
+        """
+        generation = self.env['certifica.shop.cache'].sudo()._get_catalog_generation()
+        return self._certifica_category_tree(website_id, pricelist_id, generation)
+
+    @api.model
+    @tools.ormcache('website_id', 'pricelist_id', 'generation', "self.env.context.get('lang')")
+    def _certifica_category_tree(self, website_id, pricelist_id, generation):
+        website = self.env['website'].browse(website_id)
+        categories = self.sudo().search_read(website.website_domain(), ['name', 'display_name', 'parent_id'])
+
+        self.env['product.template'].flush(['public_categ_ids', 'active', 'sale_ok', 'is_published'])
+        self.env.cr.execute("""
+            SELECT DISTINCT rel.product_public_category_id
+              FROM product_public_category_product_template_rel rel
+              JOIN certifica_pricelist_product m
+                ON m.product_tmpl_id = rel.product_template_id AND m.pricelist_id = %s
+              JOIN product_template t
+                ON t.id = rel.product_template_id AND t.active AND t.sale_ok AND t.is_published
+        """, (pricelist_id,))
+        with_products = {row[0] for row in self.env.cr.fetchall()}
+
+        tree = {}
+        for category in categories:
+            tree[category['id']] = {
+                'id': category['id'],
+                'name': category['name'],
+                'slug': slug((category['id'], category['display_name'])),
+                'parent_id': category['parent_id'] and category['parent_id'][0] or False,
+                'has_products': category['id'] in with_products,
+                'child_ids': [],
+            }
+
+        children = {}
+        for node in tree.values():
+            children.setdefault(node['parent_id'], []).append(node['id'])
+
+        # Una rama tiene productos si los tiene la categoría o alguna descendiente
+        def _propagate(node):
+            for child_id in children.get(node['id'], []):
+                if _propagate(tree[child_id]):
+                    node['has_products'] = True
+                    node['child_ids'].append(child_id)
+            return node['has_products']
+
+        for node in tree.values():
+            if node['parent_id'] not in tree:
+                _propagate(node)
+        return tree
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+
+import unicodedata
+import logging
+
+import psycopg2
+
+from odoo import models, fields, api, tools, _
+from odoo.exceptions import UserError
+from odoo.addons.http_routing.models.ir_http import slug
+
+from ..tools import autocomplete
+
+_logger = logging.getLogger(__name__)
+
+# Sugerencias máximas del autocompletado
+AUTOCOMPLETE_MAX_LIMIT = 20
+
+# Índices GIN de trigramas: (nombre, tabla, expresión)
+_TRGM_INDEXES = [
+    ('product_template_certifica_name_trgm_idx', 'product_template',
+     'lower(certifica_unaccent(name))'),
+    ('product_template_certifica_description_sale_trgm_idx', 'product_template',
+     'lower(certifica_unaccent(description_sale))'),
+    ('product_product_certifica_default_code_trgm_idx', 'product_product',
+     'lower(default_code)'),
+]
+
+
+def normalize_search_term(term):
+    """Minúsculas y sin tildes, igual que lower(certifica_unaccent(...)) en la base de datos."""
+    term = unicodedata.normalize('NFKD', term or '')
+    return ''.join(c for c in term if not unicodedata.combining(c)).lower().strip()
+
+
+def _like_pattern(term):
+    """Patrón LIKE '%term%' con los comodines del término escapados."""
+    return '%%%s%%' % term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+class CertificaProductSearch(models.AbstractModel):
+    """
+    Búsqueda de productos de la tienda sobre índices GIN de pg_trgm, insensible a
+    tildes y ordenada por relevancia. Si las extensiones no se pueden crear, la
+    tienda sigue usando el dominio ilike estándar.
+    """
+    _name = 'certifica.product.search'
+    _description = 'Búsqueda de productos con trigramas'
+
+    def init(self):
+        cr = self.env.cr
+        try:
+            with cr.savepoint():
+                cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                cr.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+        except psycopg2.Error as e:
+            _logger.warning('No se pudieron crear las extensiones pg_trgm/unaccent (%s); '
+                            'la búsqueda de la tienda usará ilike', e)
+            return
+        # unaccent() no es IMMUTABLE y no puede usarse en índices: se envuelve
+        cr.execute("""
+            CREATE OR REPLACE FUNCTION certifica_unaccent(text) RETURNS text AS
+            $$ SELECT unaccent('unaccent'::regdictionary, $1) $$
+            LANGUAGE sql IMMUTABLE STRICT
+        """)
+        for index_name, table, expression in _TRGM_INDEXES:
+            cr.execute("CREATE INDEX IF NOT EXISTS %s ON %s USING gin (%s gin_trgm_ops)"
+                       % (index_name, table, expression))
+        self.clear_caches()
+
+    @api.model
+    @tools.ormcache()
+    def _is_available(self):
+        """Comprueba que existan las extensiones y los índices creados por el módulo."""
+        self.env.cr.execute("""
+            SELECT count(*) FROM pg_extension WHERE extname IN ('pg_trgm', 'unaccent')
+        """)
+        if self.env.cr.fetchone()[0] < 2:
+            return False
+        self.env.cr.execute("SELECT count(*) FROM pg_indexes WHERE indexname IN %s",
+                            (tuple(name for name, _table, _expr in _TRGM_INDEXES),))
+        return self.env.cr.fetchone()[0] == len(_TRGM_INDEXES)
+
+    @api.model
+    def _get_match_query(self, search):
+        """
+        (sql, params) de la subconsulta con los IDs de plantillas que contienen todas
+        las palabras del texto: cada palabra debe aparecer en el nombre (por subcadena
+        o aproximada con el operador <% de pg_trgm), en la descripción de venta o en
+        la referencia interna de alguna variante. None si el texto está vacío.
+        """
+        words = normalize_search_term(search).split()
+        if not words:
+            return None
+        self.env['product.template'].flush(['name', 'description_sale'])
+        self.env['product.product'].flush(['default_code'])
+        word_queries = []
+        params = []
+        for word in words:
+            like = _like_pattern(word)
+            word_queries.append("""
+                SELECT t.id
+                  FROM product_template t
+                 WHERE lower(certifica_unaccent(t.name)) LIKE %s
+                    OR %s <%% lower(certifica_unaccent(t.name))
+                UNION
+                SELECT t.id
+                  FROM product_template t
+                 WHERE lower(certifica_unaccent(t.description_sale)) LIKE %s
+                UNION
+                SELECT p.product_tmpl_id
+                  FROM product_product p
+                 WHERE lower(p.default_code) LIKE %s
+            """)
+            params += [like, word, like, like]
+        return ' INTERSECT '.join('(%s)' % query for query in word_queries), params
+
+    @api.model
+    def _get_score_query(self, search):
+        """
+        (sql, params) con (id, score) de las plantillas que coinciden con el texto. El
+        texto completo dentro del nombre o de una referencia interna puntúa por
+        encima de la similitud de trigramas con el nombre.
+        """
+        match = self._get_match_query(search)
+        if match is None:
+            return None
+        match_sql, match_params = match
+        term = normalize_search_term(search)
+        like = _like_pattern(term)
+        return """
+            SELECT t.id,
+                   similarity(lower(certifica_unaccent(t.name)), %%s)
+                   + CASE WHEN lower(certifica_unaccent(t.name)) LIKE %%s THEN 1 ELSE 0 END
+                   + CASE WHEN EXISTS (SELECT 1 FROM product_product p
+                                        WHERE p.product_tmpl_id = t.id
+                                          AND lower(p.default_code) LIKE %%s) THEN 1 ELSE 0 END AS score
+              FROM product_template t
+             WHERE t.id IN (%s)
+        """ % match_sql, [term, like, like] + match_params
+
+    @api.model
+    def _search_template_ids(self, search):
+        """IDs de todas las plantillas que coinciden con el texto (sin orden)."""
+        match = self._get_match_query(search)
+        if match is None:
+            return []
+        self.env.cr.execute(*match)
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def _get_autocomplete_index(self, pricelist_id):
+        """Índice de prefijos del worker para el pricelist; se reconstruye al cambiar la generación del catálogo."""
+        generation = self.env['certifica.shop.cache'].sudo()._get_catalog_generation()
+        key = (self.env.cr.dbname, pricelist_id)
+        index = autocomplete.get_index(key)
+        if index is None or index.generation != generation:
+            self.env.cr.execute("""
+                SELECT t.id, t.name, array_remove(array_agg(DISTINCT p.default_code), NULL)
+                  FROM certifica_pricelist_product m
+                  JOIN product_template t ON t.id = m.product_tmpl_id
+                  LEFT JOIN product_product p ON p.product_tmpl_id = t.id AND p.active
+                 WHERE m.pricelist_id = %s AND t.active AND t.sale_ok AND t.is_published
+              GROUP BY t.id, t.name
+            """, (pricelist_id,))
+            index = autocomplete.PrefixIndex(generation)
+            index.load(self.env.cr.fetchall(), normalize_search_term)
+            autocomplete.set_index(key, index)
+            _logger.debug('Índice de autocompletado construido: pricelist=%s, claves=%s',
+                          pricelist_id, len(index.keys))
+        return index
+
+    @api.model
+    def _autocomplete(self, term, pricelist, limit=8):
+        """
+        Sugerencias para el buscador de la cabecera. Solo la primera vez que aparece
+        una plantilla se leen su precio y su URL; después se sirven desde el índice.
+        """
+        index = self._get_autocomplete_index(pricelist.id)
+        tmpl_ids = index.search(normalize_search_term(term), min(limit, AUTOCOMPLETE_MAX_LIMIT))
+        details = index.get_details(tmpl_ids)
+        missing = [tmpl_id for tmpl_id in tmpl_ids if tmpl_id not in details]
+        if missing:
+            templates = self.env['product.template'].sudo().browse(missing).with_context(pricelist=pricelist.id)
+            prices = pricelist._compute_price_rule(
+                [(template, 1.0, False) for template in templates])
+            new_details = {
+                template.id: {
+                    'price': prices.get(template.id, (template.list_price, False))[0],
+                    'url': '/shop/product/%s' % slug(template),
+                }
+                for template in templates
+            }
+            index.set_details(new_details)
+            details.update(new_details)
+        return [{
+            'id': tmpl_id,
+            'name': index.names.get(tmpl_id),
+            'code': index.codes.get(tmpl_id) or '',
+            'price': details[tmpl_id]['price'],
+            'url': details[tmpl_id]['url'],
+            'image_url': '/web/image/product.template/%s/image_128' % tmpl_id,
+        } for tmpl_id in tmpl_ids]
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    certifica_text_search = fields.Char(
+        string='Búsqueda de la tienda', compute='_compute_certifica_text_search',
+        search='_search_certifica_text_search')
+
+    def _compute_certifica_text_search(self):
+        for template in self:
+            template.certifica_text_search = False
+
+    def _search_certifica_text_search(self, operator, value):
+        """
+        Dominio ('certifica_text_search', '=', texto): restringe a las coincidencias
+        del índice de trigramas con una subconsulta, sin listas de IDs ni límite, de
+        modo que el conteo y el paginador de la tienda son exactos.
+        """
+        if operator != '=':
+            raise UserError(_('Operador no soportado para la búsqueda de la tienda: %s') % operator)
+        match = self.env['certifica.product.search']._get_match_query(value)
+        if match is None:
+            # Texto sin palabras: ninguna coincidencia
+            return [('id', '=', 0)]
+        return [('id', 'inselect', tuple(match))]
+
+    @api.model
+    def _certifica_search_ranked(self, search, domain, limit, offset=0):
+        """
+        Página de plantillas del dominio ordenadas por relevancia para el texto:
+        el dominio (con las reglas de acceso) se combina con la puntuación de
+        trigramas y se pagina en la misma consulta con LIMIT/OFFSET.
+        """
+        score = self.env['certifica.product.search']._get_score_query(search)
+        if score is None:
+            return self.browse()
+        score_sql, score_params = score
+        query = self._where_calc(domain)
+        self._apply_ir_rules(query, 'read')
+        from_clause, where_clause, where_params = query.get_sql()
+        self.env.cr.execute("""
+            SELECT "product_template".id
+              FROM %s
+              JOIN (%s) ranking ON ranking.id = "product_template".id
+             WHERE %s
+          ORDER BY ranking.score DESC, "product_template".id DESC
+             LIMIT %%s OFFSET %%s
+        """ % (from_clause, score_sql, where_clause or 'TRUE'),
+            score_params + where_params + [limit, offset])
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
@@ -15,12 +15,10 @@ class ProductTemplate(models.Model):
         """
         Sobreescribe _get_combination_info para reemplazar el valor de
         virtual_available (que website_sale_stock usa en su widget JS)
-        con el stock físico real calculado directamente desde stock.quant.
+        con el stock físico real (disponible menos reservado) del servicio
+        certifica.stock.availability, que carga todas las variantes de la
+        plantilla en una consulta y las reutiliza durante la petición.
         """
-        _logger.warning(
-            '=== CERTIFICA STOCK: _get_combination_info CALLED === '
-            'product_id=%s, self=%s', product_id, self.ids)
-
         res = super(ProductTemplate, self)._get_combination_info(
             combination=combination,
             product_id=product_id,
@@ -30,37 +28,13 @@ class ProductTemplate(models.Model):
             only_template=only_template,
         )
 
-        _logger.warning(
-            '=== CERTIFICA STOCK: result keys=%s, '
-            'virtual_available in res? %s',
-            list(res.keys()) if isinstance(res, dict) else 'NOT_DICT',
-            'virtual_available' in res if isinstance(res, dict) else 'N/A')
-
         # Si website_sale_stock añadió virtual_available, lo reemplazamos
         if isinstance(res, dict) and 'virtual_available' in res:
-            old_val = res['virtual_available']
             pid = res.get('product_id', product_id)
-            _logger.warning(
-                '=== CERTIFICA STOCK: FOUND virtual_available=%s, '
-                'product_id=%s, computing real qty...', old_val, pid)
-            try:
-                if pid:
-                    quants = self.env['stock.quant'].sudo().search([
-                        ('product_id', '=', pid),
-                        ('location_id.usage', '=', 'internal'),
-                    ])
-                    qty_on_hand = sum(quants.mapped('quantity'))
-                    reserved = sum(quants.mapped('reserved_quantity'))
-                    real_qty = max(0.0, qty_on_hand - reserved)
-                    res['virtual_available'] = real_qty
-                    _logger.warning(
-                        '=== CERTIFICA STOCK: REPLACED! '
-                        'old=%s -> new=%s (on_hand=%s, reserved=%s, '
-                        'quants_count=%s)',
-                        old_val, real_qty, qty_on_hand, reserved, len(quants))
-            except Exception as e:
-                _logger.warning(
-                    '=== CERTIFICA STOCK: ERROR computing real stock: %s', e)
+            if pid:
+                real_qty = self.env['certifica.stock.availability'].sudo()._get_product_qty([pid])[pid]
+                _logger.debug('Stock real de la variante %s: %s (virtual_available=%s)',
+                              pid, real_qty, res['virtual_available'])
+                res['virtual_available'] = real_qty
 
         return res
-
@@ -2,98 +2,34 @@
 from odoo import models, fields, api
 import logging
 
+from ..tools.vat import normalize_vat, NORMALIZE_VAT_SQL
+
 _logger = logging.getLogger(__name__)
 
 class ResPartner(models.Model):
     _inherit = 'res.partner'
 
+    # VAT sin separadores, indexado para buscar partners por DNI/RUC con una sola lectura del índice
+    certifica_vat_normalized = fields.Char(
+        string='VAT normalizado', index=True, copy=False, readonly=True)
+
+    def init(self):
+        # Relleno de los partners existentes (y de los escritos por SQL fuera del ORM)
+        expression = NORMALIZE_VAT_SQL.format(column='vat')
+        self.env.cr.execute("""
+            UPDATE res_partner
+               SET certifica_vat_normalized = {expression}
+             WHERE certifica_vat_normalized IS DISTINCT FROM {expression}
+        """.format(expression=expression))
+
     def _get_identification_type_from_vat(self, vat_number):
         """
         Obtener el ID del tipo de identificación basándose en el número VAT
+        (clasificación en tools/vat.py, IDs cacheados por worker)
         """
-        if not vat_number:
-            return False
-        
-        vat_clean = str(vat_number).strip()
-        _logger.info(f"=== DETECTANDO TIPO DE IDENTIFICACIÓN PARA: {vat_clean} ===")
-        
-        try:
-            # Verificar si el modelo está disponible
-            if 'l10n_latam.identification.type' not in self.env.registry:
-                _logger.warning("Modelo l10n_latam.identification.type no disponible")
-                return False
-            
-            # Buscar el tipo de identificación en la base de datos
-            identification_type_model = self.env['l10n_latam.identification.type']
-            
-            # Detectar DNI (8 dígitos) - ID 5 en tu base de datos
-            if len(vat_clean) == 8 and vat_clean.isdigit():
-                dni_type = identification_type_model.search([
-                    ('name', '=', 'DNI'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if dni_type:
-                    _logger.info(f"DNI detectado: {vat_clean} -> Tipo ID: {dni_type.id}")
-                    return dni_type.id
-                else:
-                    _logger.warning("No se encontró el tipo DNI en la base de datos")
-                    return False
-            
-            # Detectar RUC (11 dígitos) - ID 4 en tu base de datos
-            elif len(vat_clean) == 11 and vat_clean.isdigit():
-                ruc_type = identification_type_model.search([
-                    ('name', '=', 'RUC'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if ruc_type:
-                    _logger.info(f"RUC detectado: {vat_clean} -> Tipo ID: {ruc_type.id}")
-                    return ruc_type.id
-                else:
-                    _logger.warning("No se encontró el tipo RUC en la base de datos")
-                    return False
-            
-            # Detectar VAT con prefijos peruanos (10 dígitos)
-            elif len(vat_clean) == 10 and vat_clean.startswith(('10', '20', '15', '16', '17')):
-                ruc_type = identification_type_model.search([
-                    ('name', '=', 'RUC'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if ruc_type:
-                    _logger.info(f"RUC con prefijo detectado: {vat_clean} -> Tipo ID: {ruc_type.id}")
-                    return ruc_type.id
-                else:
-                    _logger.warning("No se encontró el tipo RUC en la base de datos")
-                    return False
-            
-            # Detectar DNI con prefijo 10 (10 dígitos)
-            elif len(vat_clean) == 10 and vat_clean.startswith('10'):
-                dni_type = identification_type_model.search([
-                    ('name', '=', 'DNI'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if dni_type:
-                    _logger.info(f"DNI con prefijo 10 detectado: {vat_clean} -> Tipo ID: {dni_type.id}")
-                    return dni_type.id
-                else:
-                    _logger.warning("No se encontró el tipo DNI en la base de datos")
-                    return False
-            
-            # Otros casos - usar DNI por defecto (ID 5)
-            else:
-                dni_type = identification_type_model.search([
-                    ('name', '=', 'DNI'),
-                    ('country_id', '=', 173)  # Perú
-                ], limit=1)
-                if dni_type:
-                    _logger.info(f"VAT genérico detectado: {vat_clean} -> Usando DNI por defecto ID: {dni_type.id}")
-                    return dni_type.id
-                else:
-                    _logger.warning("No se encontró el tipo DNI en la base de datos")
-                    return False
-                    
-        except Exception as e:
-            _logger.error(f"Error al detectar tipo de identificación: {e}")
+        if not vat_number or 'l10n_latam.identification.type' not in self.env.registry:
             return False
+        return self.env['l10n_latam.identification.type']._certifica_type_id_from_vat(vat_number)
 
     @api.onchange('vat')
     def _onchange_vat_auto_identification_type(self):
@@ -130,6 +66,9 @@ class ResPartner(models.Model):
                 vals['vat'] = ruc
                 _logger.info(f"RUC detectado: {ruc}")
         
+        if 'vat' in vals:
+            vals['certifica_vat_normalized'] = normalize_vat(vals['vat'])
+        
         # Detectar automáticamente el tipo de identificación
         if 'vat' in vals and vals['vat']:
             identification_type_id = self._get_identification_type_from_vat(vals['vat'])
@@ -149,6 +88,9 @@ class ResPartner(models.Model):
         _logger.info("=== WRITE PARTNER ===")
         _logger.info(f"Valores recibidos: {vals}")
         
+        if 'vat' in vals:
+            vals['certifica_vat_normalized'] = normalize_vat(vals['vat'])
+        
         # Si se está actualizando el VAT, detectar automáticamente el tipo
         if 'vat' in vals and vals['vat']:
             identification_type_id = self._get_identification_type_from_vat(vals['vat'])
@@ -158,19 +100,3 @@ class ResPartner(models.Model):
         
         # Llamar al método original
         return super().write(vals)
-
-    # Métodos para deshabilitar validación de VAT
-    def check_vat(self, vat):
-        """
-        Sobrescribir validación de VAT para permitir cualquier formato
-        """
-        _logger.info(f"=== CHECK VAT OVERRIDE === {vat}")
-        return True
-
-    @api.constrains('vat')
-    def _check_vat_constraint(self):
-        """
-        Sobrescribir constraint de VAT para no validar nada
-        """
-        _logger.info("=== VAT CONSTRAINT OVERRIDE ===")
-        pass
\ No newline at end of file
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+import logging
+
+from odoo import models, api, tools
+from odoo.tools import str2bool
+
+_logger = logging.getLogger(__name__)
+
+# Logger raíz del módulo (odoo.addons.certifica_theme), cuyo nivel fija log_level si tiene valor
+_MODULE_LOGGER = __name__.rsplit('.models', 1)[0]
+
+CertificaSettings = namedtuple('CertificaSettings', [
+    'pricelist_id',
+    'ppg',
+    'country_id',
+    'keyset_pagination',
+    'disable_vat_validation',
+    'flexible_vat_format',
+    'disable_peru_vat_validation',
+    'disable_latam_vat_validation',
+    'log_level',
+])
+
+# (campo, parámetro del sistema, tipo, valor por defecto)
+SETTINGS_PARAMS = (
+    ('pricelist_id', 'certifica_theme.pricelist_id', int, 1573),
+    ('ppg', 'certifica_theme.ppg', int, 18),
+    ('country_id', 'certifica_theme.country_id', int, 173),
+    ('keyset_pagination', 'certifica_theme.shop_keyset_pagination', bool, False),
+    ('disable_vat_validation', 'base_vat.disable_validation', bool, False),
+    ('flexible_vat_format', 'base_vat.flexible_format', bool, False),
+    ('disable_peru_vat_validation', 'l10n_pe.disable_vat_validation', bool, False),
+    ('disable_latam_vat_validation', 'l10n_latam_base.disable_vat_validation', bool, False),
+    ('log_level', 'certifica_theme.log_level', str, ''),
+)
+
+_LOG_LEVELS = ('debug', 'info', 'warning', 'error', 'critical')
+
+# Campos que cambian el HTML cacheado de la tienda
+_CATALOG_SETTINGS = ('pricelist_id', 'ppg')
+
+
+class CertificaSettingsService(models.AbstractModel):
+    """
+    Configuración del módulo leída de ir.config_parameter y convertida a tipos.
+    Se lee con una consulta y queda en el ormcache, que ir.config_parameter
+    vacía (en todos los workers) al crear, modificar o borrar un parámetro.
+    """
+    _name = 'certifica.settings'
+    _description = 'Configuración de Certifica Theme'
+
+    @api.model
+    @tools.ormcache()
+    def _get(self):
+        """CertificaSettings con los valores actuales (sin SQL mientras esté en caché)."""
+        rows = self.env['ir.config_parameter'].sudo().search_read(
+            [('key', 'in', [param[1] for param in SETTINGS_PARAMS])], ['key', 'value'])
+        params = {row['key']: row['value'] for row in rows}
+        values = {}
+        for field, key, type_, default in SETTINGS_PARAMS:
+            values[field] = self._parse(key, params.get(key), type_, default)
+        settings = CertificaSettings(**values)
+        self._apply_log_level(settings.log_level)
+        return settings
+
+    @api.model
+    def _parse(self, key, raw, type_, default):
+        if raw is None or not str(raw).strip():
+            return default
+        raw = str(raw).strip()
+        if type_ is bool:
+            return str2bool(raw, default)
+        if type_ is str:
+            if key == 'certifica_theme.log_level' and raw.lower() not in _LOG_LEVELS:
+                _logger.warning('Valor inválido para %s: %r (se usa %r)', key, raw, default)
+                return default
+            return raw.lower()
+        try:
+            return type_(raw)
+        except ValueError:
+            _logger.warning('Valor inválido para %s: %r (se usa %r)', key, raw, default)
+            return default
+
+    @api.model
+    def _apply_log_level(self, log_level):
+        # Sin valor se respeta la configuración de logging del servidor (--log-handler)
+        if log_level:
+            logging.getLogger(_MODULE_LOGGER).setLevel(log_level.upper())
+
+
+class IrConfigParameter(models.Model):
+    _inherit = 'ir.config_parameter'
+
+    def _certifica_params_changed(self, keys):
+        """Se llama tras crear, modificar o borrar los parámetros con esas claves."""
+        catalog_keys = {key for field, key, _type, _default in SETTINGS_PARAMS if field in _CATALOG_SETTINGS}
+        if set(keys) & catalog_keys:
+            self.env['certifica.shop.cache']._invalidate_catalog()
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super(IrConfigParameter, self).create(vals_list)
+        self._certifica_params_changed(records.mapped('key'))
+        return records
+
+    def write(self, vals):
+        keys = self.mapped('key') + [vals.get('key')]
+        res = super(IrConfigParameter, self).write(vals)
+        self._certifica_params_changed(keys)
+        return res
+
+    def unlink(self):
+        keys = self.mapped('key')
+        res = super(IrConfigParameter, self).unlink()
+        self._certifica_params_changed(keys)
+        return res
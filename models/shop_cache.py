@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import models, api
+
+from ..tools.cache import products_fragment_cache, stock_badges_cache, request_memo
+from ..tools.page_cache import page_cache
+
+_logger = logging.getLogger(__name__)
+
+# Secuencia de PostgreSQL con la generación del catálogo (compartida por todos los workers)
+_GENERATION_SEQUENCE = 'certifica_catalog_generation_seq'
+
+# Campos que cambian lo que muestra la tienda; el resto (chatter, SEO, contadores)
+# no invalida las cachés
+_TEMPLATE_FIELDS = (
+    'name', 'active', 'sale_ok', 'is_published', 'website_published', 'website_id', 'website_sequence',
+    'list_price', 'currency_id', 'company_id', 'taxes_id', 'uom_id', 'type', 'categ_id',
+    'public_categ_ids', 'default_code', 'description_sale', 'image_1920', 'product_template_image_ids',
+    'attribute_line_ids', 'product_variant_ids', 'website_ribbon_id', 'website_style_ids',
+    'website_size_x', 'website_size_y', 'alternative_product_ids', 'accessory_product_ids',
+)
+_PRODUCT_FIELDS = (
+    'product_tmpl_id', 'active', 'default_code', 'price_extra', 'image_variant_1920',
+    'product_template_attribute_value_ids', 'is_published', 'website_published',
+)
+_VIEW_FIELDS = ('arch', 'arch_base', 'arch_db', 'arch_fs', 'active', 'inherit_id', 'mode', 'priority', 'key', 'website_id')
+
+
+def _apply_catalog_invalidation(registry, dbname, pending):
+    """Se ejecuta tras el commit: el resto de peticiones ya ven los cambios."""
+    if pending['catalog']:
+        with registry.cursor() as cr:
+            cr.execute("SELECT nextval('%s')" % _GENERATION_SEQUENCE)
+            generation = cr.fetchone()[0]
+        # Actualizaciones incrementales de índices del worker (si nada más cambió)
+        if not pending['full']:
+            for callback in pending['on_bump']:
+                callback(generation)
+        # El HTML del listado y de las páginas no depende del stock: solo se
+        # invalida cuando cambió el catálogo
+        products_fragment_cache.clear()
+        stock_badges_cache.clear()
+        page_cache.bump(dbname)
+    else:
+        for tmpl_id in pending['stock_tmpl_ids']:
+            stock_badges_cache.discard((dbname, tmpl_id))
+    _logger.debug('Cachés de la tienda invalidadas (catálogo=%s, insignias=%s)',
+                  pending['catalog'], len(pending['stock_tmpl_ids']))
+
+
+class CertificaShopCache(models.AbstractModel):
+    """
+    Generación del catálogo de la tienda: un contador en una secuencia de
+    PostgreSQL. Las cachés de fragmentos y los índices por worker (facetas,
+    autocompletado, árbol de categorías) la incluyen en sus claves. Invalidar
+    la incrementa una sola vez por transacción y después del commit, sin tocar
+    las demás cachés ORM del registro.
+    """
+    _name = 'certifica.shop.cache'
+    _description = 'Invalidación de cachés de la tienda'
+
+    def init(self):
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS %s" % _GENERATION_SEQUENCE)
+
+    @api.model
+    def _get_catalog_generation(self):
+        """Generación actual (una lectura de la secuencia por petición)."""
+        memo = request_memo('catalog_generation')
+        if 'generation' not in memo:
+            self.env.cr.execute("SELECT last_value FROM %s" % _GENERATION_SEQUENCE)
+            memo['generation'] = self.env.cr.fetchone()[0]
+        return memo['generation']
+
+    @api.model
+    def _invalidate_catalog(self, local_only=False, on_bump=None, stock_tmpl_ids=()):
+        """
+        Programa la invalidación para después del commit, una vez por transacción:
+        generación del catálogo, fragmentos e insignias de este worker y caché
+        de páginas. Con local_only (cambios frecuentes como el stock, acotados
+        por el TTL en el resto de workers) solo se descartan de este worker las
+        insignias de stock_tmpl_ids. Si la transacción se deshace no se
+        invalida nada.
+
+        on_bump(generation) se llama tras incrementar la generación, salvo que
+        la transacción haya hecho además una invalidación completa; permite
+        actualizar un índice del worker en lugar de reconstruirlo.
+        """
+        cr = self.env.cr
+        pending = getattr(cr, '_certifica_catalog_pending', None)
+        if pending is None:
+            pending = cr._certifica_catalog_pending = {
+                'catalog': False, 'full': False, 'on_bump': [], 'stock_tmpl_ids': set(),
+            }
+
+            def _on_commit():
+                del cr._certifica_catalog_pending
+                _apply_catalog_invalidation(self.pool, cr.dbname, pending)
+
+            def _on_rollback():
+                del cr._certifica_catalog_pending
+
+            cr.after('commit', _on_commit)
+            cr.after('rollback', _on_rollback)
+        pending['stock_tmpl_ids'].update(stock_tmpl_ids)
+        if not local_only:
+            pending['catalog'] = True
+            if on_bump:
+                pending['on_bump'].append(on_bump)
+            else:
+                pending['full'] = True
+
+    @api.model
+    def _cron_purge_page_cache(self):
+        page_cache.purge(self.env.cr.dbname)
+
+
+class ProductTemplate(models.Model):
+    _inherit = 'product.template'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        templates = super(ProductTemplate, self).create(vals_list)
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return templates
+
+    def write(self, vals):
+        res = super(ProductTemplate, self).write(vals)
+        if set(vals) & set(_TEMPLATE_FIELDS):
+            self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+    def unlink(self):
+        res = super(ProductTemplate, self).unlink()
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+
+class ProductProduct(models.Model):
+    _inherit = 'product.product'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        products = super(ProductProduct, self).create(vals_list)
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return products
+
+    def write(self, vals):
+        res = super(ProductProduct, self).write(vals)
+        if set(vals) & set(_PRODUCT_FIELDS):
+            self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+    def unlink(self):
+        res = super(ProductProduct, self).unlink()
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+
+class ProductPricelist(models.Model):
+    _inherit = 'product.pricelist'
+
+    def write(self, vals):
+        res = super(ProductPricelist, self).write(vals)
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+    def unlink(self):
+        res = super(ProductPricelist, self).unlink()
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+
+class ProductPricelistItem(models.Model):
+    _inherit = 'product.pricelist.item'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        items = super(ProductPricelistItem, self).create(vals_list)
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return items
+
+    def write(self, vals):
+        res = super(ProductPricelistItem, self).write(vals)
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+    def unlink(self):
+        res = super(ProductPricelistItem, self).unlink()
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+
+class ProductPublicCategory(models.Model):
+    _inherit = 'product.public.category'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        categories = super(ProductPublicCategory, self).create(vals_list)
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return categories
+
+    def write(self, vals):
+        res = super(ProductPublicCategory, self).write(vals)
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+    def unlink(self):
+        res = super(ProductPublicCategory, self).unlink()
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+
+class StockQuant(models.Model):
+    _inherit = 'stock.quant'
+
+    def _invalidate_stock_badges(self):
+        self.env['certifica.shop.cache']._invalidate_catalog(
+            local_only=True, stock_tmpl_ids=self.mapped('product_id.product_tmpl_id').ids)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        quants = super(StockQuant, self).create(vals_list)
+        quants._invalidate_stock_badges()
+        return quants
+
+    def write(self, vals):
+        res = super(StockQuant, self).write(vals)
+        self._invalidate_stock_badges()
+        return res
+
+    def unlink(self):
+        self._invalidate_stock_badges()
+        return super(StockQuant, self).unlink()
+
+
+class IrUiView(models.Model):
+    _inherit = 'ir.ui.view'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        views = super(IrUiView, self).create(vals_list)
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return views
+
+    def write(self, vals):
+        res = super(IrUiView, self).write(vals)
+        if set(vals) & set(_VIEW_FIELDS):
+            self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
+
+    def unlink(self):
+        res = super(IrUiView, self).unlink()
+        self.env['certifica.shop.cache']._invalidate_catalog()
+        return res
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+import logging
+
+from ..tools.cache import request_memo
+
+_logger = logging.getLogger(__name__)
+
+# Disponible real por variante desde la tabla mantenida por los cambios de stock.quant
+_AVAILABILITY_QUERY = """
+    SELECT p.id, p.product_tmpl_id, COALESCE(a.available_qty, 0)
+      FROM product_product p
+      LEFT JOIN certifica_product_availability a ON a.product_id = p.id
+     WHERE {where}
+"""
+
+
+class CertificaStockAvailability(models.AbstractModel):
+    """
+    Stock disponible para la tienda, leído en lote de certifica.product.availability
+    y memorizado durante la petición. Pedir una variante carga todas las de su
+    plantilla, de modo que el selector de variantes hace una sola consulta.
+    """
+    _name = 'certifica.stock.availability'
+    _description = 'Disponibilidad de stock de la tienda'
+
+    def _fetch(self, where, params):
+        self.env.cr.execute(_AVAILABILITY_QUERY.format(where=where), params)
+        product_memo = request_memo('stock_availability_product')
+        template_memo = request_memo('stock_availability_template')
+        templates = {}
+        for product_id, tmpl_id, qty in self.env.cr.fetchall():
+            qty = max(0.0, qty)
+            product_memo[product_id] = qty
+            templates[tmpl_id] = templates.get(tmpl_id, 0.0) + qty
+        template_memo.update(templates)
+        return product_memo, template_memo
+
+    @api.model
+    def _get_product_qty(self, product_ids):
+        """{product_id: cantidad disponible} (incluye las demás variantes de sus plantillas)."""
+        product_memo = request_memo('stock_availability_product')
+        missing = [product_id for product_id in product_ids if product_id not in product_memo]
+        if missing:
+            product_memo, _template_memo = self._fetch(
+                "p.product_tmpl_id IN (SELECT product_tmpl_id FROM product_product WHERE id IN %(ids)s) AND p.active",
+                {'ids': tuple(missing)})
+            for product_id in missing:
+                product_memo.setdefault(product_id, 0.0)
+        return {product_id: product_memo.get(product_id, 0.0) for product_id in product_ids}
+
+    @api.model
+    def _get_template_qty(self, product_tmpl_ids):
+        """{product_tmpl_id: cantidad disponible sumando sus variantes activas}."""
+        template_memo = request_memo('stock_availability_template')
+        missing = [tmpl_id for tmpl_id in product_tmpl_ids if tmpl_id not in template_memo]
+        if missing:
+            _product_memo, template_memo = self._fetch(
+                "p.product_tmpl_id IN %(ids)s AND p.active", {'ids': tuple(missing)})
+            for tmpl_id in missing:
+                template_memo.setdefault(tmpl_id, 0.0)
+        return {tmpl_id: template_memo.get(tmpl_id, 0.0) for tmpl_id in product_tmpl_ids}
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+import logging
+
+from odoo import models, api, tools
+
+from .settings import SETTINGS_PARAMS
+
+_logger = logging.getLogger(__name__)
+
+# Validaciones de VAT que se omiten
+VatPolicy = namedtuple('VatPolicy', ['skip_check_vat', 'flexible_format', 'skip_peru', 'skip_latam'])
+
+# Campo de la política -> campo de certifica.settings (data/ir_config_parameter.xml)
+VAT_POLICY_SETTINGS = (
+    ('skip_check_vat', 'disable_vat_validation'),
+    ('flexible_format', 'flexible_vat_format'),
+    ('skip_peru', 'disable_peru_vat_validation'),
+    ('skip_latam', 'disable_latam_vat_validation'),
+)
+
+# Parámetros del sistema de los que depende la política
+VAT_POLICY_KEYS = {
+    key for field, key, _type, _default in SETTINGS_PARAMS
+    if field in dict(VAT_POLICY_SETTINGS).values()
+}
+
+
+class ResPartner(models.Model):
+    """
+    Omisión de las validaciones de VAT de base_vat, l10n_pe y l10n_latam_base
+    según certifica.settings. La política queda en el ormcache, que se vacía
+    al cambiar alguno de sus parámetros: cada validación no hace SQL.
+    """
+    _inherit = 'res.partner'
+
+    @api.model
+    @tools.ormcache()
+    def _certifica_get_vat_policy(self):
+        settings = self.env['certifica.settings']._get()
+        policy = VatPolicy(**{
+            field: getattr(settings, setting) for field, setting in VAT_POLICY_SETTINGS
+        })
+        _logger.debug('Política de validación de VAT: %s', policy)
+        return policy
+
+    @api.constrains('vat', 'country_id', 'l10n_latam_identification_type_id')
+    def check_vat(self):
+        # l10n_latam_base también entra por check_vat (filtra los tipos que son VAT)
+        policy = self._certifica_get_vat_policy()
+        if policy.skip_check_vat or policy.skip_latam:
+            return True
+        return super(ResPartner, self).check_vat()
+
+    @api.model
+    def simple_vat_check(self, country_code, vat_number):
+        if self._certifica_get_vat_policy().flexible_format:
+            return True
+        return super(ResPartner, self).simple_vat_check(country_code, vat_number)
+
+    @api.model
+    def vies_vat_check(self, country_code, vat_number):
+        if self._certifica_get_vat_policy().flexible_format:
+            return True
+        return super(ResPartner, self).vies_vat_check(country_code, vat_number)
+
+    def check_vat_pe(self, vat):
+        if self._certifica_get_vat_policy().skip_peru:
+            return True
+        return super(ResPartner, self).check_vat_pe(vat)
+
+
+class IrConfigParameter(models.Model):
+    _inherit = 'ir.config_parameter'
+
+    def _certifica_params_changed(self, keys):
+        super(IrConfigParameter, self)._certifica_params_changed(keys)
+        if set(keys) & VAT_POLICY_KEYS:
+            # clear_caches() avisa también a los demás workers
+            self.env['res.partner'].clear_caches()
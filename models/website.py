@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields
+from odoo.http import request
+import logging
+
+from ..tools.cache import request_memo, sale_order_memo_stats
+
+_logger = logging.getLogger(__name__)
+
+
+class Website(models.Model):
+    _inherit = 'website'
+
+    def sale_get_order(self, force_create=False, code=None, update_pricelist=False, force_pricelist=False):
+        """
+        Memoriza el pedido de la sesión durante la petición. Solo las llamadas sin
+        argumentos se sirven desde la memoria; las que pueden crear o cambiar el
+        pedido (force_create, code, pricelist) lo resuelven de nuevo y la actualizan.
+        La clave incluye el pedido y el pricelist de la sesión, de modo que un
+        pedido creado o cambiado en la misma petición nunca se lee desactualizado.
+        """
+        if not request:
+            return super(Website, self).sale_get_order(
+                force_create=force_create, code=code,
+                update_pricelist=update_pricelist, force_pricelist=force_pricelist)
+        memo = request_memo('sale_get_order')
+        plain = not (force_create or code or update_pricelist or force_pricelist)
+        key = self._certifica_order_memo_key()
+        if plain and key in memo:
+            sale_order_memo_stats.count(hit=True)
+            return memo[key]
+        sale_order_memo_stats.count(hit=False)
+        order = super(Website, self).sale_get_order(
+            force_create=force_create, code=code,
+            update_pricelist=update_pricelist, force_pricelist=force_pricelist)
+        # La llamada puede haber cambiado el pedido de la sesión (p. ej. al crearlo)
+        memo[self._certifica_order_memo_key()] = order
+        return order
+
+    def _certifica_order_memo_key(self):
+        session = request.session
+        return (self.id, self.env.uid, session.get('sale_order_id'), session.get('website_sale_current_pl'))
+
+    def sale_reset(self):
+        self._certifica_invalidate_order_memo()
+        return super(Website, self).sale_reset()
+
+    def _certifica_invalidate_order_memo(self):
+        """Descarta el pedido memorizado en la petición (tras modificarlo)."""
+        request_memo('sale_get_order').clear()
+
+
+class SaleOrder(models.Model):
+    _inherit = 'sale.order'
+
+    certifica_last_add_token = fields.Char(copy=False)
+
+    def write(self, vals):
+        res = super(SaleOrder, self).write(vals)
+        # Estos campos cambian lo que sale_get_order() devuelve para la sesión
+        if {'partner_id', 'pricelist_id', 'state'} & set(vals):
+            self.env['website']._certifica_invalidate_order_memo()
+        return res
+
+    def _certifica_lock(self):
+        """
+        Bloquea la fila del pedido hasta el fin de la transacción. Si otra
+        transacción ya modificó el pedido, PostgreSQL lanza un error de
+        serialización y la petición se reintenta con un snapshot nuevo.
+        """
+        self.env.cr.execute(
+            'SELECT id FROM sale_order WHERE id IN %s FOR UPDATE', (tuple(self.ids),),
+            log_exceptions=False)
+
+    def _cart_update(self, product_id=None, line_id=None, add_qty=0, set_qty=0, **kwargs):
+        """
+        Serializa las modificaciones del carrito bloqueando el pedido. Con el
+        contexto certifica_cart_add_token (token generado por el navegador para
+        cada formulario), una adición con el mismo token que la anterior es un
+        reenvío del mismo formulario (doble clic) y se ignora; dos adiciones
+        reales llevan tokens distintos y se suman.
+        """
+        self._certifica_lock()
+        token = self.env.context.get('certifica_cart_add_token')
+        if not (token and product_id and add_qty and not set_qty and not line_id):
+            return super(SaleOrder, self)._cart_update(
+                product_id=product_id, line_id=line_id, add_qty=add_qty, set_qty=set_qty, **kwargs)
+
+        if self.certifica_last_add_token == token:
+            _logger.info('Adición repetida al carrito del pedido %s ignorada (producto %s)', self.id, product_id)
+            line = self._cart_find_product_line(int(product_id), **kwargs)[:1]
+            return {'line_id': line.id, 'quantity': line.product_uom_qty}
+        res = super(SaleOrder, self)._cart_update(
+            product_id=product_id, line_id=line_id, add_qty=add_qty, set_qty=set_qty, **kwargs)
+        self.write({'certifica_last_add_token': token})
+        return res
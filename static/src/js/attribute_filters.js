@@ -2,11 +2,13 @@ odoo.define('certifica_theme.attribute_filters', function (require) {
     'use strict';
     
     var publicWidget = require('web.public.widget');
+    var rpc = require('web.rpc');
     
     publicWidget.registry.AttributeFilters = publicWidget.Widget.extend({
         selector: '.shop-filters-container',
         events: {
-            'click #apply_filters_button': '_onApplyFiltersClick'
+            'click #apply_filters_button': '_onApplyFiltersClick',
+            'change input[name="attrib"]': '_onAttributeChange'
         },
         
         /**
@@ -49,6 +51,8 @@ odoo.define('certifica_theme.attribute_filters', function (require) {
             // Mantener otros parámetros como la categoría y la búsqueda
             // pero eliminar los atributos anteriores
             searchParams.delete('attrib');
+            // El cursor de paginación corresponde a la selección anterior
+            searchParams.delete('cursor');
             
             // Agregar los atributos seleccionados
             attributeValues.forEach(function(value) {
@@ -63,6 +67,35 @@ odoo.define('certifica_theme.attribute_filters', function (require) {
             
             // Redirigir al usuario a la nueva URL
             window.location.href = newUrl;
+        },
+        
+        /**
+         * Actualiza los conteos de cada valor al marcar/desmarcar un atributo,
+         * consultando el índice de facetas sin recargar la tienda
+         * 
+         * @private
+         */
+        _onAttributeChange: function () {
+            var self = this;
+            var attrib = this.$('input[name="attrib"]:checked').map(function () {
+                return $(this).val();
+            }).get();
+            var $category = this.$('#filters_form input[name="category"]');
+            
+            return rpc.query({
+                route: '/shop/facets',
+                params: {
+                    attrib: attrib,
+                    category: $category.length ? $category.val() : null,
+                    search: this.$('#filters_form input[name="search"]').val() || '',
+                },
+            }).then(function (data) {
+                self.$('.attribute-count').each(function () {
+                    var $count = $(this);
+                    $count.text('(' + (data.counts[$count.data('value-id')] || 0) + ')');
+                });
+                self.$('.attribute-result-count').text('(' + data.count + ')');
+            });
         }
     });
 });
@@ -4,7 +4,64 @@ odoo.define('certifica_theme.cart_quantity_updater', function (require) {
     var publicWidget = require('web.public.widget');
     var rpc = require('web.rpc');
 
+    /**
+     * Actualiza los contadores del carrito de la cabecera.
+     *
+     * @param {number} quantity
+     */
+    function setCartQuantity(quantity) {
+        quantity = quantity || 0;
+        $('.my_cart_quantity').text(quantity).css('display', quantity ? 'inline-block' : 'none');
+    }
+
+    function fetchCartQuantity() {
+        return rpc.query({
+            route: '/shop/cart/quantity',
+            params: {},
+        }).then(setCartQuantity);
+    }
+
+    /**
+     * Token de una adición al carrito: el servidor ignora un segundo envío con el
+     * mismo token (doble clic), pero no dos adiciones reales con tokens distintos.
+     *
+     * @returns {string}
+     */
+    function newAddToken() {
+        return Date.now().toString(36) + Math.random().toString(36).slice(2);
+    }
+
+    // Formularios propios de añadir al carrito: un token por formulario y carga de página
+    $(document).on('submit', 'form.add_to_cart_form', function () {
+        var $form = $(this);
+        var $token = $form.find('input[name="certifica_add_token"]');
+        if (!$token.length) {
+            $token = $('<input type="hidden" name="certifica_add_token"/>').appendTo($form);
+        }
+        if (!$token.val()) {
+            $token.val(newAddToken());
+        }
+    });
+
+    // Al volver con "atrás" desde la caché del navegador, la página cuenta como una carga nueva
+    window.addEventListener('pageshow', function (ev) {
+        if (ev.persisted) {
+            $('form.add_to_cart_form input[name="certifica_add_token"]').val('');
+        }
+    });
+
     publicWidget.registry.WebsiteSale.include({
+        /**
+         * @override
+         */
+        _submitForm: function () {
+            if (!this._certificaAddToken) {
+                this._certificaAddToken = newAddToken();
+            }
+            this.rootProduct.certifica_add_token = this._certificaAddToken;
+            return this._super.apply(this, arguments);
+        },
+
         _onClickAdd: function (ev) {
             var self = this;
             this._super.apply(this, arguments).then(function () {
@@ -13,12 +70,23 @@ odoo.define('certifica_theme.cart_quantity_updater', function (require) {
         },
 
         _updateCartQuantity: function () {
-            rpc.query({
-                route: '/shop/cart/quantity',
-                params: {},
-            }).then(function (data) {
-                $('.my_cart_quantity').text(data.cart_quantity || 0);
-            });
+            return fetchCartQuantity();
         }
     });
-});
\ No newline at end of file
+
+    // Las páginas servidas desde la caché de páginas se renderizaron sin carrito:
+    // el contador se consulta en el navegador
+    publicWidget.registry.CertificaCachedCartQuantity = publicWidget.Widget.extend({
+        selector: '.certifica_custom_header',
+
+        /**
+         * @override
+         */
+        start: function () {
+            if (document.documentElement.hasAttribute('data-certifica-page-cache')) {
+                fetchCartQuantity();
+            }
+            return this._super.apply(this, arguments);
+        },
+    });
+});
@@ -9,6 +9,23 @@ odoo.define('certifica_theme.checkout_custom', function (require) {
     var publicWidget = require('web.public.widget');
     var core = require('web.core');
     var _t = core._t;
+    var rpc = require('web.rpc');
+
+    /**
+     * Con el paso de pago cargado sin recarga, "atrás"/"adelante" entre las dos
+     * entradas del checkout vuelve a pedir la página real. Solo actúa sobre las
+     * entradas de historial marcadas por este widget.
+     */
+    function _onCheckoutPopState(ev) {
+        if (ev.state && ev.state.certificaCheckout) {
+            window.location.reload();
+        }
+    }
+
+    // Tras recargar una entrada marcada, el navegador conserva el estado: seguir escuchando
+    if (window.history.state && window.history.state.certificaCheckout) {
+        window.addEventListener('popstate', _onCheckoutPopState);
+    }
 
     // Widget para manejar el checkout personalizado
     publicWidget.registry.CheckoutCustom = publicWidget.Widget.extend({
@@ -177,11 +194,95 @@ odoo.define('certifica_theme.checkout_custom', function (require) {
         },
 
         /**
-         * Manejar envío del formulario
+         * Manejar envío del formulario: se guarda por JSON y se muestra el paso de
+         * pago sin recargar. Ante cualquier error se envía el formulario por POST.
          */
         _onSubmitForm: function (ev) {
-            console.log('Formulario enviado');
-            // Aquí puedes agregar validaciones adicionales antes del envío
+            var self = this;
+            // Las validaciones de la plantilla cancelan el envío con preventDefault
+            if (ev.isDefaultPrevented() || this._submitting || !this.$el.is('form[action="/shop/address"]')) {
+                return;
+            }
+            ev.preventDefault();
+            this._submitting = true;
+            var form = {};
+            _.each(this.$el.serializeArray(), function (field) {
+                form[field.name] = field.value;
+            });
+            this.$('button[type="submit"], a.a-submit').addClass('disabled').attr('disabled', 'disabled');
+            rpc.query({
+                route: '/shop/checkout/submit',
+                params: {form: form},
+            }).then(function (result) {
+                if (result.state === 'payment') {
+                    self._showPaymentStep(result);
+                } else if (result.state === 'redirect') {
+                    window.location.href = result.url;
+                } else if (result.state === 'error' && result.errors) {
+                    self._showFormErrors(result);
+                } else {
+                    self._submitNatively();
+                }
+            }).guardedCatch(function () {
+                self._submitNatively();
+            });
+        },
+
+        /**
+         * Marca los campos rechazados por el servidor y muestra sus mensajes; el
+         * formulario queda listo para corregirlo y enviarlo de nuevo.
+         *
+         * @private
+         * @param {Object} result
+         */
+        _showFormErrors: function (result) {
+            var self = this;
+            _.each(result.errors, function (error, fieldName) {
+                self.$('[name="' + fieldName + '"]').removeClass('is-valid').addClass('is-invalid');
+            });
+            this.$('.certifica-form-errors').remove();
+            var $errors = $('<div class="certifica-form-errors alert alert-danger"/>');
+            _.each(result.error_message || [], function (message) {
+                $errors.append($('<p class="mb-0"/>').text(message));
+            });
+            if (result.error_message && result.error_message.length) {
+                this.$el.prepend($errors);
+            }
+            this.$('button[type="submit"], a.a-submit').removeClass('disabled').removeAttr('disabled');
+            this._submitting = false;
+        },
+
+        /**
+         * Envío tradicional del formulario (sin pasar por este manejador).
+         *
+         * @private
+         */
+        _submitNatively: function () {
+            this.el.submit();
+        },
+
+        /**
+         * Sustituye el contenido de la página por el paso de pago devuelto por el servidor.
+         *
+         * @private
+         * @param {Object} result
+         */
+        _showPaymentStep: function (result) {
+            var $newWrap = $('<div/>').html(result.payment_html).find('#wrap');
+            if (!$newWrap.length) {
+                window.location.href = result.url;
+                return;
+            }
+            var $wrap = $('#wrap');
+            this.trigger_up('widgets_stop_request', {$target: $wrap});
+            $wrap.replaceWith($newWrap);
+            // Marcar también la entrada del formulario para que "atrás" la reconozca
+            window.history.replaceState({certificaCheckout: true}, '');
+            window.history.pushState({certificaCheckout: true}, '', result.url);
+            window.removeEventListener('popstate', _onCheckoutPopState);
+            window.addEventListener('popstate', _onCheckoutPopState);
+            window.scrollTo(0, 0);
+            this.trigger_up('widgets_start_request', {$target: $newWrap});
         },
 
         /**
@@ -3,20 +3,129 @@ odoo.define('certifica_theme.custom_search', function (require) {
 
     var publicWidget = require('web.public.widget');
 
+    // Milisegundos sin teclear antes de pedir sugerencias
+    var DEBOUNCE_DELAY = 200;
+    // Caracteres mínimos para consultar /shop/autocomplete
+    var MIN_LENGTH = 2;
+
     publicWidget.registry.CustomSearch = publicWidget.Widget.extend({
-        selector: '.header-search .search-form',
+        selector: '.certifica_custom_header .search-form',
         events: {
             'submit': '_onSearchSubmit',
+            'input input[name="search"]': '_onSearchInput',
+            'keydown input[name="search"]': '_onSearchKeydown',
+            'focusout': '_onFocusOut',
         },
 
         /**
          * @override
          */
         start: function () {
-            this.$input = this.$('input.search-input');
+            this.$input = this.$('input[name="search"]');
+            this.$input.attr('autocomplete', 'off');
+            this.$menu = $('<div class="certifica-autocomplete dropdown-menu"/>').appendTo(this.$el);
+            this._debounceTimer = null;
+            this._xhr = null;
+            this._lastTerm = '';
             return this._super.apply(this, arguments);
         },
 
+        /**
+         * @override
+         */
+        destroy: function () {
+            clearTimeout(this._debounceTimer);
+            this._abort();
+            if (this.$menu) {
+                this.$menu.remove();
+            }
+            this._super.apply(this, arguments);
+        },
+
+        //--------------------------------------------------------------------------
+        // Private
+        //--------------------------------------------------------------------------
+
+        /**
+         * Cancela la petición de sugerencias en curso, si la hay.
+         *
+         * @private
+         */
+        _abort: function () {
+            if (this._xhr) {
+                this._xhr.abort();
+                this._xhr = null;
+            }
+        },
+
+        /**
+         * @private
+         * @param {string} term
+         */
+        _fetchSuggestions: function (term) {
+            var self = this;
+            this._abort();
+            this._lastTerm = term;
+            this._xhr = $.ajax({
+                url: '/shop/autocomplete',
+                type: 'GET',
+                dataType: 'json',
+                data: {term: term, limit: 8},
+            });
+            this._xhr.done(function (data) {
+                // Una respuesta tardía de un término anterior no debe pisar la actual
+                if (term === self._lastTerm) {
+                    self._render(data.suggestions || [], data.currency || {});
+                }
+            }).always(function () {
+                self._xhr = null;
+            });
+        },
+
+        /**
+         * @private
+         * @param {number} price
+         * @param {Object} currency
+         * @returns {string}
+         */
+        _formatPrice: function (price, currency) {
+            var amount = Number(price || 0).toFixed(currency.decimals === undefined ? 2 : currency.decimals);
+            return currency.position === 'after' ? amount + ' ' + (currency.symbol || '') : (currency.symbol || '') + ' ' + amount;
+        },
+
+        /**
+         * @private
+         */
+        _hide: function () {
+            this.$menu.removeClass('show').empty();
+        },
+
+        /**
+         * @private
+         * @param {Object[]} suggestions
+         * @param {Object} currency
+         */
+        _render: function (suggestions, currency) {
+            var self = this;
+            this.$menu.empty();
+            if (!suggestions.length) {
+                this._hide();
+                return;
+            }
+            _.each(suggestions, function (suggestion) {
+                var $item = $('<a class="dropdown-item certifica-autocomplete-item"/>').attr('href', suggestion.url);
+                $('<img class="certifica-autocomplete-image" loading="lazy" alt=""/>').attr('src', suggestion.image_url).appendTo($item);
+                var $text = $('<span class="certifica-autocomplete-text"/>').appendTo($item);
+                $('<span class="certifica-autocomplete-name"/>').text(suggestion.name).appendTo($text);
+                if (suggestion.code) {
+                    $('<small class="certifica-autocomplete-code"/>').text(suggestion.code).appendTo($text);
+                }
+                $('<span class="certifica-autocomplete-price"/>').text(self._formatPrice(suggestion.price, currency)).appendTo($item);
+                self.$menu.append($item);
+            });
+            this.$menu.addClass('show');
+        },
+
         //--------------------------------------------------------------------------
         // Handlers
         //--------------------------------------------------------------------------
@@ -35,7 +144,58 @@ odoo.define('certifica_theme.custom_search', function (require) {
                 window.location.href = searchUrl;
             }
         },
+
+        /**
+         * Pide sugerencias cuando el usuario deja de teclear.
+         *
+         * @private
+         */
+        _onSearchInput: function () {
+            var self = this;
+            var term = this.$input.val().trim();
+            clearTimeout(this._debounceTimer);
+            if (term.length < MIN_LENGTH) {
+                this._abort();
+                this._lastTerm = '';
+                this._hide();
+                return;
+            }
+            this._debounceTimer = setTimeout(function () {
+                self._fetchSuggestions(term);
+            }, DEBOUNCE_DELAY);
+        },
+
+        /**
+         * Navegación de las sugerencias con el teclado.
+         *
+         * @private
+         * @param {KeyboardEvent} ev
+         */
+        _onSearchKeydown: function (ev) {
+            var $items = this.$menu.find('.certifica-autocomplete-item');
+            if (!this.$menu.hasClass('show') || !$items.length) {
+                return;
+            }
+            if (ev.key === 'Escape') {
+                this._hide();
+            } else if (ev.key === 'ArrowDown') {
+                ev.preventDefault();
+                $items.first().focus();
+            }
+        },
+
+        /**
+         * Oculta las sugerencias cuando el foco sale del formulario.
+         *
+         * @private
+         * @param {Event} ev
+         */
+        _onFocusOut: function (ev) {
+            if (!ev.relatedTarget || !$.contains(this.el, ev.relatedTarget)) {
+                this._hide();
+            }
+        },
     });
 
     return publicWidget.registry.CustomSearch;
-});
\ No newline at end of file
+});
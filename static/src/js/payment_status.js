@@ -0,0 +1,93 @@
+odoo.define('certifica_theme.payment_status', function (require) {
+    'use strict';
+
+    var publicWidget = require('web.public.widget');
+
+    // Primera espera, espera máxima y número de consultas antes de rendirse
+    var POLL_INITIAL_DELAY = 2000;
+    var POLL_MAX_DELAY = 30000;
+    var POLL_MAX_ATTEMPTS = 15;
+
+    publicWidget.registry.CertificaPaymentStatus = publicWidget.Widget.extend({
+        selector: '.certifica-payment-details',
+
+        /**
+         * Mientras el pago esté pendiente, consulta su estado con espera
+         * exponencial y actualiza la página sin recargarla.
+         *
+         * @override
+         */
+        start: function () {
+            this._attempts = 0;
+            this._delay = POLL_INITIAL_DELAY;
+            if (this.$('.certifica-payment-status[data-waiting]').length) {
+                this._schedulePoll();
+            }
+            return this._super.apply(this, arguments);
+        },
+        /**
+         * @override
+         */
+        destroy: function () {
+            clearTimeout(this._pollTimeout);
+            if (this._xhr) {
+                this._xhr.abort();
+            }
+            this._super.apply(this, arguments);
+        },
+
+        //--------------------------------------------------------------------------
+        // Private
+        //--------------------------------------------------------------------------
+
+        /**
+         * @private
+         */
+        _schedulePoll: function () {
+            var self = this;
+            if (this._attempts >= POLL_MAX_ATTEMPTS) {
+                this.$('.certifica-payment-status-spinner').remove();
+                return;
+            }
+            this._pollTimeout = setTimeout(function () {
+                self._attempts++;
+                self._xhr = $.getJSON('/shop/payment/status').done(function (status) {
+                    self._renderStatus(status);
+                    if (status.waiting) {
+                        self._schedulePoll();
+                    }
+                }).fail(function (xhr, textStatus) {
+                    if (textStatus !== 'abort') {
+                        self._schedulePoll();
+                    }
+                });
+                self._delay = Math.min(self._delay * 2, POLL_MAX_DELAY);
+            }, this._delay);
+        },
+        /**
+         * @private
+         * @param {Object} status respuesta de /shop/payment/status
+         */
+        _renderStatus: function (status) {
+            var $status = this.$('.certifica-payment-status');
+            if (!status.state || status.state === $status.attr('data-state')) {
+                return;
+            }
+            $status.attr('data-state', status.state);
+            $status.find('.certifica-payment-status-label').text(status.label);
+            if (!status.waiting) {
+                $status.removeAttr('data-waiting');
+                $status.find('.certifica-payment-status-spinner').remove();
+            }
+            if (status.order_name) {
+                this.$('.certifica-order-name').text(status.order_name);
+            }
+            var $total = this.$('.certifica-order-total');
+            if (status.amount_total !== null && parseFloat($total.data('amount')) !== status.amount_total) {
+                $total.data('amount', status.amount_total).text(status.currency + ' ' + status.amount_total.toFixed(2));
+            }
+        },
+    });
+
+    return publicWidget.registry.CertificaPaymentStatus;
+});
@@ -0,0 +1,54 @@
+odoo.define('certifica_theme.stock_badges', function (require) {
+    'use strict';
+
+    var publicWidget = require('web.public.widget');
+    var rpc = require('web.rpc');
+
+    publicWidget.registry.CertificaStockBadges = publicWidget.Widget.extend({
+        selector: '#products_grid',
+
+        /**
+         * Pide el stock de todas las tarjetas visibles en una sola llamada.
+         *
+         * @override
+         */
+        start: function () {
+            var self = this;
+            var ids = this.$('.product-card[data-product-template-id]').map(function () {
+                return parseInt($(this).data('product-template-id'), 10);
+            }).get();
+            if (ids.length) {
+                rpc.query({
+                    route: '/shop/stock_badges',
+                    params: {product_tmpl_ids: ids},
+                }).then(function (quantities) {
+                    self._renderBadges(quantities || {});
+                });
+            }
+            return this._super.apply(this, arguments);
+        },
+
+        //--------------------------------------------------------------------------
+        // Private
+        //--------------------------------------------------------------------------
+
+        /**
+         * @private
+         * @param {Object} quantities product_tmpl_id -> cantidad disponible
+         */
+        _renderBadges: function (quantities) {
+            this.$('.product-card[data-product-template-id]').each(function () {
+                var qty = quantities[$(this).data('product-template-id')];
+                if (qty === undefined) {
+                    return;
+                }
+                var $badge = qty > 0 ?
+                    $('<span class="badge badge-success"/>').text('En stock: ' + qty) :
+                    $('<span class="badge badge-danger"/>').text('Agotado');
+                $(this).find('.product-stock-badge').empty().append($badge);
+            });
+        },
+    });
+
+    return publicWidget.registry.CertificaStockBadges;
+});
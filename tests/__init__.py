@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+
+from . import test_shop_domain
+from . import test_pricelist_prices
+from . import test_product_search
+from . import test_keyset_pagination
+from . import test_template_queries
+from . import test_cart_concurrency
+from . import test_vat_policy
+from . import test_checkout
+from . import test_shop_cache
+from . import test_partner_dedupe
+from . import test_product_availability
+from . import test_vat_tools
+from . import test_partner_reclassify
+from . import test_payment_confirmation
+from . import test_settings
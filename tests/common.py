@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+from contextlib import contextmanager
+
+_logger = logging.getLogger(__name__)
+
+
+class CertificaShopMixin(object):
+    """
+    Catálogo de prueba para la tienda: plantillas publicadas y un pricelist con
+    una regla de precio fijo por plantilla, fijado como pricelist del módulo.
+    Sirve tanto para TransactionCase como para HttpCase.
+    """
+
+    def _create_templates(self, count, prefix='Certifica prueba', **values):
+        vals = dict({
+            'type': 'consu',
+            'sale_ok': True,
+            'is_published': True,
+            'list_price': 100.0,
+        }, **values)
+        return self.env['product.template'].create([
+            dict(vals, name='%s %s' % (prefix, index), default_code='CERT-%s' % index)
+            for index in range(count)
+        ])
+
+    def _create_shop_pricelist(self, templates, name='Certifica prueba'):
+        """Pricelist con precio fijo para las plantillas, fijado en certifica_theme.pricelist_id."""
+        pricelist = self.env['product.pricelist'].create({
+            'name': name,
+            'item_ids': [(0, 0, {
+                'applied_on': '1_product',
+                'product_tmpl_id': template.id,
+                'compute_price': 'fixed',
+                'fixed_price': 90.0,
+            }) for template in templates],
+        })
+        self._set_shop_pricelist(pricelist)
+        return pricelist
+
+    def _set_shop_pricelist(self, pricelist):
+        self.env['ir.config_parameter'].sudo().set_param('certifica_theme.pricelist_id', str(pricelist.id))
+
+    def _add_to_pricelist(self, pricelist, templates):
+        self.env['product.pricelist.item'].create([{
+            'pricelist_id': pricelist.id,
+            'applied_on': '1_product',
+            'product_tmpl_id': template.id,
+            'compute_price': 'fixed',
+            'fixed_price': 90.0,
+        } for template in templates])
+
+    def _bump_catalog_generation(self):
+        """
+        Las invalidaciones del catálogo se aplican al hacer commit, que no ocurre
+        en una prueba: se avanza la generación a mano para que los índices del
+        worker (facetas, autocompletado, árbol de categorías) se reconstruyan.
+        """
+        self.env.cr.execute("SELECT nextval('certifica_catalog_generation_seq')")
+
+    def _clone_templates(self, template, count, name_sql="'Certifica clon ' || n"):
+        """
+        Crea count copias de la plantilla (y de su variante) por SQL, para los
+        benchmarks con decenas o cientos de miles de productos. name_sql es una
+        expresión SQL sobre n (1..count). Devuelve los IDs nuevos.
+        """
+        cr = self.env.cr
+        self.env['product.template'].flush()
+        self.env['product.product'].flush()
+
+        def copy_columns(table, overrides):
+            cr.execute("SELECT column_name FROM information_schema.columns WHERE table_name = %s", (table,))
+            columns = [name for (name,) in cr.fetchall() if name != 'id']
+            return (', '.join('"%s"' % column for column in columns),
+                    ', '.join(overrides.get(column, 'src."%s"' % column) for column in columns))
+
+        columns, values = copy_columns('product_template', {'name': name_sql})
+        cr.execute("CREATE TEMP TABLE certifica_clone_tmpl (id integer)")
+        cr.execute("""
+            WITH inserted AS (
+                INSERT INTO product_template (%s)
+                SELECT %s FROM product_template src, generate_series(1, %%s) n
+                 WHERE src.id = %%s
+             RETURNING id
+            ) INSERT INTO certifica_clone_tmpl SELECT id FROM inserted
+        """ % (columns, values), (count, template.id))
+        columns, values = copy_columns('product_product', {
+            'product_tmpl_id': 'clone.id',
+            'default_code': "'CLON-' || clone.id",
+        })
+        cr.execute("""
+            INSERT INTO product_product (%s)
+            SELECT %s FROM product_product src, certifica_clone_tmpl clone
+             WHERE src.id = %%s
+        """ % (columns, values), (template.product_variant_id.id,))
+        cr.execute("SELECT id FROM certifica_clone_tmpl ORDER BY id")
+        tmpl_ids = [row[0] for row in cr.fetchall()]
+        cr.execute("DROP TABLE certifica_clone_tmpl")
+        cr.execute("ANALYZE product_template")
+        cr.execute("ANALYZE product_product")
+        return tmpl_ids
+
+    @contextmanager
+    def _measure(self, results, label):
+        """Añade a results (label, consultas SQL, milisegundos) del bloque."""
+        queries, started = self.env.cr.sql_log_count, time.time()
+        yield
+        results.append((label, self.env.cr.sql_log_count - queries, (time.time() - started) * 1000))
+
+    def _log_results(self, title, results):
+        _logger.info('%s:\n%s', title, '\n'.join(
+            '  %-45s %6s consultas %10.1f ms' % result for result in results))
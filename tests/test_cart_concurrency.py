@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+import time
+
+from odoo import api, SUPERUSER_ID
+from odoo.tests import TransactionCase, tagged
+from odoo.addons.website.tools import MockRequest
+
+from ..controllers.main import WebsiteSaleCustom
+from .common import CertificaShopMixin
+
+_logger = logging.getLogger(__name__)
+
+# Adiciones simultáneas del benchmark de concurrencia del carrito
+BENCHMARK_THREADS = 20
+
+
+class CertificaCartCase(CertificaShopMixin, TransactionCase):
+
+    def _create_order(self, env):
+        partner = env['res.partner'].create({'name': 'Certifica carrito'})
+        return env['sale.order'].create({
+            'partner_id': partner.id,
+            'website_id': env['website'].search([], limit=1).id,
+        })
+
+
+@tagged('post_install', '-at_install')
+class TestCartAddToken(CertificaCartCase):
+
+    def setUp(self):
+        super(TestCartAddToken, self).setUp()
+        self.product = self._create_templates(1).product_variant_id
+        self.order = self._create_order(self.env)
+
+    def _add(self, token=None):
+        order = self.order.with_context(certifica_cart_add_token=token) if token else self.order
+        order._cart_update(product_id=self.product.id, add_qty=1)
+        return sum(self.order.order_line.mapped('product_uom_qty'))
+
+    def test_same_token_is_applied_once(self):
+        self.assertEqual(self._add('token-a'), 1)
+        self.assertEqual(self._add('token-a'), 1)
+
+    def test_distinct_tokens_all_count(self):
+        self._add('token-a')
+        self._add('token-b')
+        self.assertEqual(self._add('token-c'), 3)
+
+    def test_adds_without_token_are_not_merged(self):
+        self._add()
+        self.assertEqual(self._add(), 2)
+
+
+@tagged('post_install', '-at_install')
+class TestSaleGetOrderMemo(CertificaCartCase):
+    """La memoria de sale_get_order() nunca devuelve el pedido anterior de la sesión."""
+
+    def setUp(self):
+        super(TestSaleGetOrderMemo, self).setUp()
+        website = self.env['website'].search([], limit=1)
+        self.env_public = self.env(user=self.env.ref('base.public_user'))
+        self.website = website.with_env(self.env_public)
+
+    def test_force_create_after_empty_result(self):
+        with MockRequest(self.env_public, website=self.website) as request:
+            request._certifica_memo = {}
+            self.assertFalse(self.website.sale_get_order())
+            order = self.website.sale_get_order(force_create=True)
+            self.assertTrue(order)
+            self.assertEqual(request.session['sale_order_id'], order.id)
+            self.assertEqual(self.website.sale_get_order(), order)
+
+    def test_session_order_change(self):
+        first, second = self._create_order(self.env), self._create_order(self.env)
+        with MockRequest(self.env_public, website=self.website, sale_order_id=first.id) as request:
+            request._certifica_memo = {}
+            self.assertEqual(self.website.sale_get_order().id, first.id)
+            request.session['sale_order_id'] = second.id
+            self.assertEqual(self.website.sale_get_order().id, second.id)
+
+
+@tagged('post_install', '-at_install', '-standard', 'certifica_benchmark')
+class BenchmarkCartConcurrency(CertificaCartCase):
+    """
+    Lanza adiciones en paralelo, cada una con su propio cursor, contra un mismo
+    pedido y reporta rendimiento, reintentos, fallos y si la cantidad cuadra.
+    Los datos se confirman en cursores propios y se borran al terminar.
+    """
+
+    def test_benchmark_parallel_adds(self):
+        registry = self.registry
+        controller = WebsiteSaleCustom()
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            template = env['product.template'].create({'name': 'Certifica concurrencia', 'sale_ok': True})
+            product_id = template.product_variant_id.id
+            order = self._create_order(env)
+            order_id, partner_id = order.id, order.partner_id.id
+
+        stats = {'ok': 0, 'failed': 0, 'retries': 0}
+        lock = threading.Lock()
+
+        def add_one():
+            thread_stats = {}
+            try:
+                with registry.cursor() as cr:
+                    env = api.Environment(cr, SUPERUSER_ID, {})
+                    order = env['sale.order'].browse(order_id)
+                    controller._run_cart_mutation(
+                        env, lambda: order._cart_update(product_id=product_id, add_qty=1), thread_stats)
+                outcome = 'ok'
+            except Exception as e:
+                _logger.warning('Benchmark del carrito: adición fallida: %s', e)
+                outcome = 'failed'
+            with lock:
+                stats[outcome] += 1
+                stats['retries'] += thread_stats.get('retries', 0)
+
+        threads = [threading.Thread(target=add_one) for _i in range(BENCHMARK_THREADS)]
+        started = time.time()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - started
+
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            order = env['sale.order'].browse(order_id)
+            lines = len(order.order_line)
+            quantity = sum(order.order_line.mapped('product_uom_qty'))
+            order.unlink()
+            env['product.template'].browse(template.id).unlink()
+            env['res.partner'].browse(partner_id).unlink()
+
+        _logger.info(
+            'Benchmark de concurrencia del carrito: %s adiciones en %.1f ms (%.1f/s), '
+            '%s correctas, %s fallidas (%.1f %%), %s reintentos, %s línea(s), cantidad %g',
+            BENCHMARK_THREADS, elapsed * 1000, BENCHMARK_THREADS / elapsed, stats['ok'], stats['failed'],
+            stats['failed'] * 100.0 / BENCHMARK_THREADS, stats['retries'], lines, quantity)
+        self.assertEqual(lines, 1)
+        self.assertEqual(quantity, stats['ok'])
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+from odoo.tests import HttpCase, tagged
+
+from .common import CertificaShopMixin
+
+
+class CertificaCheckoutCase(CertificaShopMixin, HttpCase):
+
+    def setUp(self):
+        super(CertificaCheckoutCase, self).setUp()
+        self.template = self._create_templates(1)
+        self._create_shop_pricelist(self.template)
+        self.peru = self.env.ref('base.pe')
+        self.env['ir.config_parameter'].sudo().set_param('certifica_theme.country_id', str(self.peru.id))
+
+    def _json_call(self, url, **params):
+        response = self.url_open(url, data=json.dumps({
+            'jsonrpc': '2.0', 'method': 'call', 'id': None, 'params': params,
+        }), headers={'Content-Type': 'application/json'})
+        self.assertEqual(response.status_code, 200)
+        return response.json().get('result')
+
+    def _add_to_cart(self):
+        self.url_open('/shop/cart/update', data={
+            'product_id': self.template.product_variant_id.id, 'add_qty': 1})
+        return self.env['sale.order'].search(
+            [('order_line.product_id', '=', self.template.product_variant_id.id)], order='id desc', limit=1)
+
+    def _checkout_form(self, **values):
+        return dict({
+            'name': 'Cliente Certifica',
+            'email': 'cliente@example.com',
+            'phone': '999888777',
+            'street': 'Av. Principal 123',
+            'city': 'Lima',
+            'country_id': str(self.peru.id),
+            'shipping_option': 'delivery',
+            'invoice_type_checkbox': '',
+        }, **values)
+
+
+@tagged('post_install', '-at_install')
+class TestCheckoutPartner(CertificaCheckoutCase):
+
+    def test_public_checkout_never_attaches_to_existing_vat(self):
+        existing = self.env['res.partner'].create({
+            'name': 'Cliente existente',
+            'vat': '12345678',
+            'email': 'existente@example.com',
+        })
+        order = self._add_to_cart()
+        self.assertTrue(order, 'El carrito del visitante no se creó')
+        self._json_call('/shop/checkout/submit', form=self._checkout_form(dni='12345678'))
+        order.invalidate_cache()
+        existing.invalidate_cache()
+        self.assertNotEqual(order.partner_id.commercial_partner_id, existing)
+        self.assertNotEqual(order.partner_invoice_id.commercial_partner_id, existing)
+        self.assertFalse(existing.child_ids, 'El visitante creó un contacto bajo un partner ajeno')
+        self.assertEqual(existing.name, 'Cliente existente')
+        self.assertEqual(order.partner_id.vat, '12345678')
+
+    def test_logged_in_checkout_reuses_own_commercial_partner(self):
+        user = self.env['res.users'].create({
+            'name': 'Cliente portal',
+            'login': 'certifica_checkout',
+            'password': 'certifica_checkout',
+            'groups_id': [(6, 0, [self.env.ref('base.group_portal').id])],
+        })
+        user.partner_id.vat = '87654321'
+        self.authenticate('certifica_checkout', 'certifica_checkout')
+        order = self._add_to_cart()
+        self._json_call('/shop/checkout/submit', form=self._checkout_form(dni='87654321'))
+        order.invalidate_cache()
+        self.assertEqual(order.partner_id, user.partner_id)
+        self.assertEqual(order.partner_invoice_id.parent_id, user.partner_id)
+
+
+@tagged('post_install', '-at_install')
+class TestCheckoutSubmitErrors(CertificaCheckoutCase):
+
+    def setUp(self):
+        super(TestCheckoutSubmitErrors, self).setUp()
+        # Política estándar: se validan el formato y el dígito verificador del RUC
+        for key in ('base_vat.disable_validation', 'base_vat.flexible_format',
+                    'l10n_pe.disable_vat_validation', 'l10n_latam_base.disable_vat_validation'):
+            self.env['ir.config_parameter'].sudo().set_param(key, 'False')
+
+    def test_invalid_ruc_rolls_back_and_returns_field_errors(self):
+        order = self._add_to_cart()
+        partner = order.partner_id
+        result = self._json_call('/shop/checkout/submit', form=self._checkout_form(
+            invoice_type_checkbox='1', ruc='20100070971', razon_social='Empresa Certifica SAC'))
+        self.assertEqual(result['state'], 'error')
+        self.assertEqual(result['errors'], {'ruc': 'error'})
+        self.assertTrue(result['error_message'])
+        # El savepoint deshizo el partner creado y el pedido no cambió
+        self.assertFalse(self.env['res.partner'].search([('vat', '=', '20100070971')]))
+        order.invalidate_cache()
+        self.assertEqual(order.partner_id, partner)
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+from odoo.osv import expression
+from odoo.tests import TransactionCase, tagged
+
+from ..tools import keyset
+from .common import CertificaShopMixin
+
+# Orden por defecto de WebsiteSale._get_search_order
+SHOP_ORDER = 'is_published desc, website_sequence asc, id desc'
+
+# Productos por página de la tienda
+PPG = 18
+
+
+class CertificaKeysetCase(CertificaShopMixin, TransactionCase):
+
+    def setUp(self):
+        super(CertificaKeysetCase, self).setUp()
+        self.Product = self.env['product.template']
+        self.keys = keyset.parse_order(SHOP_ORDER)
+
+    def _offset_page(self, domain, page):
+        return self.Product.search(domain, limit=PPG, offset=(page - 1) * PPG, order=SHOP_ORDER)
+
+    def _keyset_page(self, domain, previous_page):
+        """Página siguiente a previous_page por clave, como hace la tienda con el cursor."""
+        last = previous_page[-1]
+        values = [last[field] for field, _direction in self.keys]
+        return self.Product.search(
+            expression.AND([domain, keyset.seek_domain(self.keys, values)]), limit=PPG, order=SHOP_ORDER)
+
+
+@tagged('post_install', '-at_install')
+class TestKeysetPagination(CertificaKeysetCase):
+
+    def test_keyset_pages_match_offset_pages(self):
+        templates = self._create_templates(60)
+        # Secuencias repetidas: el desempate por id debe mantener el orden
+        for index, template in enumerate(templates):
+            template.website_sequence = index % 4
+        domain = [('id', 'in', templates.ids)]
+        page = self._offset_page(domain, 1)
+        for number in range(2, 5):
+            page = self._keyset_page(domain, page)
+            self.assertEqual(page.ids, self._offset_page(domain, number).ids)
+
+    def test_cursor_round_trip(self):
+        fingerprint = keyset.fingerprint('categoria', 'busqueda')
+        cursor = keyset.encode_cursor(3, [True, 10, 42], fingerprint)
+        self.assertEqual(keyset.decode_cursor(cursor, 3, fingerprint, 3), [True, 10, 42])
+        # Otra página, otra consulta o un cursor manipulado se ignoran
+        self.assertIsNone(keyset.decode_cursor(cursor, 4, fingerprint, 3))
+        self.assertIsNone(keyset.decode_cursor(cursor, 3, keyset.fingerprint('otra'), 3))
+        self.assertIsNone(keyset.decode_cursor(cursor[:-2], 3, fingerprint, 3))
+
+    def test_unsupported_order_disables_keyset(self):
+        self.assertIsNone(keyset.parse_order('name asc, id desc'))
+        self.assertIsNone(keyset.parse_order('website_sequence asc'))
+
+
+@tagged('post_install', '-at_install', '-standard', 'certifica_benchmark')
+class BenchmarkKeysetPagination(CertificaKeysetCase):
+    """Latencia de páginas profundas por OFFSET frente a por clave sobre 100k plantillas."""
+
+    def test_benchmark_deep_pages(self):
+        seed = self.Product.create({'name': 'Certifica semilla', 'sale_ok': True, 'is_published': True})
+        self._clone_templates(seed, 100000)
+        domain = [('sale_ok', '=', True), ('is_published', '=', True)]
+        results = []
+        for number in (2, 200, 2000, 5000):
+            previous = self._offset_page(domain, number - 1)
+            self.Product.invalidate_cache()
+            with self._measure(results, 'página %s por OFFSET' % number):
+                by_offset = self._offset_page(domain, number)
+            self.Product.invalidate_cache()
+            with self._measure(results, 'página %s por clave' % number):
+                by_key = self._keyset_page(domain, previous)
+            self.assertEqual(by_key.ids, by_offset.ids)
+        self._log_results('Benchmark de paginación profunda de la tienda', results)
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPartnerDedupe(TransactionCase):
+    """
+    Fusión de partners duplicados por DNI/RUC: pedidos y seguidores pasan al
+    superviviente y los seguidores que ya tenía no rompen la clave única.
+    """
+
+    def setUp(self):
+        super(TestPartnerDedupe, self).setUp()
+        Partner = self.env['res.partner']
+        self.survivor = Partner.create({'name': 'Certifica original', 'vat': '20999999991'})
+        self.duplicate = Partner.create({'name': 'Certifica duplicado', 'vat': '20-999999991'})
+        self.product = self.env['product.product'].create({'name': 'Certifica fusión', 'list_price': 10.0})
+        self.survivor_order = self._create_order(self.survivor)
+        self.duplicate_order = self._create_order(self.duplicate)
+        # Ambos siguen el pedido del superviviente; el duplicado, además, el suyo
+        self.survivor_order.message_subscribe(partner_ids=(self.survivor | self.duplicate).ids)
+        self.duplicate_order.message_subscribe(partner_ids=self.duplicate.ids)
+
+    def _create_order(self, partner):
+        return self.env['sale.order'].create({
+            'partner_id': partner.id,
+            'order_line': [(0, 0, {'product_id': self.product.id, 'product_uom_qty': 1.0})],
+        })
+
+    def _followers(self, order):
+        """Seguidores del pedido entre los dos partners de la prueba."""
+        return self.env['mail.followers'].search([
+            ('res_model', '=', 'sale.order'), ('res_id', '=', order.id),
+            ('partner_id', 'in', (self.survivor | self.duplicate).ids),
+        ]).mapped('partner_id')
+
+    def test_dry_run_changes_nothing(self):
+        report = self.env['certifica.partner.dedupe']._run(dry_run=True)
+        self.assertGreaterEqual(report['duplicates'], 1)
+        self.assertGreaterEqual(report['references']['sale_order.partner_id'], 1)
+        self.assertGreaterEqual(report['removed']['mail_followers.partner_id'], 1)
+        self.assertTrue(self.duplicate.active)
+        self.assertEqual(self.duplicate_order.partner_id, self.duplicate)
+        self.assertIn(self.duplicate, self._followers(self.survivor_order))
+
+    def test_merge_orders_and_followers(self):
+        report = self.env['certifica.partner.dedupe']._run(dry_run=False)
+        self.assertGreaterEqual(report['references']['sale_order.partner_id'], 1)
+        self.assertFalse(self.duplicate.active)
+        self.assertEqual(self.duplicate_order.partner_id, self.survivor)
+        self.assertEqual(self.survivor_order.partner_id, self.survivor)
+        # El seguidor repetido se elimina; el que no lo era pasa al superviviente
+        self.assertEqual(self._followers(self.survivor_order), self.survivor)
+        self.assertEqual(self._followers(self.duplicate_order), self.survivor)
+        self.assertEqual(self.env['mail.followers'].search_count([('partner_id', '=', self.duplicate.id)]), 0)
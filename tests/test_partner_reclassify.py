@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestPartnerReclassify(TransactionCase):
+    """
+    Reclasificación masiva DNI/RUC: corrige el tipo por tramos y, tras una
+    interrupción, continúa desde el último ID guardado en su tabla de estado.
+    """
+
+    def setUp(self):
+        super(TestPartnerReclassify, self).setUp()
+        self.env['ir.config_parameter'].sudo().set_param(
+            'certifica_theme.country_id', str(self.env.ref('base.pe').id))
+        IdentificationType = self.env['l10n_latam.identification.type']
+        self.dni_type_id = IdentificationType._certifica_get_type_id('DNI')
+        self.ruc_type_id = IdentificationType._certifica_get_type_id('RUC')
+        self.Reclassify = self.env['certifica.partner.reclassify']
+        # Dos partners con el tipo invertido, escrito por SQL como en los datos antiguos
+        self.dni_partner = self.env['res.partner'].create({'name': 'Certifica DNI', 'vat': '12345678'})
+        self.ruc_partner = self.env['res.partner'].create({'name': 'Certifica RUC', 'vat': '20100070970'})
+        self.env['res.partner'].flush()
+        self.env.cr.execute(
+            "UPDATE res_partner SET l10n_latam_identification_type_id = %s WHERE id = %s",
+            (self.ruc_type_id, self.dni_partner.id))
+        self.env.cr.execute(
+            "UPDATE res_partner SET l10n_latam_identification_type_id = %s WHERE id = %s",
+            (self.dni_type_id, self.ruc_partner.id))
+        self.env['res.partner'].invalidate_cache()
+
+    def _run(self, **kwargs):
+        # Los commits por tramo no se pueden hacer dentro de la transacción de la prueba
+        with patch.object(self.env.cr, 'commit'):
+            return self.Reclassify._run(**kwargs)
+
+    def test_resume_after_interruption(self):
+        # Todos los partners anteriores a los de la prueba ya se procesaron
+        self.Reclassify._set_last_id(self.dni_partner.id - 1)
+        # Interrupción tras el primer tramo (un partner)
+        self.assertEqual(self._run(chunk_size=1, max_seconds=1e-9), (1, 1))
+        self.assertEqual(self.Reclassify._get_last_id(), self.dni_partner.id)
+        self.assertEqual(self.dni_partner.l10n_latam_identification_type_id.id, self.dni_type_id)
+        self.assertEqual(self.ruc_partner.l10n_latam_identification_type_id.id, self.dni_type_id)
+
+        # La siguiente ejecución continúa con el resto y reinicia el estado al terminar
+        self.assertEqual(self._run(chunk_size=1), (1, 1))
+        self.assertEqual(self.ruc_partner.l10n_latam_identification_type_id.id, self.ruc_type_id)
+        self.assertEqual(self.Reclassify._get_last_id(), 0)
+
+    def test_without_commit_keeps_state(self):
+        self.Reclassify._set_last_id(self.dni_partner.id - 1)
+        self.assertEqual(self.Reclassify._run(commit=False), (2, 2))
+        self.assertEqual(self.Reclassify._get_last_id(), self.dni_partner.id - 1)
+        self.assertEqual(self.dni_partner.l10n_latam_identification_type_id.id, self.dni_type_id)
+        self.assertEqual(self.ruc_partner.l10n_latam_identification_type_id.id, self.ruc_type_id)
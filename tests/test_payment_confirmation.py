@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import HttpCase, TransactionCase, tagged
+
+from .common import CertificaShopMixin
+
+
+class CertificaPaymentCase(CertificaShopMixin):
+
+    def _create_acquirer(self):
+        return self.env['payment.acquirer'].sudo().create({'name': 'Certifica prueba', 'provider': 'manual'})
+
+    def _create_transaction(self, order, acquirer, state='draft'):
+        return self.env['payment.transaction'].sudo().create({
+            'acquirer_id': acquirer.id,
+            'reference': '%s-%s' % (order.name, len(order.transaction_ids) + 1),
+            'amount': order.amount_total,
+            'currency_id': order.currency_id.id,
+            'partner_id': order.partner_id.id,
+            'sale_order_ids': [(6, 0, order.ids)],
+            'state': state,
+        })
+
+
+@tagged('post_install', '-at_install')
+class TestPaymentConfirmationValues(CertificaPaymentCase, TransactionCase):
+
+    def setUp(self):
+        super(TestPaymentConfirmationValues, self).setUp()
+        product = self._create_templates(1).product_variant_id
+        self.order = self.env['sale.order'].create({
+            'partner_id': self.env['res.partner'].create({'name': 'Certifica pago'}).id,
+            'order_line': [(0, 0, {'product_id': product.id, 'product_uom_qty': 2.0})],
+        })
+        self.acquirer = self._create_acquirer()
+        self.Confirmation = self.env['certifica.payment.confirmation']
+
+    def test_values_without_order(self):
+        values = self.Confirmation._get_values(self.env['sale.order'])
+        self.assertFalse(values['transaction'])
+        self.assertIsNone(values['acquirer'])
+        self.assertIsNone(values['payment_status']['state'])
+        self.assertFalse(values['payment_status']['waiting'])
+
+    def test_values_use_last_transaction_not_cancelled(self):
+        pending = self._create_transaction(self.order, self.acquirer, state='pending')
+        self._create_transaction(self.order, self.acquirer, state='cancel')
+        values = self.Confirmation._get_values(self.order)
+        self.assertEqual(values['order'], self.order)
+        self.assertEqual(values['transaction'], pending)
+        self.assertEqual(values['acquirer'], self.acquirer)
+        self.assertEqual(values['payment_status'], {
+            'state': 'pending',
+            'label': 'Pago pendiente de confirmación',
+            'waiting': True,
+            'order_name': self.order.name,
+            'amount_total': self.order.amount_total,
+            'currency': self.order.currency_id.symbol,
+        })
+
+        done = self._create_transaction(self.order, self.acquirer, state='done')
+        values = self.Confirmation._get_values(self.order)
+        self.assertEqual(values['transaction'], done)
+        self.assertFalse(values['payment_status']['waiting'])
+
+
+@tagged('post_install', '-at_install')
+class TestPaymentStatusRoute(CertificaPaymentCase, HttpCase):
+
+    def test_status_json(self):
+        template = self._create_templates(1)
+        self._create_shop_pricelist(template)
+        self.url_open('/shop/cart/update', data={'product_id': template.product_variant_id.id, 'add_qty': 1})
+        order = self.env['sale.order'].search(
+            [('order_line.product_id', '=', template.product_variant_id.id)], order='id desc', limit=1)
+        self.assertTrue(order, 'El carrito del visitante no se creó')
+
+        response = self.url_open('/shop/payment/status')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Cache-Control'], 'no-store')
+        self.assertEqual(response.json()['state'], None)
+        self.assertEqual(response.json()['order_name'], order.name)
+
+        self._create_transaction(order, self._create_acquirer(), state='pending')
+        status = self.url_open('/shop/payment/status').json()
+        self.assertEqual(status['state'], 'pending')
+        self.assertTrue(status['waiting'])
+        self.assertEqual(status['amount_total'], order.amount_total)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+from .common import CertificaShopMixin
+
+
+class CertificaPriceCase(CertificaShopMixin, TransactionCase):
+
+    def _batch_prices(self, pricelist, templates):
+        """Mismo cálculo que WebsiteSaleCustom._get_products_prices."""
+        results = pricelist._compute_price_rule(
+            [(template, 1.0, self.env.user.partner_id) for template in templates])
+        return {tmpl_id: price for tmpl_id, (price, _rule_id) in results.items()}
+
+
+@tagged('post_install', '-at_install')
+class TestListingPrices(CertificaPriceCase):
+
+    def test_batched_prices_match_per_product_price(self):
+        templates = self._create_templates(18)
+        pricelist = self._create_shop_pricelist(templates)
+        prices = self._batch_prices(pricelist, templates)
+        for template in templates:
+            self.assertAlmostEqual(prices[template.id], template.with_context(pricelist=pricelist.id).price)
+
+    def test_batched_prices_query_count_is_constant(self):
+        templates = self._create_templates(100)
+        pricelist = self._create_shop_pricelist(templates)
+        templates.invalidate_cache()
+        queries = self.cr.sql_log_count
+        self._batch_prices(pricelist, templates[:18])
+        baseline = self.cr.sql_log_count - queries
+        templates.invalidate_cache()
+        with self.assertQueryCount(baseline):
+            self._batch_prices(pricelist, templates)
+
+
+@tagged('post_install', '-at_install', '-standard', 'certifica_benchmark')
+class BenchmarkListingPrices(CertificaPriceCase):
+    """Cálculo de precio por producto (una tarjeta cada vez) frente al cálculo en lote."""
+
+    def test_benchmark_prices(self):
+        templates = self._create_templates(1000)
+        pricelist = self._create_shop_pricelist(templates)
+        Template = self.env['product.template']
+        results = []
+        for size in (18, 100, 1000):
+            page = templates[:size]
+            Template.invalidate_cache()
+            with self._measure(results, '%s productos, por producto' % size):
+                for template in page:
+                    Template.browse(template.id).with_context(pricelist=pricelist.id).price
+            Template.invalidate_cache()
+            with self._measure(results, '%s productos, en lote' % size):
+                self._batch_prices(pricelist, Template.browse(page.ids))
+        self._log_results('Benchmark de precios del listado', results)
+        batch_queries = [queries for label, queries, _ms in results if label.endswith('en lote')]
+        self.assertEqual(len(set(batch_queries)), 1, 'El cálculo en lote debe hacer las mismas consultas para cualquier tamaño')
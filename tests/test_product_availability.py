@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestProductAvailability(TransactionCase):
+    """
+    Disponible por variante: los cambios en stock.quant se aplican como
+    incrementos y la reconciliación corrige cualquier deriva de la tabla.
+    """
+
+    def setUp(self):
+        super(TestProductAvailability, self).setUp()
+        self.product = self.env['product.product'].create({'name': 'Certifica stock', 'type': 'product'})
+        self.stock = self.env.ref('stock.stock_location_stock')
+        self.customers = self.env.ref('stock.stock_location_customers')
+        self.Quant = self.env['stock.quant'].sudo()
+        self.Availability = self.env['certifica.product.availability']
+
+    def _available(self):
+        row = self.Availability.search([('product_id', '=', self.product.id)])
+        return row.available_qty if row else 0.0
+
+    def _reconcile(self):
+        """Diferencias corregidas por la reconciliación para la variante de la prueba."""
+        return [row for row in self.Availability._reconcile() if row[0] == self.product.id]
+
+    def test_quant_changes_update_delta(self):
+        self.Quant._update_available_quantity(self.product, self.stock, 10.0)
+        self.assertEqual(self._available(), 10.0)
+        self.Quant._update_reserved_quantity(self.product, self.stock, 3.0)
+        self.assertEqual(self._available(), 7.0)
+        self.Quant._update_available_quantity(self.product, self.stock, -4.0)
+        self.assertEqual(self._available(), 3.0)
+        # Las ubicaciones no internas no aportan al disponible
+        self.Quant._update_available_quantity(self.product, self.customers, 50.0)
+        self.assertEqual(self._available(), 3.0)
+
+    def test_reconcile_repairs_drift(self):
+        self.Quant._update_available_quantity(self.product, self.stock, 10.0)
+        self.assertEqual(self._reconcile(), [])
+        # Deriva: la tabla y stock_quant cambian por SQL, fuera de las sobrecargas
+        self.env.cr.execute(
+            "UPDATE certifica_product_availability SET available_qty = 99 WHERE product_id = %s",
+            (self.product.id,))
+        self.env.cr.execute(
+            "UPDATE stock_quant SET quantity = quantity + 5 WHERE product_id = %s AND location_id = %s",
+            (self.product.id, self.stock.id))
+        self.env['stock.quant'].invalidate_cache()
+        self.Availability.invalidate_cache()
+
+        self.assertEqual(self._reconcile(), [(self.product.id, 99.0, 15.0)])
+        self.assertEqual(self._available(), 15.0)
+        self.assertEqual(self._reconcile(), [])
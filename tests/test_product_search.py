@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+from odoo.exceptions import UserError
+from odoo.tests import TransactionCase, tagged
+
+from .common import CertificaShopMixin
+
+# Tamaños del catálogo del benchmark (plantillas)
+BENCHMARK_SIZES = (10000, 100000, 500000)
+
+# Nombres en español con tildes para las plantillas clonadas del benchmark
+_BENCHMARK_NAME_SQL = """
+    (ARRAY['Cámara', 'Balón', 'Teléfono', 'Cuaderno', 'Lámpara', 'Mochila', 'Reloj', 'Guante'])[1 + n %% 8]
+    || ' ' || (ARRAY['térmica', 'clásico', 'portátil', 'industrial', 'eléctrico'])[1 + (n / 8) %% 5]
+    || ' ' || n
+"""
+
+
+class CertificaSearchCase(CertificaShopMixin, TransactionCase):
+
+    def setUp(self):
+        super(CertificaSearchCase, self).setUp()
+        self.ProductSearch = self.env['certifica.product.search']
+        if not self.ProductSearch._is_available():
+            self.skipTest('Las extensiones pg_trgm/unaccent no están disponibles')
+        self.Product = self.env['product.template']
+
+    def _ilike_domain(self, search):
+        """Dominio ilike por palabra del WebsiteSale estándar (nombre, referencia y descripción)."""
+        domain = []
+        for word in search.split():
+            domain += ['|', '|', ('name', 'ilike', word), ('product_variant_ids.default_code', 'ilike', word),
+                       ('description_sale', 'ilike', word)]
+        return domain
+
+
+@tagged('post_install', '-at_install')
+class TestProductSearch(CertificaSearchCase):
+
+    def setUp(self):
+        super(TestProductSearch, self).setUp()
+        self.camera = self.Product.create({
+            'name': 'Cámara térmica industrial',
+            'default_code': 'TERM-01',
+        })
+        self.ball = self.Product.create({
+            'name': 'Balón de fútbol',
+            'description_sale': 'Cuero sintético cosido a mano',
+        })
+
+    def test_accent_insensitive(self):
+        self.assertIn(self.camera.id, self.ProductSearch._search_template_ids('camara termica'))
+        self.assertIn(self.ball.id, self.ProductSearch._search_template_ids('BALON'))
+
+    def test_every_word_must_match(self):
+        ids = self.ProductSearch._search_template_ids('camara futbol')
+        self.assertNotIn(self.camera.id, ids)
+        self.assertNotIn(self.ball.id, ids)
+
+    def test_description_and_internal_reference(self):
+        self.assertIn(self.ball.id, self.ProductSearch._search_template_ids('cuero cosido'))
+        self.assertIn(self.camera.id, self.ProductSearch._search_template_ids('term-01'))
+
+    def test_ranked_pages_and_uncapped_count(self):
+        templates = self._create_templates(30, prefix='Certifica búsqueda')
+        domain = [('id', 'in', templates.ids)]
+        self.assertEqual(self.Product.search_count(
+            domain + [('certifica_text_search', '=', 'certifica busqueda')]), 30)
+        pages = [self.Product._certifica_search_ranked('certifica busqueda', domain, 10, offset)
+                 for offset in (0, 10, 20, 30)]
+        self.assertEqual([len(page) for page in pages], [10, 10, 10, 0])
+        self.assertEqual(sorted(sum(pages, self.Product).ids), sorted(templates.ids))
+
+    def test_text_search_domain_edge_cases(self):
+        self.assertEqual(self.Product.search_count([('certifica_text_search', '=', '   ')]), 0)
+        with self.assertRaises(UserError):
+            self.Product.search([('certifica_text_search', 'ilike', 'camara')])
+
+    def test_exact_name_ranks_first(self):
+        self._create_templates(5, prefix='Cámara térmica industrial accesorio')
+        domain = [('certifica_text_search', '=', 'camara termica industrial')]
+        first = self.Product._certifica_search_ranked('camara termica industrial', domain, 1)
+        self.assertEqual(first, self.camera)
+
+
+@tagged('post_install', '-at_install', '-standard', 'certifica_benchmark')
+class BenchmarkProductSearch(CertificaSearchCase):
+    """Búsqueda ilike estándar frente a los índices de trigramas con 10k, 100k y 500k plantillas."""
+
+    def test_benchmark_search(self):
+        seed = self.Product.create({'name': 'Certifica semilla', 'sale_ok': True, 'is_published': True})
+        results = []
+        cloned = 0
+        for size in BENCHMARK_SIZES:
+            self._clone_templates(seed, size - cloned, name_sql=_BENCHMARK_NAME_SQL)
+            cloned = size
+            for search in ('reloj industrial', 'CLON-4242'):
+                self.Product.invalidate_cache()
+                with self._measure(results, '%s plantillas, ilike "%s"' % (size, search)):
+                    ilike_ids = self.Product.search(self._ilike_domain(search)).ids
+                with self._measure(results, '%s plantillas, trigramas "%s"' % (size, search)):
+                    count = self.Product.search_count([('certifica_text_search', '=', search)])
+                    self.Product._certifica_search_ranked(
+                        search, [('certifica_text_search', '=', search)], 18)
+                self.assertGreaterEqual(count, len(ilike_ids))
+        self._log_results('Benchmark de la búsqueda de la tienda', results)
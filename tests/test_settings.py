@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged('post_install', '-at_install')
+class TestCertificaSettings(TransactionCase):
+    """certifica.settings queda en caché hasta que cambia un parámetro del sistema."""
+
+    def setUp(self):
+        super(TestCertificaSettings, self).setUp()
+        self.Settings = self.env['certifica.settings']
+        self.IrParam = self.env['ir.config_parameter'].sudo()
+
+    def test_cached_between_changes(self):
+        self.Settings._get()
+        with self.assertQueryCount(0):
+            self.Settings._get()
+
+    def test_set_param_seen_by_next_get(self):
+        self.IrParam.set_param('certifica_theme.ppg', '24')
+        self.assertEqual(self.Settings._get().ppg, 24)
+        self.IrParam.set_param('certifica_theme.ppg', '30')
+        self.assertEqual(self.Settings._get().ppg, 30)
+        self.IrParam.set_param('certifica_theme.shop_keyset_pagination', 'True')
+        self.assertTrue(self.Settings._get().keyset_pagination)
+        self.IrParam.set_param('certifica_theme.shop_keyset_pagination', 'False')
+        self.assertFalse(self.Settings._get().keyset_pagination)
+
+    def test_removed_or_invalid_param_uses_default(self):
+        self.IrParam.set_param('certifica_theme.ppg', 'muchos')
+        self.assertEqual(self.Settings._get().ppg, 18)
+        self.IrParam.set_param('certifica_theme.ppg', '24')
+        self.assertEqual(self.Settings._get().ppg, 24)
+        # set_param con False borra el parámetro
+        self.IrParam.set_param('certifica_theme.ppg', False)
+        self.assertEqual(self.Settings._get().ppg, 18)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.certifica_theme.models.shop_cache import _apply_catalog_invalidation
+from odoo.addons.certifica_theme.tools.cache import stock_badges_cache, STOCK_BADGE_ENTRY_SIZE
+from odoo.addons.certifica_theme.tools.page_cache import page_cache
+
+from .common import CertificaShopMixin
+
+
+@tagged('post_install', '-at_install')
+class TestShopCacheInvalidation(CertificaShopMixin, TransactionCase):
+    """
+    Solo los cambios que se ven en la tienda invalidan el catálogo; el stock
+    descarta únicamente las insignias de sus plantillas.
+    """
+
+    def setUp(self):
+        super(TestShopCacheInvalidation, self).setUp()
+        self.template = self._create_templates(1)
+        self._reset_pending()
+
+    def _reset_pending(self):
+        """Las invalidaciones se aplican al hacer commit: se vacía lo pendiente de la prueba."""
+        self.env['certifica.shop.cache']._invalidate_catalog(local_only=True)
+        self._pending().update(catalog=False, full=False, on_bump=[], stock_tmpl_ids=set())
+
+    def _pending(self):
+        return self.env.cr._certifica_catalog_pending
+
+    def test_rendering_field_invalidates_catalog(self):
+        self.template.write({'name': 'Certifica renombrado'})
+        self.assertTrue(self._pending()['catalog'])
+
+    def test_other_fields_do_not_invalidate_catalog(self):
+        self.template.write({'description': 'Nota interna'})
+        self.template.product_variant_id.write({'barcode': 'CERT-0001'})
+        self.assertFalse(self._pending()['catalog'])
+
+    def test_stock_discards_only_its_badges(self):
+        product = self.template.product_variant_id
+        product.type = 'product'
+        self._reset_pending()
+        self.env['stock.quant']._update_available_quantity(
+            product, self.env.ref('stock.stock_location_stock'), 5.0)
+        pending = self._pending()
+        self.assertFalse(pending['catalog'])
+        self.assertEqual(pending['stock_tmpl_ids'], {self.template.id})
+
+        dbname = self.env.cr.dbname
+        other_key = (dbname, self.template.id + 1)
+        stock_badges_cache.set((dbname, self.template.id), 0, STOCK_BADGE_ENTRY_SIZE)
+        stock_badges_cache.set(other_key, 3, STOCK_BADGE_ENTRY_SIZE)
+        generation = page_cache.generation(dbname)
+        _apply_catalog_invalidation(self.registry, dbname, pending)
+        self.assertIsNone(stock_badges_cache.get((dbname, self.template.id)))
+        self.assertEqual(stock_badges_cache.get(other_key), 3)
+        self.assertEqual(page_cache.generation(dbname), generation)
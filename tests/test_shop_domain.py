@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import HttpCase, tagged
+
+from .common import CertificaShopMixin
+
+
+@tagged('post_install', '-at_install')
+class TestShopPricelistDomain(CertificaShopMixin, HttpCase):
+    """
+    La restricción al pricelist va dentro del dominio de búsqueda de la tienda:
+    el listado muestra solo sus productos y su coste en consultas no crece con
+    el tamaño del catálogo.
+    """
+
+    def setUp(self):
+        super(TestShopPricelistDomain, self).setUp()
+        self.listed = self._create_templates(20, prefix='Certifica listado')
+        self.pricelist = self._create_shop_pricelist(self.listed)
+        # Usuario con sesión: la tienda no se sirve desde la caché de páginas
+        self.env['res.users'].create({
+            'name': 'Certifica portal',
+            'login': 'certifica_portal',
+            'password': 'certifica_portal',
+            'groups_id': [(6, 0, [self.env.ref('base.group_portal').id])],
+        })
+        self.authenticate('certifica_portal', 'certifica_portal')
+
+    def _shop_queries(self, url='/shop'):
+        # La primera visita compila las plantillas y llena las cachés del worker
+        self.url_open(url)
+        queries = self.cr.sql_log_count
+        response = self.url_open(url)
+        self.assertEqual(response.status_code, 200)
+        return self.cr.sql_log_count - queries
+
+    def test_listing_only_pricelist_products(self):
+        self._create_templates(5, prefix='Certifica oculto')
+        self._bump_catalog_generation()
+        response = self.url_open('/shop?search=Certifica')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Certifica listado', response.text)
+        self.assertNotIn('Certifica oculto', response.text)
+
+    def _membership(self):
+        return set(self.env['certifica.pricelist.product']._get_product_tmpl_ids(self.pricelist.id))
+
+    def test_membership_follows_pricelist_items(self):
+        template, other = self._create_templates(2, prefix='Certifica nuevo')
+        self.assertNotIn(template.id, self._membership())
+
+        self._add_to_pricelist(self.pricelist, template)
+        self.assertIn(template.id, self._membership())
+
+        # Cambiar la plantilla de la regla saca la anterior y mete la nueva
+        item = self.pricelist.item_ids.filtered(lambda i: i.product_tmpl_id == template)
+        item.product_tmpl_id = other
+        self.assertNotIn(template.id, self._membership())
+        self.assertIn(other.id, self._membership())
+
+        item.unlink()
+        self.assertNotIn(other.id, self._membership())
+        self.assertTrue(set(self.listed.ids) <= self._membership())
+
+    def test_membership_follows_category_rules(self):
+        category = self.env['product.category'].create({'name': 'Certifica categoría'})
+        template = self._create_templates(1, prefix='Certifica por categoría', categ_id=category.id)
+        item = self.env['product.pricelist.item'].create({
+            'pricelist_id': self.pricelist.id,
+            'applied_on': '2_product_category',
+            'categ_id': category.id,
+            'compute_price': 'fixed',
+            'fixed_price': 80.0,
+        })
+        self.assertIn(template.id, self._membership())
+        # La plantilla sale del pricelist al cambiar de categoría interna
+        template.categ_id = self.env.ref('product.product_category_all')
+        self.assertNotIn(template.id, self._membership())
+        template.categ_id = category
+        self.assertIn(template.id, self._membership())
+        item.unlink()
+        self.assertNotIn(template.id, self._membership())
+
+    def test_listing_follows_pricelist_changes(self):
+        added = self._create_templates(1, prefix='Certifica agregado')
+        self._add_to_pricelist(self.pricelist, added)
+        self._bump_catalog_generation()
+        self.assertIn('Certifica agregado', self.url_open('/shop?search=Certifica').text)
+
+        self.pricelist.item_ids.filtered(lambda i: i.product_tmpl_id == added).unlink()
+        self._bump_catalog_generation()
+        response = self.url_open('/shop?search=Certifica')
+        self.assertNotIn('Certifica agregado', response.text)
+        self.assertIn('Certifica listado', response.text)
+
+    def test_listing_query_count_independent_of_catalog_size(self):
+        baseline = self._shop_queries()
+        extra = self._create_templates(40, prefix='Certifica listado extra')
+        self._add_to_pricelist(self.pricelist, extra)
+        self._create_templates(200, prefix='Certifica fuera del pricelist')
+        self._bump_catalog_generation()
+        self.url_open('/shop')
+        with self.assertQueryCount(baseline):
+            response = self.url_open('/shop')
+        self.assertEqual(response.status_code, 200)
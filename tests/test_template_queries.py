@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import patch
+
+from odoo.addons.base.models.ir_qweb import IrQWeb
+from odoo.addons.http_routing.models.ir_http import slug
+from odoo.exceptions import ValidationError
+from odoo.tests import HttpCase, tagged
+
+from .common import CertificaShopMixin
+
+# PNG de 1x1 para las imágenes adicionales de la ficha de producto
+_PIXEL_PNG = b'iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAAC0lEQVR4nGNgAAIAAAUAAXpeqz8AAAAASUVORK5CYII='
+
+
+@tagged('post_install', '-at_install')
+class TestTemplateQueries(CertificaShopMixin, HttpCase):
+    """
+    Las páginas de la tienda se renderizan sin consultas por producto en las
+    plantillas: las consultas hechas dentro de ir.qweb.render() no crecen con
+    los productos o imágenes que muestra la página.
+    """
+
+    def setUp(self):
+        super(TestTemplateQueries, self).setUp()
+        self.templates = self._create_templates(3)
+        self.pricelist = self._create_shop_pricelist(self.templates)
+        self._bump_catalog_generation()
+        # Usuario con sesión: las páginas no se sirven desde la caché de páginas
+        self.env['res.users'].create({
+            'name': 'Certifica plantillas',
+            'login': 'certifica_templates',
+            'password': 'certifica_templates',
+            'groups_id': [(6, 0, [self.env.ref('base.group_portal').id])],
+        })
+        self.authenticate('certifica_templates', 'certifica_templates')
+
+    def _render_queries(self, url):
+        """Consultas SQL hechas dentro de ir.qweb.render() al servir la página."""
+        # La primera visita compila las plantillas y llena las cachés del worker
+        self.url_open(url)
+        counts, depth = [], [0]
+        render, cr = IrQWeb.render, self.cr
+
+        def counted_render(qweb, *args, **kwargs):
+            depth[0] += 1
+            queries = cr.sql_log_count
+            try:
+                return render(qweb, *args, **kwargs)
+            finally:
+                depth[0] -= 1
+                if not depth[0]:
+                    counts.append(cr.sql_log_count - queries)
+
+        with patch.object(IrQWeb, 'render', counted_render):
+            response = self.url_open(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(counts, 'La página %s no se renderizó con QWeb' % url)
+        return sum(counts)
+
+    def _add_images(self, template, count):
+        self.env['product.image'].create([{
+            'name': '%s %s' % (template.name, index),
+            'product_tmpl_id': template.id,
+            'image_1920': _PIXEL_PNG,
+        } for index in range(count)])
+
+    def test_shop_page_render(self):
+        baseline = self._render_queries('/shop')
+        extra = self._create_templates(9, prefix='Certifica más')
+        self._add_to_pricelist(self.pricelist, extra)
+        self._bump_catalog_generation()
+        self.assertEqual(self._render_queries('/shop'), baseline,
+                         'Las plantillas de /shop hacen consultas por producto')
+
+    def test_product_page_render(self):
+        single, gallery = self.templates[0], self.templates[1]
+        self._add_images(single, 1)
+        self._add_images(gallery, 4)
+        self.assertEqual(
+            self._render_queries('/shop/product/%s' % slug(gallery)),
+            self._render_queries('/shop/product/%s' % slug(single)),
+            'Las plantillas de la ficha de producto hacen consultas por imagen')
+
+    def test_constraint_rejects_template_search(self):
+        with self.assertRaises(ValidationError):
+            self.env['ir.ui.view'].create({
+                'name': 'certifica_theme.test_template_search',
+                'key': 'certifica_theme.test_template_search',
+                'type': 'qweb',
+                'arch': '<t t-name="certifica_theme.test_template_search">'
+                        '<t t-set="quants" t-value="request.env[\'stock.quant\'].sudo().search([])"/>'
+                        '</t>',
+            })
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase, tagged
+
+from ..models.settings import SETTINGS_PARAMS
+from ..models.vat_policy import VAT_POLICY_SETTINGS
+from .common import CertificaShopMixin
+
+_logger = logging.getLogger(__name__)
+
+# RUC con dígito verificador correcto y el mismo número con uno incorrecto
+VALID_RUC = '20100070970'
+INVALID_RUC = '20100070971'
+
+
+class CertificaVatCase(CertificaShopMixin, TransactionCase):
+
+    def setUp(self):
+        super(CertificaVatCase, self).setUp()
+        self.peru = self.env.ref('base.pe')
+        self.env['ir.config_parameter'].sudo().set_param('certifica_theme.country_id', str(self.peru.id))
+        IdentificationType = self.env['l10n_latam.identification.type']
+        self.dni_type_id = IdentificationType._certifica_get_type_id('DNI')
+        self.ruc_type_id = IdentificationType._certifica_get_type_id('RUC')
+        self.passport = self.env.ref('l10n_latam_base.it_pass', raise_if_not_found=False)
+        self._set_policy()
+
+    def _set_policy(self, **flags):
+        """Fija los parámetros de la política (campos de VatPolicy, por defecto False)."""
+        keys = {field: key for field, key, _type, _default in SETTINGS_PARAMS}
+        IrParam = self.env['ir.config_parameter'].sudo()
+        for policy_field, setting in VAT_POLICY_SETTINGS:
+            IrParam.set_param(keys[setting], 'True' if flags.get(policy_field) else 'False')
+
+    def _create_partner(self, vat, type_id, country=None):
+        """Partner con los valores que guarda el checkout."""
+        return self.env['res.partner'].create({
+            'name': 'Certifica documento %s' % vat,
+            'email': 'cliente@example.com',
+            'street': 'Av. Principal 123',
+            'city': 'Lima',
+            'country_id': (country or self.peru).id,
+            'vat': vat,
+            'l10n_latam_identification_type_id': type_id,
+        })
+
+
+@tagged('post_install', '-at_install')
+class TestVatPolicy(CertificaVatCase):
+
+    def test_standard_policy_accepts_checkout_documents(self):
+        self._create_partner('12345678', self.dni_type_id)
+        self._create_partner(VALID_RUC, self.ruc_type_id)
+        if self.passport:
+            self._create_partner('AB123456', self.passport.id, self.env.ref('base.es'))
+
+    def test_standard_policy_rejects_invalid_ruc(self):
+        with self.assertRaises(ValidationError):
+            self._create_partner(INVALID_RUC, self.ruc_type_id)
+
+    def test_each_policy_setting_accepts_invalid_ruc(self):
+        for flag in ('skip_check_vat', 'skip_latam', 'flexible_format', 'skip_peru'):
+            with self.subTest(flag=flag):
+                self._set_policy(**{flag: True})
+                partner = self._create_partner(INVALID_RUC, self.ruc_type_id)
+                self.assertEqual(partner.vat, INVALID_RUC)
+                # Los documentos válidos siguen pasando con la política activa
+                self._create_partner('12345678', self.dni_type_id)
+                self._create_partner(VALID_RUC, self.ruc_type_id)
+
+    def test_individual_checks_follow_policy(self):
+        Partner = self.env['res.partner']
+        self.assertFalse(Partner.check_vat_pe(INVALID_RUC))
+        self.assertFalse(Partner.simple_vat_check('pe', INVALID_RUC))
+        self._set_policy(skip_peru=True)
+        self.assertTrue(Partner.check_vat_pe(INVALID_RUC))
+        self._set_policy(flexible_format=True)
+        self.assertTrue(Partner.simple_vat_check('pe', INVALID_RUC))
+        self.assertTrue(Partner.vies_vat_check('pe', INVALID_RUC))
+
+    def test_param_change_does_not_reload_registry(self):
+        self.assertFalse(self.env['res.partner']._certifica_get_vat_policy().skip_peru)
+        self._set_policy(skip_peru=True)
+        self.assertTrue(self.env['res.partner']._certifica_get_vat_policy().skip_peru)
+        self.assertFalse(self.env.registry.registry_invalidated)
+
+
+@tagged('post_install', '-at_install', '-standard', 'certifica_benchmark')
+class BenchmarkVatPolicy(CertificaVatCase):
+    """Accesos a atributos de partners y partners creados por segundo con la política activa."""
+
+    def test_benchmark_vat_policy(self):
+        size = 1000
+        Partner = self.env['res.partner']
+        partners = Partner.search([], limit=100)
+        started = time.time()
+        for _i in range(size):
+            for partner in partners:
+                partner.name, partner.vat, hasattr(partner, '_certifica_missing_attribute')
+        access_time = time.time() - started
+
+        results = []
+        for flag in (None, 'skip_check_vat'):
+            self._set_policy(**({flag: True} if flag else {}))
+            with self.env.cr.savepoint():
+                with self._measure(results, '%s partners, política %s' % (size, flag or 'estándar')):
+                    Partner.create([{'name': 'Benchmark VAT %s' % i, 'vat': '%08d' % i} for i in range(size)])
+                    Partner.flush()
+            self.env.clear()
+        self._log_results('Benchmark de la política de VAT', results)
+        _logger.info('Benchmark de la política de VAT: %.0f accesos a atributos por segundo',
+                     size * len(partners) * 3 / access_time if access_time else 0)
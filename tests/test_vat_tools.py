@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.certifica_theme.tools.vat import DNI, RUC, NORMALIZE_VAT_SQL, classify_vat, normalize_vat
+
+# Números de documento tal como llegan del checkout y de los datos existentes
+_VAT_SAMPLES = [
+    '12345678', ' 12345678 ', '20100070970', '20-10007097-0', '10.4567890.1',
+    'pe20100070970', 'AB 123456', '001234567', '', '  ', '-', None,
+]
+
+
+@tagged('post_install', '-at_install')
+class TestVatTools(TransactionCase):
+    """Clasificación y normalización de documentos (tools/vat.py), en Python y en SQL."""
+
+    def test_classify_dni_and_ruc(self):
+        self.assertEqual(classify_vat('12345678'), DNI)
+        self.assertEqual(classify_vat(' 12345678 '), DNI)
+        self.assertEqual(classify_vat('20100070970'), RUC)
+        self.assertEqual(classify_vat('10456789012'), RUC)
+        # 10 caracteres con prefijo de RUC
+        self.assertEqual(classify_vat('2010007097'), RUC)
+        self.assertEqual(classify_vat('1045678901'), RUC)
+
+    def test_classify_other_documents_as_dni(self):
+        # Carné de extranjería, pasaporte y otros formatos no tienen tipo propio
+        self.assertEqual(classify_vat('001234567'), DNI)
+        self.assertEqual(classify_vat('000123456789'), DNI)
+        self.assertEqual(classify_vat('AB123456'), DNI)
+        self.assertEqual(classify_vat('3045678901'), DNI)
+        self.assertEqual(classify_vat(12345678), DNI)
+
+    def test_classify_empty(self):
+        for value in ('', '   ', None, False):
+            self.assertIsNone(classify_vat(value))
+
+    def test_normalize(self):
+        self.assertEqual(normalize_vat('20-10007097-0'), '20100070970')
+        self.assertEqual(normalize_vat(' 10.4567890.1 '), '1045678901')
+        self.assertEqual(normalize_vat('pe 2010007097-0'), 'PE20100070970')
+        self.assertEqual(normalize_vat(12345678), '12345678')
+        for value in ('', ' - . ', None, False):
+            self.assertIsNone(normalize_vat(value))
+
+    def test_sql_matches_python(self):
+        self.env.cr.execute(
+            "SELECT value, {expression} FROM unnest(%s::varchar[]) AS value".format(
+                expression=NORMALIZE_VAT_SQL.format(column='value')),
+            (_VAT_SAMPLES,))
+        for value, normalized in self.env.cr.fetchall():
+            self.assertEqual(normalized, normalize_vat(value), 'VAT %r' % value)
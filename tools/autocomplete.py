@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de prefijos por worker para el autocompletado del buscador.
+
+Las claves (nombre completo, nombre desde cada palabra y referencias internas,
+normalizadas sin tildes) se guardan en un arreglo ordenado; una búsqueda es
+un bisect más un recorrido acotado del rango con ese prefijo.
+"""
+
+import bisect
+import threading
+
+# Prioridad de cada tipo de coincidencia (menor es mejor)
+RANK_NAME = 0
+RANK_CODE = 1
+RANK_WORD = 2
+
+# Entradas recorridas como máximo por consulta
+MAX_SCAN = 2000
+
+
+class PrefixIndex(object):
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.keys = []
+        self.entries = []      # (rank, product_tmpl_id), paralelo a keys
+        self.names = {}        # product_tmpl_id -> nombre
+        self.codes = {}        # product_tmpl_id -> primera referencia interna
+        self.details = {}      # product_tmpl_id -> datos ya calculados (precio, url)
+        self._lock = threading.RLock()
+
+    def load(self, rows, normalize):
+        """rows: (product_tmpl_id, nombre, [referencias internas])."""
+        items = []
+        for tmpl_id, name, codes in rows:
+            self.names[tmpl_id] = name
+            codes = [code for code in (codes or []) if code]
+            if codes:
+                self.codes[tmpl_id] = codes[0]
+            key = normalize(name)
+            if key:
+                items.append((key, RANK_NAME, tmpl_id))
+                words = key.split()
+                for position in range(1, len(words)):
+                    items.append((' '.join(words[position:]), RANK_WORD, tmpl_id))
+            for code in codes:
+                items.append((normalize(code), RANK_CODE, tmpl_id))
+        items.sort()
+        self.keys = [item[0] for item in items]
+        self.entries = [(item[1], item[2]) for item in items]
+
+    def search(self, term, limit):
+        """IDs de plantillas cuyo nombre, palabra o referencia empieza por term."""
+        if not term:
+            return []
+        best = {}
+        start = bisect.bisect_left(self.keys, term)
+        for position in range(start, min(start + MAX_SCAN, len(self.keys))):
+            if not self.keys[position].startswith(term):
+                break
+            rank, tmpl_id = self.entries[position]
+            if rank < best.get(tmpl_id, RANK_WORD + 1):
+                best[tmpl_id] = rank
+        ordered = sorted(best, key=lambda tmpl_id: (best[tmpl_id], self.names.get(tmpl_id) or ''))
+        return ordered[:limit]
+
+    def get_details(self, tmpl_ids):
+        with self._lock:
+            return {tmpl_id: self.details[tmpl_id] for tmpl_id in tmpl_ids if tmpl_id in self.details}
+
+    def set_details(self, details):
+        with self._lock:
+            self.details.update(details)
+
+
+# Índices del worker: (dbname, pricelist_id) -> PrefixIndex
+_indexes = {}
+_lock = threading.RLock()
+
+
+def get_index(key):
+    with _lock:
+        return _indexes.get(key)
+
+
+def set_index(key, index):
+    with _lock:
+        _indexes[key] = index
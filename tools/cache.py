@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Cachés en memoria por worker para fragmentos de la tienda.
+
+Cada caché es un LRU acotado por memoria (bytes aproximados) y con expiración
+por TTL. Las entradas se invalidan localmente con clear() y entre workers
+incluyendo en la clave la generación del catálogo (ver certifica.shop.cache).
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from odoo.http import request
+
+# Cachés registradas, para reportar sus contadores
+CACHES = OrderedDict()
+
+# Marcador con el que se guarda el HTML en caché en lugar del token CSRF de la sesión
+CSRF_PLACEHOLDER = '__CERTIFICA_CSRF_TOKEN__'
+_CSRF_INPUT_RE = re.compile(r'(name="csrf_token"\s+value=")[^"]*(")')
+_CSRF_SCRIPT_RE = re.compile(r'(csrf_token\s*[=:]\s*")[^"]*(")')
+
+
+class LRUCache(object):
+    """LRU con límite de memoria, TTL y contadores de aciertos/fallos."""
+
+    def __init__(self, name, max_bytes=32 * 1024 * 1024, ttl=300):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        CACHES[name] = self
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, size, value = entry
+            if expires < time.monotonic():
+                self._pop(key)
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, size):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (time.monotonic() + self.ttl, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._data:
+                self._pop(next(iter(self._data)))
+                self.evictions += 1
+
+    def discard(self, key):
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._data),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+            }
+
+    def _pop(self, key):
+        _expires, size, _value = self._data.pop(key)
+        self._bytes -= size
+
+
+class MemoStats(object):
+    """Contadores por worker de una memoización por petición (resoluciones evitadas y realizadas)."""
+
+    def __init__(self, name):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        CACHES[name] = self
+
+    def count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        # Contador de la petición actual
+        request_stats = request_memo(self.name + '_stats')
+        key = 'hits' if hit else 'misses'
+        request_stats[key] = request_stats.get(key, 0) + 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def get_cache_stats():
+    """Contadores de todas las cachés del worker actual."""
+    return [cache.stats() for cache in CACHES.values()]
+
+
+def request_memo(name):
+    """Diccionario que vive lo que dura la petición HTTP actual (vacío fuera de una petición)."""
+    if not request:
+        return {}
+    memo = getattr(request, '_certifica_memo', None)
+    if memo is None:
+        memo = request._certifica_memo = {}
+    return memo.setdefault(name, {})
+
+
+def reset_request_memo():
+    """Vacía lo memorizado en la petición (p. ej. al reintentar tras un rollback)."""
+    if request:
+        request._certifica_memo = {}
+
+
+def strip_csrf_tokens(html):
+    """Reemplaza los tokens CSRF de la sesión que renderizó el HTML por un marcador."""
+    html = _CSRF_INPUT_RE.sub(r'\g<1>%s\g<2>' % CSRF_PLACEHOLDER, html)
+    return _CSRF_SCRIPT_RE.sub(r'\g<1>%s\g<2>' % CSRF_PLACEHOLDER, html)
+
+
+def fill_csrf_tokens(html, token):
+    """Inserta el token CSRF de la sesión actual en un HTML obtenido de la caché."""
+    return html.replace(CSRF_PLACEHOLDER, token)
+
+
+# HTML de /shop/filter_products (products_html + filters) para visitantes anónimos
+products_fragment_cache = LRUCache('shop_products_fragment', max_bytes=32 * 1024 * 1024, ttl=300)
+
+# Disponible por plantilla para las insignias de stock del listado ((dbname, product_tmpl_id) -> cantidad)
+stock_badges_cache = LRUCache('shop_stock_badges', max_bytes=1024 * 1024, ttl=30)
+
+# Bytes aproximados de una entrada de stock_badges_cache (clave y cantidad)
+STOCK_BADGE_ENTRY_SIZE = 64
+
+# Resoluciones de website.sale_get_order() evitadas por la memoización de la petición
+sale_order_memo_stats = MemoStats('sale_get_order')
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Índice de facetas de atributos con bitmaps por worker.
+
+Cada plantilla de producto ocupa una posición de bit; cada valor de atributo
+y cada categoría pública guardan un entero de Python con los bits de sus
+plantillas. Filtrar y contar se resuelve con operaciones &, | y conteo de bits.
+"""
+
+import threading
+
+
+def popcount(bits):
+    return bin(bits).count('1')
+
+
+def bits_to_ids(bits, tmpl_ids):
+    """IDs de plantilla de los bits activos."""
+    ids = []
+    while bits:
+        low = bits & -bits
+        ids.append(tmpl_ids[low.bit_length() - 1])
+        bits ^= low
+    return ids
+
+
+class FacetIndex(object):
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.positions = {}     # product_tmpl_id -> posición de bit
+        self.tmpl_ids = []      # posición de bit -> product_tmpl_id
+        self.universe = 0       # plantillas publicadas en el pricelist
+        self.value_bits = {}    # product.attribute.value id -> bitmap
+        self.value_attribute = {}  # product.attribute.value id -> product.attribute id
+        self.category_bits = {}    # product.public.category id (incluye descendientes) -> bitmap
+
+    def _bit(self, tmpl_id):
+        position = self.positions.get(tmpl_id)
+        if position is None:
+            position = self.positions[tmpl_id] = len(self.tmpl_ids)
+            self.tmpl_ids.append(tmpl_id)
+        return 1 << position
+
+    def load(self, universe_ids, value_rows, category_rows, category_parents):
+        """
+        universe_ids: plantillas publicadas del pricelist.
+        value_rows: (product_tmpl_id, attribute_id, value_id).
+        category_rows: (product_tmpl_id, public_category_id).
+        category_parents: {category_id: parent_id}.
+        """
+        for tmpl_id in universe_ids:
+            self.universe |= self._bit(tmpl_id)
+        self._load_values(value_rows)
+        for tmpl_id, category_id in category_rows:
+            bit = self._bit(tmpl_id)
+            seen = set()
+            while category_id and category_id not in seen:
+                seen.add(category_id)
+                self.category_bits[category_id] = self.category_bits.get(category_id, 0) | bit
+                category_id = category_parents.get(category_id)
+
+    def _load_values(self, value_rows):
+        for tmpl_id, attribute_id, value_id in value_rows:
+            self.value_bits[value_id] = self.value_bits.get(value_id, 0) | self._bit(tmpl_id)
+            self.value_attribute[value_id] = attribute_id
+
+    def update_templates(self, tmpl_ids, value_rows):
+        """Reemplaza las líneas de atributos de las plantillas indicadas."""
+        mask = 0
+        for tmpl_id in tmpl_ids:
+            mask |= self._bit(tmpl_id)
+        for value_id in self.value_bits:
+            self.value_bits[value_id] &= ~mask
+        self._load_values(value_rows)
+
+    def _groups(self, value_ids):
+        """OR de los valores elegidos dentro de cada atributo."""
+        groups = {}
+        for value_id in value_ids:
+            attribute_id = self.value_attribute.get(value_id)
+            if attribute_id is None:
+                # Valor sin plantillas: el atributo no admite ningún producto
+                groups.setdefault(('missing', value_id), 0)
+                continue
+            groups[attribute_id] = groups.get(attribute_id, 0) | self.value_bits[value_id]
+        return groups
+
+    def query(self, value_ids, base=None):
+        """
+        Devuelve (bitmap resultado, {value_id: conteo}). El resultado es el AND entre
+        atributos de los OR dentro de cada atributo; el conteo de cada valor aplica
+        las selecciones de los demás atributos (conteo de facetas habitual).
+        """
+        base = self.universe if base is None else base & self.universe
+        groups = self._groups(value_ids)
+        result = base
+        for bits in groups.values():
+            result &= bits
+        counts = {}
+        for value_id, bits in self.value_bits.items():
+            attribute_id = self.value_attribute[value_id]
+            restricted = base
+            for group_attribute, group_bits in groups.items():
+                if group_attribute != attribute_id:
+                    restricted &= group_bits
+            counts[value_id] = popcount(restricted & bits)
+        return result, counts
+
+    def filter_ids(self, value_ids):
+        """IDs de plantillas que cumplen la selección, sin restringir al universo publicado."""
+        groups = self._groups(value_ids)
+        if not groups:
+            return None
+        result = -1
+        for bits in groups.values():
+            result &= bits
+        return bits_to_ids(result, self.tmpl_ids) if result > 0 else []
+
+    def ids_to_bits(self, ids):
+        bits = 0
+        for tmpl_id in ids:
+            position = self.positions.get(tmpl_id)
+            if position is not None:
+                bits |= 1 << position
+        return bits
+
+
+# Índices del worker: (dbname, pricelist_id) -> FacetIndex
+_indexes = {}
+_lock = threading.RLock()
+
+
+def get_index(key):
+    with _lock:
+        return _indexes.get(key)
+
+
+def set_index(key, index):
+    with _lock:
+        _indexes[key] = index
+
+
+def drop_index(key):
+    with _lock:
+        _indexes.pop(key, None)
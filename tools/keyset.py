@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Paginación por clave (keyset) de la tienda.
+
+El cursor es opaco para el cliente: base64 de un JSON con la página a la que
+apunta, los valores de la clave de orden del último producto de la página
+anterior y una huella de la consulta (categoría, búsqueda, atributos, orden).
+Un cursor que no corresponde a la consulta o a la página se ignora y la
+tienda vuelve a la paginación por OFFSET.
+"""
+
+import base64
+import hashlib
+import json
+
+from odoo.osv import expression
+
+# Campos por los que se puede paginar por clave (sin traducción y comparables en SQL)
+KEYSET_FIELDS = ('is_published', 'website_sequence', 'list_price', 'id')
+
+
+def parse_order(order):
+    """
+    Convierte 'campo dir, ...' en [(campo, 'asc'|'desc')]. Devuelve None si algún
+    campo no está permitido o si el orden no termina en id (desempate único).
+    """
+    keys = []
+    for part in (order or '').split(','):
+        tokens = part.strip().split()
+        if not tokens:
+            continue
+        direction = tokens[1].lower() if len(tokens) > 1 else 'asc'
+        if tokens[0] not in KEYSET_FIELDS or direction not in ('asc', 'desc') or len(tokens) > 2:
+            return None
+        keys.append((tokens[0], direction))
+    if not keys or keys[-1][0] != 'id':
+        return None
+    return keys
+
+
+def seek_domain(keys, values):
+    """Dominio de los registros que van después de values en el orden keys."""
+    clauses = []
+    for position, (field, direction) in enumerate(keys):
+        clause = [(keys[previous][0], '=', values[previous]) for previous in range(position)]
+        clause.append((field, '>' if direction == 'asc' else '<', values[position]))
+        clauses.append(clause)
+    return expression.OR(clauses)
+
+
+def fingerprint(*parts):
+    return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def encode_cursor(page, values, query_fingerprint):
+    data = json.dumps({'p': page, 'v': values, 'f': query_fingerprint}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor, page, query_fingerprint, size):
+    """Valores de la clave del cursor, o None si no es válido para esta página y consulta."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        values = data['v']
+        if data['p'] != page or data['f'] != query_fingerprint or len(values) != size:
+            return None
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return None
+    if not all(isinstance(value, (bool, int, float)) for value in values):
+        return None
+    return values
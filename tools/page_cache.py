@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Caché de páginas completas para visitantes anónimos, compartida por todos los
+workers a través de archivos en el data_dir de Odoo.
+
+Las entradas se guardan bajo un directorio por generación. Invalidar es
+escribir una generación nueva en el archivo "generation": las entradas de la
+generación anterior dejan de leerse y sus directorios se eliminan después, con
+purge() desde un cron, fuera de las escrituras que invalidan.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+from odoo.tools import config
+
+from .cache import CACHES
+
+_logger = logging.getLogger(__name__)
+
+# Segundos que una página se sirve desde la caché aunque no haya cambios
+PAGE_CACHE_TTL = 600
+
+
+class PageCache(object):
+
+    def __init__(self, name, ttl=PAGE_CACHE_TTL):
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        CACHES[name] = self
+
+    def _root(self, dbname):
+        return os.path.join(config['data_dir'], 'certifica_page_cache', dbname)
+
+    def _write_file(self, path, data):
+        """Escritura atómica: un lector nunca ve un archivo a medio escribir."""
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def generation(self, dbname):
+        path = os.path.join(self._root(dbname), 'generation')
+        try:
+            with open(path) as f:
+                generation = f.read().strip()
+            if generation:
+                return generation
+        except OSError:
+            pass
+        return self.bump(dbname)
+
+    def bump(self, dbname):
+        """Nueva generación: invalida todas las páginas de la base de datos."""
+        root = self._root(dbname)
+        generation = uuid.uuid4().hex
+        try:
+            self._write_file(os.path.join(root, 'generation'), generation.encode('ascii'))
+        except OSError as e:
+            _logger.warning('No se pudo invalidar la caché de páginas en %s: %s', root, e)
+        return generation
+
+    def purge(self, dbname):
+        """Elimina los directorios de generaciones anteriores."""
+        root = self._root(dbname)
+        if not os.path.isdir(root):
+            return
+        generation = self.generation(dbname)
+        for entry in os.listdir(root):
+            if entry != generation and os.path.isdir(os.path.join(root, entry)):
+                shutil.rmtree(os.path.join(root, entry), ignore_errors=True)
+
+    def _path(self, dbname, key):
+        digest = hashlib.sha1(json.dumps(key, default=str).encode('utf-8')).hexdigest()
+        return os.path.join(self._root(dbname), self.generation(dbname), digest[:2], digest)
+
+    def get(self, dbname, key):
+        """Devuelve (etag, content_type, html) o None."""
+        path = self._path(dbname, key)
+        try:
+            if os.path.getmtime(path) + self.ttl < time.time():
+                raise OSError
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline().decode('utf-8'))
+                body = f.read().decode('utf-8')
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return meta['etag'], meta['content_type'], body
+
+    def set(self, dbname, key, etag, content_type, body):
+        meta = json.dumps({'etag': etag, 'content_type': content_type}).encode('utf-8')
+        try:
+            self._write_file(self._path(dbname, key), meta + b'\n' + body.encode('utf-8'))
+        except OSError as e:
+            _logger.warning('No se pudo guardar una página en la caché: %s', e)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'name': self.name,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'ttl': self.ttl,
+            }
+
+
+# Páginas /shop, /shop/category/... y /shop/product/... de visitantes sin sesión ni carrito
+page_cache = PageCache('shop_pages')
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Clasificación de números de documento peruanos (DNI/RUC) sin acceso a la base
+de datos, compartida por el checkout y res.partner.
+"""
+
+import re
+
+DNI = 'DNI'
+RUC = 'RUC'
+
+# Prefijos de RUC aceptados también con 10 dígitos
+_RUC_PREFIXES = ('10', '20', '15', '16', '17')
+
+_VAT_NOISE_RE = re.compile(r'[^0-9A-Za-z]')
+
+# Misma normalización que normalize_vat(), en SQL (columna res_partner.certifica_vat_normalized)
+NORMALIZE_VAT_SQL = "NULLIF(upper(regexp_replace({column}, '[^0-9A-Za-z]', '', 'g')), '')"
+
+
+def normalize_vat(vat_number):
+    """Número sin espacios, guiones ni puntos y en mayúsculas (None si queda vacío)."""
+    return _VAT_NOISE_RE.sub('', str(vat_number or '')).upper() or None
+
+
+def classify_vat(vat_number):
+    """
+    Nombre del tipo de identificación ('DNI' o 'RUC') para el número, o None si
+    está vacío: 8 dígitos es DNI, 11 dígitos o 10 con prefijo de RUC es RUC y
+    cualquier otro valor se trata como DNI.
+    """
+    vat_clean = str(vat_number or '').strip()
+    if not vat_clean:
+        return None
+    if len(vat_clean) == 8 and vat_clean.isdigit():
+        return DNI
+    if len(vat_clean) == 11 and vat_clean.isdigit():
+        return RUC
+    if len(vat_clean) == 10 and vat_clean.startswith(_RUC_PREFIXES):
+        return RUC
+    return DNI